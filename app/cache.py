@@ -0,0 +1,281 @@
+# app/cache.py
+"""
+Response cache for views over immutable (post-flight) data.
+
+A flight's data stops changing once Flight.status == 'post-flight', so its
+views can be served from memory. Entries are keyed by
+
+    endpoint + view args + query string + content encoding + data version
+
+where the data version is
+"<max telemetry id>.<end_time ms>.<data selection id>.<summary updated_at ms>"
+for a flight, or "<count>.<latest end_time ms>" for the archive. Every
+in-place rewrite of a flight's rows (derive/summary backfills, stronger
+copies, channel samples) touches flight_summary.updated_at
+(backend.etl.summary.TOUCH_SQL), so it changes the version too.
+
+Versions are looked up in memory first (VERSION_TTL; a live flight's None for
+LIVE_TTL, the page poll interval; an LRU of CACHE_MAX_ENTRIES scopes), then on
+disk (for DISK_VERSION_TTL), and only then in Postgres, with one query. A disk
+version that turns out stale drops the scope's stored entries, which could
+never be hit again.
+
+Storage:
+  - in-process LRU bounded by CACHE_MAX_ENTRIES and CACHE_MAX_BYTES
+  - optional disk store under CACHE_DIR (shared by all app processes)
+
+end_flight() and confirm_data_selection() call invalidate(flight_id).
+Every cached response carries an ETag derived from its key, so a matching
+If-None-Match gets a 304 before the view runs.
+"""
+import os
+import time
+import pickle
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, make_response, Response
+from sqlalchemy import case, func, select
+
+from .extensions import db
+from .models import Flight, Telemetry, DataSelection, FlightSummary
+from . import compression
+
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+CACHE_MAX_BYTES   = int(os.getenv('CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+CACHE_DIR         = os.getenv('CACHE_DIR')          # unset → memory only
+VERSION_TTL       = 60                              # seconds a version is trusted in memory
+LIVE_TTL          = 2                               # … and a live flight's None (poll interval)
+DISK_VERSION_TTL  = int(os.getenv('CACHE_VERSION_TTL', '600'))   # … a version read from disk
+
+ARCHIVE_SCOPE = 'archive'
+
+
+class LRUCache:
+    """Thread-safe LRU bounded by entry count and total value size."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.bytes = 0
+        self._data = OrderedDict()   # key → (size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old:
+                self.bytes -= old[0]
+            self._data[key] = (size, value)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                _, (evicted, _) = self._data.popitem(last=False)
+                self.bytes -= evicted
+
+    def delete_scope(self, scope):
+        with self._lock:
+            for key in [k for k in self._data if k[0] == scope]:
+                self.bytes -= self._data.pop(key)[0]
+
+
+class DiskStore:
+    """One directory per scope, one pickle per key; a scope is dropped with rmtree."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, scope, name):
+        return os.path.join(self.root, str(scope), name)
+
+    @staticmethod
+    def _name(key):
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.pkl'
+
+    def read(self, scope, name):
+        try:
+            with open(self._path(scope, name), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def write(self, scope, name, value):
+        path = self._path(scope, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        return self.read(key[0], self._name(key))
+
+    def set(self, key, value):
+        self.write(key[0], self._name(key), value)
+
+    def delete_scope(self, scope):
+        shutil.rmtree(os.path.join(self.root, str(scope)), ignore_errors=True)
+
+
+# ── versions ─────────────────────────────────────────────────────────────────
+def _ms(ts):
+    return int(ts.timestamp() * 1000) if ts else 0
+
+
+def flight_version(flight_id):
+    """Data version of a post-flight flight, or None while it can still change.
+
+    One round trip; the subqueries only run for a post-flight flight (CASE).
+    """
+    done = Flight.status == 'post-flight'
+    max_tel = (select(func.max(Telemetry.id))
+                 .where(Telemetry.flight_id == flight_id).scalar_subquery())
+    sel = (select(func.max(DataSelection.id))
+             .where(DataSelection.flight_id == flight_id).scalar_subquery())
+    updated = (select(FlightSummary.updated_at)
+                 .where(FlightSummary.flight_id == flight_id).scalar_subquery())
+    row = (db.session.query(Flight.status, Flight.end_time,
+                            case((done, max_tel)), case((done, sel)), case((done, updated)))
+             .filter(Flight.id == flight_id).first())
+    if row is None or row[0] != 'post-flight':
+        return None
+    _, end_time, max_tel, sel, updated = row
+    return f"{max_tel or 0}.{_ms(end_time)}.{sel or 0}.{_ms(updated)}"
+
+
+def archive_version():
+    count, latest = (db.session.query(func.count(Flight.id), func.max(Flight.end_time))
+                       .filter(Flight.status == 'post-flight').one())
+    return f"{count}.{_ms(latest)}"
+
+
+class ResponseCache:
+    def __init__(self):
+        self.lru  = LRUCache()
+        self.disk = DiskStore(CACHE_DIR) if CACHE_DIR else None
+        # (scope,) → (version, fetched_at); an LRU too, so archive browsing stays bounded
+        self._versions = LRUCache(max_entries=CACHE_MAX_ENTRIES)
+        self.hits = self.misses = 0
+
+    def version(self, scope, compute):
+        cached = self._versions.get((scope,))
+        if cached and time.monotonic() - cached[1] < (VERSION_TTL if cached[0] is not None else LIVE_TTL):
+            return cached[0]
+        stored = self.disk.read(scope, 'version') if self.disk else None   # (version, written at)
+        if isinstance(stored, tuple) and time.time() - stored[1] < DISK_VERSION_TTL:
+            version = stored[0]
+        else:
+            version = compute()
+            if self.disk:
+                if stored is not None and (stored[0] if isinstance(stored, tuple) else stored) != version:
+                    self.disk.delete_scope(scope)
+                if version is not None:
+                    self.disk.write(scope, 'version', (version, time.time()))
+        self._versions.set((scope,), (version, time.monotonic()), 0)
+        return version
+
+    def get(self, key):
+        entry = self.lru.get(key)
+        if entry is None and self.disk:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.lru.set(key, entry, len(entry[0]))
+        return entry
+
+    def set(self, key, entry):
+        self.lru.set(key, entry, len(entry[0]))
+        if self.disk:
+            self.disk.set(key, entry)
+
+    def invalidate(self, flight_id=None):
+        """Drop a flight's entries (and the archive listing, which includes it)."""
+        scopes = [ARCHIVE_SCOPE] + ([flight_id] if flight_id is not None else [])
+        for scope in scopes:
+            self._versions.delete_scope(scope)
+            self.lru.delete_scope(scope)
+            if self.disk:
+                self.disk.delete_scope(scope)
+
+
+CACHE = ResponseCache()
+
+
+def _etag(key):
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]
+
+
+def cached(scope_of, version_of):
+    """Cache a GET view while `version_of(scope)` returns a version (not None).
+
+    `scope_of(**view_args)` names the invalidation scope (a flight id or
+    ARCHIVE_SCOPE). The response is compressed before it is stored, so the
+    negotiated encoding is part of the key.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            scope = scope_of(**kwargs)
+            version = CACHE.version(scope, lambda: version_of(scope))
+            if version is None:
+                return view(*args, **kwargs)
+
+            key = (scope, request.endpoint, tuple(sorted(kwargs.items())),
+                   request.query_string, compression.choose_encoding(), version)
+            etag = _etag(key)
+            if request.if_none_match.contains(etag):
+                resp = Response(status=304)
+                resp.set_etag(etag)
+                return resp
+
+            entry = CACHE.get(key)
+            if entry is None:
+                CACHE.misses += 1
+                resp = compression.compress_response(make_response(view(*args, **kwargs)))
+                if resp.status_code != 200:
+                    return resp
+                headers = {k: v for k, v in resp.headers.items()
+                           if k in ('Content-Type', 'Content-Encoding', 'Vary', 'X-Series-Meta')}
+                entry = (resp.get_data(), headers)
+                CACHE.set(key, entry)
+            else:
+                CACHE.hits += 1
+
+            body, headers = entry
+            resp = Response(body, headers=headers)
+            resp.set_etag(etag)
+            resp.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+            return resp
+        return wrapper
+    return decorator
+
+
+def flight_scope(flight_id, **_):
+    return flight_id
+
+
+def archive_scope(**_):
+    return ARCHIVE_SCOPE
+
+
+def scope_version(scope):
+    return archive_version() if scope == ARCHIVE_SCOPE else flight_version(scope)
+
+
+def cache_flight_view(view):
+    return cached(flight_scope, scope_version)(view)
+
+
+def cache_archive_view(view):
+    return cached(archive_scope, scope_version)(view)
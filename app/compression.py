@@ -0,0 +1,60 @@
+# app/compression.py
+"""
+Response compression negotiated from Accept-Encoding.
+
+Brotli is preferred when the optional `brotli` package is installed and the
+client accepts it, otherwise gzip. Small bodies, already-encoded responses
+and streamed/passthrough responses are left alone.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+from flask import request
+
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL         = 5    # good ratio on JSON at a fraction of level 9's CPU
+BROTLI_QUALITY     = 4
+COMPRESSIBLE = ('application/json', 'application/x-sonde-f32', 'text/html', 'text/css',
+                'text/plain', 'application/javascript')
+
+
+def choose_encoding():
+    accept = request.accept_encodings
+    if brotli is not None and accept['br']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    if encoding == 'br':
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -0,0 +1,73 @@
+# app/encoding.py
+"""
+Compact encodings for time-series endpoints (?format=...).
+
+  rows      list of per-point dicts (the original format)
+  columnar  {"t": [epoch ms...], "<col>": [values...], ...}   parallel arrays
+  f32       packed binary, little-endian:
+
+              header   '<4sBBHI'  magic b'SNDF', version, ncols, names_len, npoints
+              names    names_len bytes, comma-separated UTF-8, zero-padded to 8 bytes
+              t        float64[npoints]             epoch milliseconds
+              values   ncols x float32[npoints]     NaN where the value is missing
+
+Values are raw numbers; units and display formatting are the client's job.
+"""
+import json
+import struct
+from array import array
+from datetime import timezone
+
+from flask import Response, jsonify
+
+FORMATS   = ('rows', 'columnar', 'f32')
+F32_MAGIC = b'SNDF'
+F32_VERSION = 1
+F32_HEADER  = struct.Struct('<4sBBHI')
+F32_MIMETYPE = 'application/x-sonde-f32'
+
+NAN = float('nan')
+
+
+def epoch_ms(ts):
+    if ts is None:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
+
+
+def columnar(times, columns):
+    """Parallel arrays: `times` (datetimes) and {name: [values]}."""
+    out = {"t": [epoch_ms(ts) for ts in times]}
+    out.update(columns)
+    return out
+
+
+def pack_f32(times, columns):
+    names = ','.join(columns).encode('utf-8')
+    pad = -(F32_HEADER.size + len(names)) % 8
+    n = len(times)
+
+    parts = [F32_HEADER.pack(F32_MAGIC, F32_VERSION, len(columns), len(names) + pad, n),
+             names, b'\0' * pad,
+             array('d', [float(epoch_ms(ts)) for ts in times]).tobytes()]
+    for values in columns.values():
+        parts.append(array('f', [NAN if v is None else v for v in values]).tobytes())
+    return b''.join(parts)
+
+
+def series_response(fmt, times, columns, rows=None, meta=None):
+    """Build the response for one of FORMATS.
+
+    `rows` is the already-built per-point list for the 'rows' format; `meta`
+    (dict) goes into the JSON body, or into X-Series-Meta for f32.
+    """
+    meta = meta or {}
+    if fmt == 'f32':
+        resp = Response(pack_f32(times, columns), mimetype=F32_MIMETYPE)
+        resp.headers['X-Series-Meta'] = json.dumps(meta, separators=(',', ':'))
+        return resp
+    if fmt == 'columnar':
+        return jsonify(dict(meta, **columnar(times, columns)))
+    return jsonify(dict(meta, points=rows))
@@ -1,5 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 
-db = SQLAlchemy()
+from backend.models import Base
+
+# The models are declared on backend.models.Base (usable without Flask);
+# binding it here gives them Model.query and db.metadata for Alembic.
+db = SQLAlchemy(model_class=Base)
 login_manager = LoginManager()
@@ -1,9 +1,14 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session, current_app, abort
 from flask_login import login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from .models import User, Flight, Telemetry, Log, Alarm, Device, GroundReference, FlightStatus, DataSelection
 from datetime import datetime, timezone
 from .extensions import db
+from .snapshot import flight_snapshot
+from . import series, encoding, soundings
+from .cache import CACHE, cache_flight_view, cache_archive_view
+import config
+from backend import bus
 from flask import flash
 import requests
 
@@ -13,6 +18,15 @@ bp = Blueprint('main', __name__)
 def index():
     return redirect(url_for('main.login'))
 
+@bp.route('/metrics')
+def metrics_endpoint():
+    # Only for the local supervisor scrape; the app itself listens on 0.0.0.0.
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        abort(404)
+    from backend import metrics
+    return current_app.response_class(metrics.REGISTRY.render(),
+                                      mimetype='text/plain; version=0.0.4')
+
 @bp.route('/signup', methods=['GET', 'POST'])
 def signup():
     if request.method == 'POST':
@@ -161,6 +175,7 @@ def init_flight():
             )
             db.session.add(initial_status)
             db.session.commit()
+            bus.publish(bus.FLIGHTS, keys=(new_flight.id,), dsn=config.APP_DSN)
             print("DEBUG: FlightStatus created for flight", new_flight.id)
             # ───────────────────────────────────────────────────────
 
@@ -184,7 +199,9 @@ def logout():
 @bp.route('/dashboard')
 @login_required
 def dashboard():
+    # summary joined in the same query (sonde.flight_summary, keyed by flight_id)
     flights = Flight.query \
+        .options(db.joinedload(Flight.summary)) \
         .filter(Flight.status.in_(['pre-flight', 'flight'])) \
         .order_by(Flight.start_time.desc()) \
         .all()
@@ -192,6 +209,7 @@ def dashboard():
 
 @bp.route('/flight/<int:flight_id>')
 @login_required
+@cache_flight_view
 def flight_dashboard(flight_id):
     flight = Flight.query.get_or_404(flight_id)
 
@@ -201,12 +219,8 @@ def flight_dashboard(flight_id):
         .order_by(Telemetry.timestamp.desc()) \
         .first()
 
-    # Fetch _all_ telemetry rows for this flight, in chronological order:
-    points = Telemetry.query \
-        .filter_by(flight_id=flight_id) \
-        .order_by(Telemetry.timestamp.asc()) \
-        .all()
-
+    # Chart data is fetched by the page from /api/series, so rendering
+    # costs the same however long the flight has been running.
     logs = Log.query \
         .filter_by(flight_id=flight_id) \
         .order_by(Log.timestamp.desc()) \
@@ -218,95 +232,197 @@ def flight_dashboard(flight_id):
         flight=flight,
         telemetry=telemetry_latest,
         logs=logs,
-        points=points,                # pass the entire list to the template
         balloon_position=80,
         parachute_position=60,
         burst_position=0
     )
 
 
+# Display units for /api/telemetry values (formatting happens client-side)
+TELEMETRY_UNITS = {
+    "temp":                  "°C",
+    "humidity":              "%",
+    "pressure":              "mb",
+    "gps-altitude":          "m",
+    "altitude-delta":        "m/s",
+    "speed":                 "kt",
+    "signal_strength":       "dBm",
+    "peak-altitude":         "m",
+    "actual-burst-altitude": "m",
+}
+
+def _iso(ts):
+    return ts.isoformat() if ts else None
+
 @bp.route('/api/telemetry/<int:flight_id>')
 @login_required
+@cache_flight_view
 def telemetry(flight_id):
-    telemetry = Telemetry.query\
-           .filter_by(flight_id=flight_id)\
-           .order_by(Telemetry.timestamp.desc())\
-           .first()
-
-    if telemetry is None:
-        # no telemetry yet → still return mission info
-        flight = Flight.query.get_or_404(flight_id)
-        return jsonify({
-            "mission_number":  flight.mission_number,
-            "equipment":       flight.equipment,
-            "start_time":      flight.start_time.strftime("%H:%M:%S") if flight.start_time else None,
-            "date":            flight.start_time.strftime("%Y-%m-%d") if flight.start_time else None,
-            "temp":            "N/A",
-            "humidity":        "N/A",
-            "pressure":        "N/A",
-            "gps-altitude":    "N/A",
-            "altitude-delta":  "N/A",
-            "peak-altitude":   "N/A",
-            "speed":           "N/A",
-            "signal_strength":"N/A",
-            "mission-status":  flight.status,
-            "telecom-status":  "N/A",
-            "last-heard":      "N/A",
-            "burst-altitude":  "N/A"
-        })
-
-    # grab the analyzer row once
-    status = FlightStatus.query.filter_by(flight_id=telemetry.flight_id).first()
-
-    # 1) peak-altitude
-    if status and status.max_altitude is not None:
-        peak_alt = f"{status.max_altitude} m"
+    # flight + latest telemetry + analyzer row in one read (see app/snapshot.py)
+    snap = flight_snapshot(flight_id)
+    if snap is None:
+        abort(404)
+    flight, tel, status = snap.flight, snap.telemetry, snap.status
+
+    # Raw values only: the page formats them with TELEMETRY_UNITS (None → "N/A").
+    age = getattr(status, 'measurement_age', None)
+    if age is not None:
+        # Online if ≤6 s, Offline otherwise, Unknown if no data
+        telecom = "Online" if age <= 6 else "Offline"
     else:
-        peak_alt = "N/A"
+        telecom = "Unknown"
 
-    # 2) last-heard (measurement_age)
-    if status and status.measurement_age is not None:
-        age = status.measurement_age
-        last_heard = "<1s" if age < 1 else f"{age}s"
-    else:
-        last_heard = "N/A"
+    return jsonify({
+        "mission_number":        flight.mission_number,
+        "equipment":             flight.equipment,
+        "timestamp":             encoding.epoch_ms(tel.timestamp if tel else flight.start_time),
+        "temp":                  getattr(tel, 'temperature', None),
+        "humidity":              getattr(tel, 'humidity', None),
+        "pressure":              getattr(tel, 'pressure', None),
+        "gps-altitude":          getattr(tel, 'gps_altitude', None),
+        "altitude-delta":        getattr(tel, 'ascent_rate', None),
+        "speed":                 getattr(tel, 'speed', None),
+        "signal_strength":       getattr(tel, 'signal_strength', None),
+        "mission-status":        flight.status,
+        "peak-altitude":         getattr(status, 'max_altitude', None),
+        "telecom-status":        telecom,
+        "last-heard":            age,
+        "actual-burst-altitude": getattr(status, 'burst_altitude', None),
+        "units":                 TELEMETRY_UNITS,
+    })
+
+@bp.route('/api/series/<int:flight_id>')
+@login_required
+@cache_flight_view
+def telemetry_series(flight_id):
+    """
+    Chart series for one flight.
+
+    ?columns=gps_altitude,temperature   subset of series.SERIES_COLUMNS
+    ?start=ISO&end=ISO                  time range (inclusive)
+    ?points=N                           downsample the range to ~N rows (split across columns)
+    ?after_ts=ISO&after_id=N&limit=N    keyset pagination (when not downsampling)
+    ?format=rows|columnar|f32           see app/encoding.py
+    """
+    fmt = request.args.get("format", "rows")
+    if fmt not in encoding.FORMATS:
+        return jsonify({"error": f"Unknown format: {fmt}"}), 400
+    columns = [c for c in request.args.get("columns", "").split(",") if c] or list(series.DEFAULT_COLUMNS)
+    unknown = [c for c in columns if c not in series.SERIES_COLUMNS]
+    if unknown:
+        return jsonify({"error": f"Unknown column(s): {', '.join(unknown)}"}), 400
 
-    # 3) telecom-status (Online if ≤5 s, Offline otherwise, Unknown if no data)
-    if status and status.measurement_age is not None:
-        telecom = "Online" if status.measurement_age <= 6 else "Offline"
+    try:
+        start = datetime.fromisoformat(request.args["start"]) if request.args.get("start") else None
+        end   = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else None
+        after = None
+        if request.args.get("after_ts"):
+            after = (datetime.fromisoformat(request.args["after_ts"]), int(request.args.get("after_id", 0)))
+        points = request.args.get("points", type=int)
+        limit  = min(request.args.get("limit", series.PAGE_LIMIT, type=int), series.MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "Malformed start/end/after_ts/after_id."}), 400
+
+    if points:
+        rows = series.downsample(series.series_query(flight_id, columns, start, end),
+                                 ('timestamp', 'id'), columns, min(points, series.MAX_POINTS))
+        total, cursor = rows[0].total if rows else 0, None
     else:
-        telecom = "Unknown"
+        rows, cursor = series.read_page(flight_id, columns, start, end, after, max(limit, 1))
+        total = None
+
+    meta = {
+        "flight_id":   flight_id,
+        "columns":     columns,
+        "total":       total,
+        "downsampled": bool(points) and total > len(rows),
+        "next":        {"after_ts": series.utc(cursor[0]).isoformat(), "after_id": cursor[1]} if cursor else None,
+    }
+    if fmt == "rows":
+        return encoding.series_response(fmt, None, None, [series.row_to_dict(r, columns) for r in rows], meta)
+    return encoding.series_response(fmt, [r.timestamp for r in rows],
+                                    {c: [r[k + 2] for r in rows] for k, c in enumerate(columns)},
+                                    meta=meta)
 
-    # 4) actual-burst-altitude
-    if status and status.burst_altitude is not None:
-        burst_actual = f"{status.burst_altitude} m"
+@bp.route('/api/channels/<int:flight_id>')
+@login_required
+@cache_flight_view
+def channel_series(flight_id):
+    """
+    Extra sensor channels of one flight (sonde.channel_samples), pivoted.
+
+    (no ?names)                         the channels registered for the flight's device
+    ?names=ozone,uv                     registered channel names, one column each
+    ?start=ISO&end=ISO                  time range (inclusive)
+    ?points=N                           downsample the range to ~N rows (split across channels)
+    ?after_ts=ISO&limit=N               keyset pagination (when not downsampling)
+    ?format=rows|columnar|f32           see app/encoding.py
+    """
+    registered = {ch.name: ch for ch in series.flight_channels(flight_id)}
+    names = [n for n in request.args.get("names", "").split(",") if n]
+    if not names:
+        return jsonify({"flight_id": flight_id, "channels": [
+            {"name": ch.name, "position": ch.position, "unit": ch.unit, "rate_hz": ch.rate_hz}
+            for ch in registered.values()]})
+    unknown = [n for n in names if n not in registered]
+    if unknown:
+        return jsonify({"error": f"Unknown channel(s): {', '.join(unknown)}"}), 400
+    fmt = request.args.get("format", "rows")
+    if fmt not in encoding.FORMATS:
+        return jsonify({"error": f"Unknown format: {fmt}"}), 400
+
+    try:
+        start = datetime.fromisoformat(request.args["start"]) if request.args.get("start") else None
+        end   = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else None
+        after = datetime.fromisoformat(request.args["after_ts"]) if request.args.get("after_ts") else None
+        points = request.args.get("points", type=int)
+        limit  = min(request.args.get("limit", series.PAGE_LIMIT, type=int), series.MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "Malformed start/end/after_ts."}), 400
+
+    channels = [registered[n] for n in names]
+    if points:
+        rows = series.downsample(series.channel_query(flight_id, channels, start, end),
+                                 ('timestamp',), [f'c{i}' for i in range(len(channels))],
+                                 min(points, series.MAX_POINTS))
+        total, cursor = rows[0].total if rows else 0, None
     else:
-        burst_actual = "N/A"
-
-    data = {
-        "mission_number":       telemetry.flight.mission_number,
-        "equipment":            telemetry.flight.equipment,
-        "start_time":           telemetry.timestamp.strftime("%H:%M:%S"),
-        "date":                 telemetry.timestamp.strftime("%Y-%m-%d"),
-        "temp":                 f"{telemetry.temperature} °C",
-        "humidity":             f"{telemetry.humidity} %",
-        "pressure":             f"{telemetry.pressure} mb",
-        "gps-altitude":         f"{telemetry.gps_altitude} m",
-        "altitude-delta":       f"{telemetry.ascent_rate} m/s",
-        "speed":                f"{telemetry.speed} kt",
-        "signal_strength":      f"{telemetry.signal_strength} dBm",
-        "mission-status":       telemetry.flight.status,
-        "peak-altitude":        peak_alt,
-        "telecom-status":       telecom,
-        "last-heard":           last_heard,
-        "actual-burst-altitude": burst_actual
-        # ... any other fields you still need ...
+        rows, cursor = series.read_channel_page(flight_id, channels, start, end, after, max(limit, 1))
+        total = None
+
+    meta = {
+        "flight_id":   flight_id,
+        "columns":     names,
+        "units":       {ch.name: ch.unit for ch in channels},
+        "total":       total,
+        "downsampled": bool(points) and total > len(rows),
+        "next":        {"after_ts": series.utc(cursor).isoformat()} if cursor else None,
     }
-    return jsonify(data)
+    if fmt == "rows":
+        return encoding.series_response(fmt, None, None, [
+            {"timestamp": series.utc(r.timestamp).isoformat(), **{n: r[k + 1] for k, n in enumerate(names)}}
+            for r in rows], meta)
+    return encoding.series_response(fmt, [r.timestamp for r in rows],
+                                    {n: [r[k + 1] for r in rows] for k, n in enumerate(names)},
+                                    meta=meta)
+
+@bp.route('/api/profile/<int:flight_id>')
+@login_required
+@cache_flight_view
+def flight_profile(flight_id):
+    """Ascending/descending soundings: mandatory pressure levels + altitude bins."""
+    if db.session.get(Flight, flight_id) is None:
+        abort(404)
+    return jsonify(soundings.flight_profile(flight_id))
 
 @bp.route('/api/gps/<int:flight_id>')
 @login_required
+@cache_flight_view
 def gps_data(flight_id):
+    fmt = request.args.get("format", "rows")
+    if fmt not in encoding.FORMATS:
+        return jsonify({"error": f"Unknown format: {fmt}"}), 400
+
     # 1) Fetch only post-calibration points
     gr = GroundReference.query.filter_by(flight_id=flight_id).first()
     if not gr:
@@ -334,7 +450,7 @@ def gps_data(flight_id):
     burst_ts = status.release_ts if status and status.burst_detected is False else status.burst_ts
 
     # 3) Filter and annotate points
-    out = []
+    kept = []
     n = len(recs)
     for idx, r in enumerate(recs):
         if r.gps_latitude is None or r.gps_longitude is None:
@@ -357,23 +473,32 @@ def gps_data(flight_id):
             icon = "burst"
         elif idx == n - 1:
             icon = "end"
-
-        out.append({
-            "coords": [r.gps_latitude, r.gps_longitude],
-            "altitude": r.gps_altitude,
-            "timestamp": r.timestamp.isoformat(),             # for frontend logic
-            "timestamp_str": r.timestamp.strftime("%H:%M:%S UTC"),  # for display
-            "icon": icon
-        })
+        kept.append((r, icon))
+
+    # Compact formats: parallel arrays, icons as {name: index}; the client formats times.
+    if fmt != "rows":
+        return encoding.series_response(fmt, [r.timestamp for r, _ in kept], {
+            "lat": [r.gps_latitude for r, _ in kept],
+            "lng": [r.gps_longitude for r, _ in kept],
+            "alt": [r.gps_altitude for r, _ in kept],
+        }, meta={"icons": {icon: i for i, (_, icon) in enumerate(kept) if icon}})
+
+    out = [{
+        "coords": [r.gps_latitude, r.gps_longitude],
+        "altitude": r.gps_altitude,
+        "timestamp": r.timestamp.isoformat(),             # for frontend logic
+        "timestamp_str": r.timestamp.strftime("%H:%M:%S UTC"),  # for display
+        "icon": icon
+    } for r, icon in kept]
 
     return jsonify(out)
 
 @bp.route('/api/status/<int:flight_id>')
 @login_required
+@cache_flight_view
 def flight_status(flight_id):
-    from .models import FlightStatus
-
-    status = FlightStatus.query.filter_by(flight_id=flight_id).first()
+    snap = flight_snapshot(flight_id)
+    status = snap.status if snap else None
     if not status:
         return jsonify({"error": "No status available for this flight."}), 404
 
@@ -389,7 +514,7 @@ def flight_status(flight_id):
         "burst_position":      status.burst_position,
         "parachute_position":  status.parachute_position,
         "updated_at":          status.updated_at.isoformat() if status.updated_at else None,
-        "calibrated":          GroundReference.query.filter_by(flight_id=flight_id).first() is not None,
+        "calibrated":          snap.calibrated,
 
         "receiver_ok":          status.receiver_ok,
         "parser_ok":            status.parser_ok,
@@ -401,7 +526,23 @@ def flight_status(flight_id):
         "temp_low":             status.temp_low,
         "data_degrad":          status.data_degrad,
         "gps_fix":              status.gps_fix,
-        "gps_degrad":           status.gps_degrad
+        "gps_degrad":           status.gps_degrad,
+
+        "predicted_landing": {
+            "lat": status.predicted_landing_lat,
+            "lng": status.predicted_landing_lng,
+            "eta": _iso(status.predicted_landing_ts),
+        } if status.predicted_landing_lat is not None else None,
+
+        "burst_forecast": {
+            "altitude":    status.burst_forecast_alt,
+            "altitude_lo": status.burst_forecast_alt_lo,
+            "altitude_hi": status.burst_forecast_alt_hi,
+            "pressure":    status.burst_forecast_pressure,
+            "eta":         _iso(status.burst_forecast_ts),
+            "eta_lo":      _iso(status.burst_forecast_ts_lo),
+            "eta_hi":      _iso(status.burst_forecast_ts_hi),
+        } if status.burst_forecast_alt is not None else None,
     })
 
 @bp.route('/flight/<int:flight_id>/calibrate', methods=['POST'])
@@ -443,6 +584,7 @@ def calibrate_ground(flight_id):
 
     db.session.add(log)
     db.session.commit()
+    bus.publish(bus.FLIGHTS, keys=(flight_id,), dsn=config.APP_DSN)
 
     return jsonify({"message": "Ground reference calibrated."})
 
@@ -475,8 +617,9 @@ def release_flight(flight_id):
     )
     db.session.add(log)
 
-    # 4) commit all at once
+    # 4) commit all at once; the analyzer picks the flight up right away
     db.session.commit()
+    bus.publish(bus.FLIGHTS, keys=(flight_id,), dsn=config.APP_DSN)
 
     # 5) return only primitives
     return jsonify({
@@ -516,6 +659,8 @@ def end_flight(flight_id):
 
     # 4) commit
     db.session.commit()
+    CACHE.invalidate(flight_id)
+    bus.publish(bus.FLIGHTS, keys=(flight_id,), dsn=config.APP_DSN)
 
     return jsonify({
         "message":    "Flight marked as ended.",
@@ -525,6 +670,7 @@ def end_flight(flight_id):
 
 @bp.route('/api/logs/<int:flight_id>')
 @login_required
+@cache_flight_view
 def get_logs(flight_id):
     logs = Log.query.filter_by(flight_id=flight_id).order_by(Log.timestamp.desc()).limit(20).all()
     return jsonify({
@@ -568,8 +714,10 @@ def init_device():
 
 @bp.route('/archive')
 @login_required
+@cache_archive_view
 def archive():
     flights = Flight.query\
+        .options(db.joinedload(Flight.summary))\
         .filter_by(status='post-flight')\
         .order_by(Flight.end_time.desc())\
         .all()
@@ -607,6 +755,7 @@ def confirm_data_selection(flight_id):
         )
         db.session.add(selection)
         db.session.commit()
+        CACHE.invalidate(flight_id)
         flash("Data selection saved.", "success")
         return redirect(url_for("main.dashboard"))
     except Exception as e:
@@ -0,0 +1,139 @@
+# app/series.py
+"""
+Telemetry time series for charts (/api/series/<flight_id>).
+
+Two ways to read a flight:
+  - pages:       keyset pagination on (timestamp, id), `limit` rows at a time
+  - downsampled: the whole range reduced to at most ~`points` rows in SQL
+                 (downsample: equal-count time buckets, each keeping its
+                 first/last row and every column's min and max row, so
+                 peaks such as burst altitude or the coldest temperature
+                 survive). Only the kept rows are sent and built in Python.
+Only the requested columns are selected, as plain tuples.
+
+Extra sensor channels (/api/channels/<flight_id>, backend/etl/channels.py)
+are read the same two ways from sonde.channel_samples, pivoted in SQL to one
+row per measurement_ts with a column per requested channel.
+"""
+from datetime import timezone
+
+from sqlalchemy import func, or_, select, tuple_
+
+from .extensions import db
+from .models import Channel, ChannelSample, Flight, Telemetry
+
+# Columns a client may ask for (numeric telemetry only)
+SERIES_COLUMNS = (
+    'gps_altitude', 'gps_latitude', 'gps_longitude', 'pressure', 'temperature',
+    'humidity', 'signal_strength', 'speed', 'ascent_rate', 'hdop', 'sats',
+    'dew_point', 'potential_temp', 'mixing_ratio', 'wind_speed', 'wind_dir',
+)
+DEFAULT_COLUMNS = ('gps_altitude', 'temperature', 'humidity', 'pressure')
+
+PAGE_LIMIT   = 1000
+MAX_LIMIT    = 5000
+MAX_POINTS   = 5000
+
+
+def utc(ts):
+    return ts.replace(tzinfo=timezone.utc) if ts is not None and ts.tzinfo is None else ts
+
+
+def series_query(flight_id, columns, start=None, end=None):
+    cols = [getattr(Telemetry, c) for c in columns]
+    q = (db.session.query(Telemetry.id, Telemetry.timestamp, *cols)
+           .filter(Telemetry.flight_id == flight_id))
+    if start is not None:
+        q = q.filter(Telemetry.timestamp >= start)
+    if end is not None:
+        q = q.filter(Telemetry.timestamp <= end)
+    return q.order_by(Telemetry.timestamp.asc(), Telemetry.id.asc())
+
+
+def read_page(flight_id, columns, start=None, end=None, after=None, limit=PAGE_LIMIT):
+    """One page of rows after the (timestamp, id) cursor `after`.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    q = series_query(flight_id, columns, start, end)
+    if after is not None:
+        q = q.filter(tuple_(Telemetry.timestamp, Telemetry.id) > tuple_(*after))
+    rows = q.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1].timestamp, rows[-1].id)
+
+
+def flight_channels(flight_id):
+    """Channels registered for the flight's device, in payload order."""
+    return (db.session.query(Channel)
+              .join(Flight, Flight.device_id == Channel.device_id)
+              .filter(Flight.id == flight_id)
+              .order_by(Channel.position)
+              .all())
+
+
+def channel_query(flight_id, channels, start=None, end=None):
+    """(timestamp, <one value per channel>) rows, one per measurement_ts."""
+    ts = ChannelSample.measurement_ts
+    cols = [func.max(ChannelSample.value).filter(ChannelSample.channel_id == ch.id).label(f'c{i}')
+            for i, ch in enumerate(channels)]
+    q = (db.session.query(ts.label('timestamp'), *cols)
+           .filter(ChannelSample.flight_id == flight_id,
+                   ChannelSample.channel_id.in_([ch.id for ch in channels])))
+    if start is not None:
+        q = q.filter(ts >= start)
+    if end is not None:
+        q = q.filter(ts <= end)
+    return q.group_by(ts).order_by(ts.asc())
+
+
+def read_channel_page(flight_id, channels, start=None, end=None, after=None, limit=PAGE_LIMIT):
+    """One page of channel rows after the measurement_ts `after`; (rows, next_cursor)."""
+    q = channel_query(flight_id, channels, start, end)
+    if after is not None:
+        q = q.filter(ChannelSample.measurement_ts > after)
+    rows = q.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1].timestamp
+
+
+def downsample(q, keys, values, points):
+    """Rows of query `q` reduced to ~`points` in SQL, as (*q's columns, total).
+
+    The rows, in `keys` order, are cut into equal-count buckets (ntile). Each
+    bucket keeps its first and last row and, for each of `values`, the rows
+    holding its min and max, so 2 + 2 * len(values) rows per bucket at most
+    and peaks survive. Kept rows are real samples, columns stay aligned, and
+    only they leave the database. `total` is the row count before reduction;
+    a range of at most `points` rows comes back whole.
+    """
+    sub = q.order_by(None).subquery()
+    order = [sub.c[k] for k in keys]
+    n = max(points // (2 + 2 * len(values)), 1)
+    bucketed = select(sub, func.ntile(n).over(order_by=order).label('bucket'),
+                      func.count().over().label('total')).subquery()
+    b = bucketed.c.bucket
+    order = [bucketed.c[k] for k in keys]
+    picks = [func.row_number().over(partition_by=b, order_by=order),
+             func.row_number().over(partition_by=b, order_by=[c.desc() for c in order])]
+    for v in values:
+        col = bucketed.c[v]
+        picks.append(func.row_number().over(partition_by=b, order_by=[col.asc().nulls_last()] + order))
+        picks.append(func.row_number().over(partition_by=b, order_by=[col.desc().nulls_last()] + order))
+    ranked = select(bucketed, *(p.label(f'pick{i}') for i, p in enumerate(picks))).subquery()
+    keep = or_(ranked.c.total <= points, *(ranked.c[f'pick{i}'] == 1 for i in range(len(picks))))
+    return db.session.execute(
+        select(*(ranked.c[c] for c in sub.c.keys()), ranked.c.total)
+          .where(keep)
+          .order_by(*(ranked.c[k] for k in keys))).all()
+
+
+def row_to_dict(row, columns):
+    out = {"id": row.id, "timestamp": utc(row.timestamp).isoformat()}
+    for k, c in enumerate(columns):
+        out[c] = row[k + 2]
+    return out
@@ -0,0 +1,46 @@
+# app/snapshot.py
+"""
+One-read "flight snapshot" shared by the polling endpoints.
+
+/api/telemetry and /api/status are polled every couple of seconds by every
+open flight page. Instead of loading the latest Telemetry, then its Flight
+(lazy load), then FlightStatus, then GroundReference, a single SELECT joins
+
+    flights ─┬─ LATERAL (latest telemetry row)   ix_telemetry_flight_ts
+             ├─ flight_status                    unique flight_id
+             └─ EXISTS ground_reference          unique flight_id
+
+and hands the routes plain ORM objects, so nothing lazy-loads afterwards.
+"""
+from collections import namedtuple
+
+from sqlalchemy import true, exists
+from sqlalchemy.orm import aliased
+
+from .extensions import db
+from .models import Flight, Telemetry, FlightStatus, GroundReference
+
+FlightSnapshot = namedtuple('FlightSnapshot', 'flight telemetry status calibrated')
+
+
+def flight_snapshot(flight_id):
+    """Return a FlightSnapshot (telemetry/status may be None), or None if no such flight."""
+    latest = (db.select(Telemetry)
+                .where(Telemetry.flight_id == Flight.id)
+                .order_by(Telemetry.timestamp.desc())
+                .limit(1)
+                .subquery()
+                .lateral())
+    tel = aliased(Telemetry, latest)
+    calibrated = exists().where(GroundReference.flight_id == Flight.id)
+
+    row = db.session.execute(
+        db.select(Flight, tel, FlightStatus, calibrated.label('calibrated'))
+          .select_from(Flight)
+          .outerjoin(tel, true())
+          .outerjoin(FlightStatus, FlightStatus.flight_id == Flight.id)
+          .where(Flight.id == flight_id)
+    ).first()
+    if row is None:
+        return None
+    return FlightSnapshot(*row)
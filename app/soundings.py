@@ -0,0 +1,44 @@
+# app/soundings.py
+"""
+Per-flight sounding cache for /api/profile (engine: backend/sounding.py).
+
+Profiles are rebuilt only when the flight has new telemetry: the cache key
+includes flight_summary's point_count and last_ts, a primary-key read,
+so a live flight's profile is recomputed at most once per parser batch.
+"""
+from .cache import LRUCache
+from .extensions import db
+from .models import Telemetry, FlightSummary
+from backend import sounding
+
+PROFILE_CACHE = LRUCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+
+
+def profile_version(flight_id):
+    s = db.session.get(FlightSummary, flight_id)
+    if s is None:
+        return None
+    return (s.point_count, s.last_ts)
+
+
+def flight_profile(flight_id):
+    version = profile_version(flight_id)
+    key = (flight_id, version)
+    if version is not None:
+        hit = PROFILE_CACHE.get(key)
+        if hit is not None:
+            return hit
+
+    rows = (db.session.query(Telemetry.gps_altitude, Telemetry.pressure,
+                             Telemetry.temperature, Telemetry.humidity)
+              .filter(Telemetry.flight_id == flight_id)
+              .order_by(Telemetry.timestamp.asc())
+              .all())
+    profile = sounding.build_profile(rows)
+
+    if version is not None:
+        PROFILE_CACHE.delete_scope(flight_id)   # older versions of this flight
+        size = 200 * sum(len(leg['bins']['altitude']) + len(leg['levels'])
+                         for leg in (profile['ascent'], profile['descent']))
+        PROFILE_CACHE.set(key, profile, size)
+    return profile
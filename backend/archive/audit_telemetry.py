@@ -1,24 +1,23 @@
 # audit_telemetry.py
 
-import psycopg2
 from datetime import timedelta
 
-DSN = "dbname=weather_sonde user=ingest_user password=strong_ingest_password host=localhost"
+import config
+
 GAP_THRESHOLD_SECONDS = 5
 
+AUDIT_SELECT = config.Prepared('audit_flight_telemetry', """
+    SELECT measurement_ts, gps_altitude, temperature, humidity, pressure, signal_strength
+      FROM sonde.telemetry
+     WHERE flight_id = $1
+     ORDER BY measurement_ts ASC
+""", 1)
+
 
 def audit_flight_telemetry(flight_id):
-    conn = psycopg2.connect(DSN)
-    cur = conn.cursor()
-
-    cur.execute("""
-                SELECT measurement_ts, gps_altitude, temperature, humidity, pressure, signal_strength
-                FROM sonde.telemetry
-                WHERE flight_id = %s
-                ORDER BY measurement_ts ASC
-                """, (flight_id,))
-    rows = cur.fetchall()
-    conn.close()
+    # Pooled: a web request borrows a warm connection instead of opening one.
+    with config.connection(config.INGEST_DSN) as conn, conn.cursor() as cur:
+        rows = AUDIT_SELECT.execute(cur, (flight_id,)).fetchall()
 
     if not rows:
         return {"error": "No telemetry found."}
@@ -0,0 +1,176 @@
+# backend/bus.py
+"""
+Coalescing pub/sub over Postgres LISTEN/NOTIFY.
+
+Writers publish after their commit and readers wait on the channels they
+care about instead of polling:
+
+  packet_inserted     raw.packets rows           receiver, forward server, mimik → parser
+  telemetry_inserted  sonde.telemetry rows       parser, service                  → analyzer
+  status_updated      sonde.flight_status rows   analyzer, service
+  flight_changed      sonde.flights status       routes (release / end / ...)     → analyzer
+
+A payload describes a batch, not a row: {"first": id, "last": id, "n": count,
+"keys": [flight ids, ...]}. publish() sends the first event on a channel at
+once, then merges everything published within COALESCE_MS into a single
+trailing NOTIFY, so a burst of inserts costs Postgres one notification per
+channel per window however many rows it contains.
+
+Notifications go out on a dedicated autocommit connection per DSN, so a
+publish only ever follows a committed write. Transactional writers that
+hold an asyncpg connection (backend/service.py) use NOTIFY_SQL with
+encode() inside their transaction instead; Postgres delivers it on commit.
+
+Subscriber wraps a LISTENing psycopg2 connection; wait() returns the
+pending events as Event tuples, merged per channel the same way.
+"""
+import json
+import os
+import select
+import threading
+import time
+from collections import namedtuple
+
+import config
+
+PACKETS   = 'packet_inserted'
+TELEMETRY = 'telemetry_inserted'
+STATUS    = 'status_updated'
+FLIGHTS   = 'flight_changed'
+
+COALESCE_MS  = int(os.getenv('BUS_COALESCE_MS', '200'))
+MAX_KEYS     = 256      # keys carried per event; beyond that "keys": null (= all)
+NOTIFY_SQL   = "SELECT pg_notify($1, $2)"
+
+Event = namedtuple('Event', 'channel first last count keys')
+
+
+# ── payloads ─────────────────────────────────────────────────────────────────
+def encode(first=None, last=None, count=1, keys=()):
+    keys = sorted(keys) if keys is not None else None
+    if keys is not None and len(keys) > MAX_KEYS:
+        keys = None
+    return json.dumps({'first': first, 'last': last, 'n': count, 'keys': keys},
+                      separators=(',', ':'))
+
+
+def decode(channel, payload):
+    try:
+        d = json.loads(payload) if payload else {}
+    except ValueError:
+        d = {}
+    keys = d.get('keys', ())
+    return Event(channel, d.get('first'), d.get('last'), d.get('n', 1),
+                 frozenset(keys) if keys is not None else None)
+
+
+def merge(a, b):
+    """One Event covering both (same channel); keys None means "any"."""
+    if a is None:
+        return b
+    firsts = [x for x in (a.first, b.first) if x is not None]
+    lasts  = [x for x in (a.last, b.last) if x is not None]
+    keys = None if a.keys is None or b.keys is None else a.keys | b.keys
+    return Event(a.channel, min(firsts) if firsts else None, max(lasts) if lasts else None,
+                 a.count + b.count, keys)
+
+
+# ── publishing ───────────────────────────────────────────────────────────────
+class Publisher:
+    def __init__(self, dsn=None, interval_ms=COALESCE_MS):
+        self.dsn = dsn or config.INGEST_DSN
+        self.interval = interval_ms / 1000.0
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pending = {}       # channel → Event waiting for the window to close
+        self._sent = {}          # channel → monotonic time of the last NOTIFY
+        self._timers = {}        # channel → threading.Timer flushing the window
+
+    def publish(self, channel, first=None, last=None, count=1, keys=()):
+        ev = Event(channel, first, last, count,
+                   frozenset(keys) if keys is not None else None)
+        with self._lock:
+            self._pending[channel] = merge(self._pending.get(channel), ev)
+            wait = self._sent.get(channel, float('-inf')) + self.interval - time.monotonic()
+            if wait <= 0:
+                self._flush(channel)
+            elif channel not in self._timers:
+                t = self._timers[channel] = threading.Timer(wait, self._on_timer, (channel,))
+                t.daemon = True
+                t.start()
+
+    def _on_timer(self, channel):
+        with self._lock:
+            self._timers.pop(channel, None)
+            self._flush(channel)
+
+    def _flush(self, channel):
+        ev = self._pending.pop(channel, None)
+        if ev is None:
+            return
+        try:
+            if self._conn is None or self._conn.closed:
+                self._conn = config.connect(self.dsn, autocommit=True)
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT pg_notify(%s, %s)", (channel, encode(*ev[1:])))
+        except Exception as e:   # a lost wake-up must never fail the write it follows
+            print(f"[bus] notify {channel} failed: {e}")
+            self._conn = None
+        self._sent[channel] = time.monotonic()
+
+    def flush(self):
+        """Send everything pending now (before exit)."""
+        with self._lock:
+            for t in self._timers.values():
+                t.cancel()
+            self._timers.clear()
+            for channel in list(self._pending):
+                self._flush(channel)
+
+
+_publishers = {}
+_publishers_lock = threading.Lock()
+
+
+def publisher(dsn=None):
+    """The process-wide Publisher for `dsn` (default: the ingest role)."""
+    dsn = dsn or config.INGEST_DSN
+    with _publishers_lock:
+        if dsn not in _publishers:
+            _publishers[dsn] = Publisher(dsn)
+        return _publishers[dsn]
+
+
+def publish(channel, first=None, last=None, count=1, keys=(), dsn=None):
+    publisher(dsn).publish(channel, first, last, count, keys)
+
+
+# ── subscribing ──────────────────────────────────────────────────────────────
+class Subscriber:
+    """LISTEN on `channels` over `conn` (an autocommit psycopg2 connection)."""
+
+    def __init__(self, conn, *channels):
+        self.conn = conn
+        self.channels = channels
+        with conn.cursor() as cur:
+            for channel in channels:
+                cur.execute(f"LISTEN {channel};")
+
+    def fileno(self):
+        return self.conn.fileno()
+
+    def wait(self, timeout=None):
+        """{channel: Event} received within `timeout` seconds (None: block).
+
+        Returns as soon as anything arrives; everything already queued is
+        merged into one Event per channel.
+        """
+        if not self.conn.notifies:
+            if select.select([self.conn], [], [], timeout) == ([], [], []):
+                return {}
+        self.conn.poll()
+        events = {}
+        for n in self.conn.notifies:
+            events[n.channel] = merge(events.get(n.channel), decode(n.channel, n.payload))
+        self.conn.notifies.clear()
+        return events
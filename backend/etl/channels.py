@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Extra sensor channels (sonde.channels / sonde.channel_samples)
+
+A payload line is
+
+    sn,token,utc,temp,hum,pres,lat,lng,alt,hdop,sats[,ch0[,ch1...]]
+
+The first FIXED_FIELDS columns go to sonde.telemetry as before. Every field
+after them is a channel, identified by its position (0 = first extra field)
+and registered per device in sonde.channels with a name, unit and rate. A
+field may carry several readings separated by ';' for a sensor sampled
+faster than the line rate: reading i is stamped measurement_ts + i / rate_hz,
+or spread evenly over one second when the channel has no rate.
+
+Readings go to one narrow table,
+
+    sonde.channel_samples (flight_id, channel_id, measurement_ts, value)
+
+so a new sensor is a row in sonde.channels instead of a migration, and a
+sparse channel costs nothing on the lines that do not carry it. The parser
+writes a batch's readings with one multi-row INSERT (write_samples), the
+unified service COPYs them. Values at unregistered positions are counted in
+sonde_channel_values_dropped_total and skipped; raw.packets still has them.
+
+Reading back is a pivot, one row per measurement_ts with one column per
+requested channel: read_pivot() here, app/series.py for /api/channels.
+
+Register and list channels (owner role):
+    python3 -m backend.etl.channels add B1234 0 ozone --unit ppb --rate 4
+    python3 -m backend.etl.channels list B1234
+"""
+import sys
+import math
+import time
+import argparse
+from datetime import timedelta
+
+import config
+from backend import metrics
+
+FIXED_FIELDS = 11      # sn … sats, see parse_raw.split_header / parse_fields
+REFRESH_SEC  = 30      # registrations are reloaded this often
+SUB_SEP      = ';'     # separates the readings within one field
+PAGE_SIZE    = 1000    # rows per INSERT statement
+
+VALUES_DROPPED = metrics.counter('sonde_channel_values_dropped_total',
+                                 'Channel readings not stored, by reason')
+READINGS       = metrics.counter('sonde_channel_readings_total', 'Channel readings parsed')
+
+SAMPLE_COLUMNS  = ('flight_id', 'channel_id', 'measurement_ts', 'value')
+SAMPLE_CONFLICT = "ON CONFLICT (flight_id, measurement_ts, channel_id) DO NOTHING"
+SAMPLE_INSERT   = f"""
+    INSERT INTO sonde.channel_samples ({', '.join(SAMPLE_COLUMNS)}) VALUES %s
+    {SAMPLE_CONFLICT}
+"""
+
+CHANNELS_SQL = """
+    SELECT d.device_sn, c.position, c.id, c.rate_hz
+      FROM sonde.channels c
+      JOIN sonde.devices d ON d.id = c.device_id
+"""
+
+FLIGHT_CHANNELS_SQL = """
+    SELECT c.id, c.name
+      FROM sonde.channels c
+      JOIN sonde.flights f ON f.device_id = c.device_id
+     WHERE f.id = %s
+"""
+
+
+# ── parsing ──────────────────────────────────────────────────────────────────
+def parse_reading(val):
+    try:
+        v = float(val)
+    except ValueError:
+        return None
+    return v if math.isfinite(v) else None
+
+
+def sample_rows(flight_id, measurement_ts, fields, registered):
+    """sonde.channel_samples rows (SAMPLE_COLUMNS) for a line's extra `fields`.
+
+    `registered` maps position → (channel_id, rate_hz) for the line's device.
+    """
+    rows = []
+    for position, field in enumerate(fields):
+        readings = [parse_reading(v) for v in field.split(SUB_SEP)]
+        n = sum(v is not None for v in readings)
+        if not n:
+            continue
+        channel = registered.get(position)
+        if channel is None or measurement_ts is None:
+            VALUES_DROPPED.inc(n, reason='unregistered' if channel is None else 'no_timestamp')
+            continue
+        channel_id, rate_hz = channel
+        step = 1.0 / rate_hz if rate_hz else 1.0 / len(readings)
+        for i, value in enumerate(readings):
+            if value is not None:
+                rows.append((flight_id, channel_id,
+                             measurement_ts + timedelta(seconds=i * step), value))
+        READINGS.inc(n)
+    return rows
+
+
+class ChannelMap:
+    """Every device's registered channels, reloaded every REFRESH_SEC."""
+
+    def __init__(self, refresh=REFRESH_SEC):
+        self.refresh = refresh
+        self.by_device = {}     # 'B1234' → {position: (channel_id, rate_hz)}
+        self.loaded_at = None
+
+    def load(self, rows):
+        """Replace the map with CHANNELS_SQL rows (psycopg2 tuples or asyncpg records)."""
+        by_device = {}
+        for device_sn, position, channel_id, rate_hz in rows:
+            by_device.setdefault(device_sn, {})[position] = (channel_id, rate_hz)
+        self.by_device = by_device
+        self.loaded_at = time.monotonic()
+
+    def get(self, cur, device_sn):
+        if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh:
+            cur.execute(CHANNELS_SQL)
+            self.load(cur.fetchall())
+        return self.by_device.get(device_sn, {})
+
+
+def write_samples(cur, rows):
+    """Bulk-insert sample_rows() output; readings already stored are skipped."""
+    if rows:
+        from psycopg2.extras import execute_values
+        execute_values(cur, SAMPLE_INSERT, rows, page_size=PAGE_SIZE)
+
+
+# ── reading ──────────────────────────────────────────────────────────────────
+def pivot_sql(n, start=None, end=None, limit=None):
+    """One row per measurement_ts, columns c0 … c<n-1> for %(c0)s … channel ids."""
+    cols = ', '.join(f"max(value) FILTER (WHERE channel_id = %(c{i})s) AS c{i}" for i in range(n))
+    return f"""
+        SELECT measurement_ts, {cols}
+          FROM sonde.channel_samples
+         WHERE flight_id = %(flight_id)s
+           AND channel_id IN ({', '.join(f'%(c{i})s' for i in range(n))})
+           {'AND measurement_ts >= %(start)s' if start is not None else ''}
+           {'AND measurement_ts <= %(end)s' if end is not None else ''}
+         GROUP BY measurement_ts
+         ORDER BY measurement_ts
+         {'LIMIT %(limit)s' if limit is not None else ''}
+    """
+
+
+def read_pivot(cur, flight_id, names, start=None, end=None, limit=None):
+    """[(measurement_ts, value of names[0], value of names[1], …), …] for one flight.
+
+    Raises KeyError for a name the flight's device has not registered.
+    """
+    cur.execute(FLIGHT_CHANNELS_SQL, (flight_id,))
+    ids = {name: channel_id for channel_id, name in cur.fetchall()}
+    missing = [n for n in names if n not in ids]
+    if missing:
+        raise KeyError(', '.join(missing))
+    params = {'flight_id': flight_id, 'start': start, 'end': end, 'limit': limit}
+    params.update({f'c{i}': ids[n] for i, n in enumerate(names)})
+    cur.execute(pivot_sql(len(names), start, end, limit), params)
+    return cur.fetchall()
+
+
+# ── registration CLI ─────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Register payload channels per device")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('add', help="Register (or rename/re-rate) the channel at a position")
+    p.add_argument('device_sn', help="e.g. B1234")
+    p.add_argument('position', type=int, help="0 = first field after the fixed ones")
+    p.add_argument('name')
+    p.add_argument('--unit')
+    p.add_argument('--rate', type=float, help="Readings per second within one field")
+    p = sub.add_parser('list', help="Show registered channels")
+    p.add_argument('device_sn', nargs='?')
+    args = parser.parse_args()
+
+    with config.connection(config.APP_DSN) as conn, conn.cursor() as cur:
+        if args.cmd == 'add':
+            cur.execute("""
+                INSERT INTO sonde.channels (device_id, position, name, unit, rate_hz, created_at)
+                SELECT d.id, %s, %s, %s, %s, now() FROM sonde.devices d WHERE d.device_sn = %s
+                ON CONFLICT (device_id, position) DO UPDATE
+                   SET name = EXCLUDED.name, unit = EXCLUDED.unit, rate_hz = EXCLUDED.rate_hz
+                RETURNING id
+            """, (args.position, args.name, args.unit, args.rate, args.device_sn.upper()))
+            row = cur.fetchone()
+            if row is None:
+                print(f"[channels] no device {args.device_sn!r}")
+                return 1
+            print(f"[channels] {args.device_sn.upper()}[{args.position}] = {args.name} (id {row[0]})")
+            return 0
+
+        cur.execute("""
+            SELECT d.device_sn, c.position, c.name, c.unit, c.rate_hz
+              FROM sonde.channels c
+              JOIN sonde.devices d ON d.id = c.device_id
+             WHERE %(sn)s IS NULL OR d.device_sn = %(sn)s
+             ORDER BY d.device_sn, c.position
+        """, {'sn': args.device_sn.upper() if args.device_sn else None})
+        for device_sn, position, name, unit, rate_hz in cur.fetchall():
+            print(f"{device_sn:10s} {position:3d}  {name:20s} {unit or '':8s} "
+                  f"{f'{rate_hz:g} Hz' if rate_hz else ''}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
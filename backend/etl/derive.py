@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Derived telemetry fields, defined once for the live and batch paths.
+
+    dew_point       °C     backend.thermo.dew_point
+    potential_temp  K      backend.thermo.potential_temperature
+    mixing_ratio    g/kg   backend.thermo.mixing_ratio
+    wind_speed      m/s    balloon drift between successive fixes
+    wind_dir        deg    direction the wind blows FROM (meteorological)
+
+The live path (parser, unified service) uses LiveDeriver, which keeps each
+flight's fixes of the last reorder.LATENESS_SEC in time order. A sample's
+wind is taken against the fix before it in measurement time, as the backfill
+does, so the first sample of a batch and a late one get the backfill's
+value. A late fix also becomes the predecessor of a row already stored;
+that row's wind is derived again and handed back (pop_rederived) for the
+caller to UPDATE. Samples older than the kept track (reorder.TOO_LATE) get
+no wind and move nothing; the backfill rewrites them. The batch path
+recomputes a flight in chunks, carrying the last fix across chunk
+boundaries:
+
+    python3 -m backend.etl.derive                # every flight
+    python3 -m backend.etl.derive --flight 42    # one flight
+"""
+import argparse
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+import config
+from backend import thermo
+from backend.etl import reorder, summary
+
+DERIVED_COLUMNS = ('dew_point', 'potential_temp', 'mixing_ratio', 'wind_speed', 'wind_dir')
+
+# A stored row whose wind changed because a late fix landed before it.
+# $1 flight_id, $2 measurement_ts, $3 wind_speed, $4 wind_dir
+REDERIVE_COLUMNS = ('flight_id', 'measurement_ts', 'wind_speed', 'wind_dir')
+REDERIVE_SQL = """
+    UPDATE sonde.telemetry SET wind_speed = $3, wind_dir = $4
+     WHERE flight_id = $1 AND measurement_ts = $2
+"""
+REDERIVE = config.Prepared('derive_rederive', REDERIVE_SQL, len(REDERIVE_COLUMNS))
+
+EARTH_RADIUS_M = 6371000.0
+BACKFILL_CHUNK = 5000
+
+
+def _f(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def wind_from_track(t_s, lat, lng, prev=None):
+    """Wind speed/direction from each fix to the previous valid fix.
+
+    `prev` is the (t_s, lat, lng) of the last valid fix before these
+    samples, or None. Samples without a fix, or without an earlier one,
+    get NaN.
+    """
+    if prev is not None:
+        t_s, lat, lng = (np.concatenate(([p], a)) for p, a in zip(prev, (t_s, lat, lng)))
+    n = len(t_s)
+    valid = ~(np.isnan(lat) | np.isnan(lng) | np.isnan(t_s))
+    last = np.maximum.accumulate(np.where(valid, np.arange(n), -1))
+    prev_idx = np.concatenate(([-1], last[:-1]))
+    has = valid & (prev_idx >= 0)
+    j = np.where(has, prev_idx, 0)
+
+    dt = t_s - t_s[j]
+    lat_mid = np.radians((lat + lat[j]) / 2.0)
+    dx = EARTH_RADIUS_M * np.cos(lat_mid) * np.radians(lng - lng[j])
+    dy = EARTH_RADIUS_M * np.radians(lat - lat[j])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.where(has & (dt > 0), dx / dt, np.nan)
+        v = np.where(has & (dt > 0), dy / dt, np.nan)
+    speed = np.hypot(u, v)
+    direction = (np.degrees(np.arctan2(u, v)) + 180.0) % 360.0
+
+    if prev is not None:
+        speed, direction = speed[1:], direction[1:]
+    return speed, direction
+
+
+def derive(temp, rh, pres, t_s, lat, lng, prev=None, wind=None):
+    """All DERIVED_COLUMNS for one flight's samples in time order (numpy arrays).
+
+    `wind` is an already computed (speed, direction), as LiveDeriver has.
+    """
+    speed, direction = wind if wind is not None else wind_from_track(t_s, lat, lng, prev)
+    return {
+        'dew_point':      thermo.dew_point(temp, rh),
+        'potential_temp': thermo.potential_temperature(temp, pres),
+        'mixing_ratio':   thermo.mixing_ratio(temp, rh, pres),
+        'wind_speed':     speed,
+        'wind_dir':       direction,
+    }
+
+
+def last_fix(t_s, lat, lng, prev=None):
+    ok = np.nonzero(~(np.isnan(lat) | np.isnan(lng) | np.isnan(t_s)))[0]
+    if not len(ok):
+        return prev
+    i = ok[-1]
+    if prev is not None and prev[0] >= t_s[i]:
+        return prev                    # late samples never move the track back
+    return (t_s[i], lat[i], lng[i])
+
+
+def _epoch(ts):
+    return np.nan if ts is None else ts.timestamp()
+
+
+def _out(v):
+    return None if np.isnan(v) else round(float(v), 3)
+
+
+def _rows_out(d, n):
+    cols = [d[c] for c in DERIVED_COLUMNS]
+    return [tuple(_out(c[i]) for c in cols) for i in range(n)]
+
+
+class LiveDeriver:
+    """Derives a parsed batch per flight against each flight's recent fixes in time order."""
+
+    def __init__(self):
+        self._tracks = {}       # flight_id → [(t_s, lat, lng, measurement_ts)] sorted by t_s
+        self._trimmed = set()   # flights whose track no longer starts at their first fix
+        self._rederived = []    # REDERIVE_COLUMNS tuples not yet taken by the caller
+
+    def derive_batch(self, rows, columns):
+        """Derived tuples (DERIVED_COLUMNS order) for `rows`, in the same order."""
+        i = {c: k for k, c in enumerate(columns)}
+        by_flight = {}
+        for pos, r in enumerate(rows):
+            by_flight.setdefault(r[i['flight_id']], []).append(pos)
+
+        out = [None] * len(rows)
+        for fid, positions in by_flight.items():
+            sel = [rows[p] for p in positions]
+            t_s  = np.array([_epoch(r[i['measurement_ts']] or r[i['timestamp']]) for r in sel], dtype=float)
+            lat  = _f([r[i['gps_latitude']] for r in sel])
+            lng  = _f([r[i['gps_longitude']] for r in sel])
+            wind = self._wind(fid, t_s, lat, lng, [r[i['measurement_ts']] for r in sel])
+            d = derive(_f([r[i['temperature']] for r in sel]), _f([r[i['humidity']] for r in sel]),
+                       _f([r[i['pressure']] for r in sel]), t_s, lat, lng, wind=wind)
+            for p, values in zip(positions, _rows_out(d, len(sel))):
+                out[p] = values
+        return out
+
+    def _wind(self, fid, t_s, lat, lng, mts):
+        """Wind for one flight's samples, merging their fixes into the flight's track."""
+        track = self._tracks.get(fid, [])
+        valid = ~(np.isnan(lat) | np.isnan(lng) | np.isnan(t_s))
+        if fid in self._trimmed:
+            # Behind the kept track: the fix before it is gone, so no wind.
+            valid &= t_s >= track[0][0]
+        m = len(track)
+        ok = np.nonzero(valid)[0]
+        all_t   = np.concatenate(([f[0] for f in track], t_s[ok]))
+        all_lat = np.concatenate(([f[1] for f in track], lat[ok]))
+        all_lng = np.concatenate(([f[2] for f in track], lng[ok]))
+        # Stable: at equal times the stored fix comes first, as by id in the backfill.
+        order = np.argsort(all_t, kind='stable')
+        speed, direction = wind_from_track(all_t[order], all_lat[order], all_lng[order])
+        at = np.empty(len(order), dtype=int)
+        at[order] = np.arange(len(order))
+
+        # A stored fix now preceded by a new one: its wind moves too.
+        for k in order[1:][(order[1:] < m) & (order[:-1] >= m)]:
+            if track[k][3] is not None:
+                self._rederived.append((fid, track[k][3], _out(speed[at[k]]), _out(direction[at[k]])))
+
+        out_speed = np.full(len(t_s), np.nan)
+        out_dir   = np.full(len(t_s), np.nan)
+        out_speed[ok] = speed[at[m:]]
+        out_dir[ok]   = direction[at[m:]]
+
+        track = [track[k] if k < m else (t_s[ok[k - m]], lat[ok[k - m]], lng[ok[k - m]], mts[ok[k - m]])
+                 for k in order]
+        if track:
+            # Keep the last fix at or before the lateness window plus everything in it.
+            cutoff = track[-1][0] - reorder.LATENESS_SEC
+            drop = 0
+            while drop + 1 < len(track) and track[drop + 1][0] <= cutoff:
+                drop += 1
+            if drop:
+                track = track[drop:]
+                self._trimmed.add(fid)
+            self._tracks[fid] = track
+        return out_speed, out_dir
+
+    def pop_rederived(self):
+        """REDERIVE_COLUMNS tuples for stored rows re-derived since the last call."""
+        rows, self._rederived = self._rederived, []
+        return rows
+
+
+# ── backfill ─────────────────────────────────────────────────────────────────
+UPDATE_SQL = f"""
+    UPDATE sonde.telemetry t
+       SET {', '.join(f'{c} = v.{c}' for c in DERIVED_COLUMNS)}
+      FROM (VALUES %s) AS v(id, {', '.join(DERIVED_COLUMNS)})
+     WHERE t.id = v.id
+"""
+
+
+def backfill_flight(cur, flight_id):
+    cur.execute("""
+        SELECT id, COALESCE(measurement_ts, timestamp), temperature, humidity, pressure,
+               gps_latitude, gps_longitude
+          FROM sonde.telemetry
+         WHERE flight_id = %s
+         ORDER BY COALESCE(measurement_ts, timestamp), id
+    """, (flight_id,))
+    rows = cur.fetchall()
+    prev, updated = None, 0
+    for start in range(0, len(rows), BACKFILL_CHUNK):
+        chunk = rows[start:start + BACKFILL_CHUNK]
+        ids, ts, temp, rh, pres, lat, lng = zip(*chunk)
+        t_s = np.array([_epoch(t) for t in ts], dtype=float)
+        lat, lng = _f(lat), _f(lng)
+        d = derive(_f(temp), _f(rh), _f(pres), t_s, lat, lng, prev)
+        prev = last_fix(t_s, lat, lng, prev)
+        values = [(row_id,) + extra for row_id, extra in zip(ids, _rows_out(d, len(chunk)))]
+        execute_values(cur, UPDATE_SQL, values,
+                       template="(%s" + ", %s::double precision" * len(DERIVED_COLUMNS) + ")")
+        updated += len(values)
+    return updated
+
+
+def backfill(flight_id=None):
+    with config.connection(config.APP_DSN) as conn, conn.cursor() as cur:
+        if flight_id is None:
+            cur.execute("SELECT DISTINCT flight_id FROM sonde.telemetry WHERE flight_id IS NOT NULL")
+            flight_ids = [r[0] for r in cur.fetchall()]
+        else:
+            flight_ids = [flight_id]
+        total = 0
+        for fid in flight_ids:
+            total += backfill_flight(cur, fid)
+            # Rows changed in place: move the flight's cache version (app/cache.py).
+            summary.SUMMARY_TOUCH.execute(cur, ([fid],))
+            conn.commit()
+        return len(flight_ids), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute derived telemetry columns")
+    parser.add_argument('--flight', type=int, help="Only this flight id")
+    args = parser.parse_args()
+    flights, rows = backfill(args.flight)
+    print(f"Derived fields updated for {rows} rows in {flights} flight(s)")
+
+
+if __name__ == '__main__':
+    main()
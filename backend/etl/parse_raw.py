@@ -3,34 +3,65 @@
 ETL parser for raw.packets → sonde.telemetry (updated schema)
 
 Reads unprocessed rows from raw.packets, parses each CSV line,
-validates against active flights, computes dew point and measurement_ts
-from the on-device UTC field, and then inserts into sonde.telemetry with:
+validates against active flights, computes measurement_ts from the
+on-device UTC field, derives the batch's thermodynamic and wind fields in
+bulk (backend.etl.derive), and then inserts into sonde.telemetry with:
   - timestamp           (when packet was received)
   - processed_ts        (when parser wrote the row)
   - measurement_ts      (UTC from device)
   - gps_latitude, gps_longitude, gps_altitude
-  - pressure, temperature, dew_point, humidity
+  - pressure, temperature, humidity, hdop, sats
   - signal_strength
-  - speed (NULL), ascent_rate (NULL)
-  - tx_ts (NULL), device_sn
+  - speed, ascent_rate
+  - dew_point, potential_temp, mixing_ratio, wind_speed, wind_dir
+  - station_id          (ground station whose copy was kept)
+  - late                (arrived after a newer measurement, backend.etl.reorder)
+Fields after the fixed ones are registered sensor channels and go to
+sonde.channel_samples instead (backend.etl.channels).
+Copies of a sample heard by several stations are deduplicated by
+(device_sn, measurement_ts), keeping the best RSSI (backend.ingest.dedup).
+Each batch is sorted by measurement_ts and rates are computed on every
+device's ordered stream.
 Finally marks raw.packets.processed = TRUE.
+
+Batch size and waiting follow the backlog (backend.etl.schedule): large
+batches back to back while raw.packets has unprocessed rows, waiting on
+NOTIFY packet_inserted once it is drained (polling every
+schedule.BATCH_INTERVAL_MAX in case a notification was lost). Each batch that stores rows
+publishes telemetry_inserted (backend.bus) for the analyzer.
 """
-import os
 import math
-import psycopg2
 from datetime import datetime, timezone
-import select
+import time
+
+import config
+from backend import bus, health, metrics
+from backend.etl import channels, derive, reorder, schedule, summary
+from backend.ingest import dedup
+from backend.profiling import Profiler
 
 # Constants
 gps_noise_threshold = 0.5
 speed_noise_threshold = 0.5
-DSN = os.getenv(
-    "DATABASE_URL",
-    "dbname=weather_sonde user=ingest_user password=strong_ingest_password host=localhost"
-)
+BATCH_SIZE = schedule.BATCH_MIN
 
 # State
-_sample_history_by_device = {}
+_streams_by_device = {}    # device_sn → reorder.ReorderBuffer
+DERIVER  = derive.LiveDeriver()
+SEEN     = dedup.SeenFilter()
+CHANNELS = channels.ChannelMap()
+
+# Metrics
+LINES_PARSED   = metrics.counter('sonde_lines_parsed_total', 'Payload lines inserted into sonde.telemetry')
+LINES_REJECTED = metrics.counter('sonde_lines_rejected_total', 'Payload lines dropped, by reason')
+LATE_SAMPLES   = metrics.counter('sonde_late_samples_total', 'Samples older than one already parsed, by state')
+DB_WRITE       = metrics.histogram('sonde_db_write_seconds', 'Latency of DB writes')
+QUEUE_DEPTH    = metrics.gauge('sonde_queue_depth', 'Unprocessed rows in raw.packets')
+MEAS_AGE       = metrics.histogram('sonde_measurement_age_seconds', 'measurement_ts to parse time',
+                                   buckets=(1, 2, 5, 10, 30, 60, 300, 900, 3600))
+
+# On-demand profiling (SIGUSR1 or profiles/parser.trigger)
+PROFILER = Profiler('parser')
 
 # Helpers
 def parse_float(val):
@@ -57,151 +88,326 @@ def haversine_meters(lat1, lon1, lat2, lon2):
     a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlmb/2)**2
     return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
-def main():
-    conn = psycopg2.connect(DSN)
-    conn.set_session(autocommit=True)
-    cur = conn.cursor()
-    cur.execute("LISTEN packet_inserted;")
-    print("Listening for new packets on channel 'packet_inserted'...")
+# Columns telemetry_row() fills from the payload; derive.DERIVED_COLUMNS follow
+PARSED_COLUMNS = (
+    'flight_id', 'timestamp', 'gps_latitude', 'gps_longitude',
+    'gps_altitude', 'pressure', 'temperature',
+    'signal_strength', 'speed', 'ascent_rate',
+    'humidity', 'hdop', 'sats',
+    'processed_ts', 'measurement_ts', 'station_id', 'late',
+)
+TELEMETRY_COLUMNS = PARSED_COLUMNS + derive.DERIVED_COLUMNS
 
-    while True:
-        if select.select([conn], [], [], 5) == ([], [], []):
-            print("[idle] No new packets in last 5 seconds.")
-        else:
-            conn.poll()
-            for notify in conn.notifies:
-                print(f"[notify] {notify.channel}: {notify.payload}")
-            conn.notifies.clear()
-
-        cur.execute("""
-            SELECT id, recv_ts, payload, rssi_dbm
-              FROM raw.packets
-             WHERE NOT processed
-             ORDER BY id
-             LIMIT 100;
-        """)
-        rows = cur.fetchall()
-        if not rows:
-            continue
+# A copy of an already stored sample only replaces its RSSI/station, and only
+# when its signal is stronger. RETURNING starts with TRUE for a new row, FALSE
+# for such an update, and returns nothing for a dropped copy.
+TELEMETRY_CONFLICT = """
+    ON CONFLICT (flight_id, measurement_ts) DO UPDATE
+       SET signal_strength = EXCLUDED.signal_strength,
+           station_id      = EXCLUDED.station_id
+     WHERE EXCLUDED.signal_strength > COALESCE(sonde.telemetry.signal_strength, -999)
+    RETURNING (xmax = 0), flight_id, measurement_ts
+"""
 
-        for raw_id, recv_ts, payload, rssi in rows:
-            print(f"Processing raw.id={raw_id}")
-            for line in payload.strip().splitlines():
-                cols = line.split(',')
-                if len(cols) < 11:
-                    print(f"  Skipping malformed: {line!r}")
-                    continue
+# Hot-path statements, prepared once per connection (see config.Prepared)
+TELEMETRY_INSERT = config.Prepared('parser_insert_telemetry', f"""
+    INSERT INTO sonde.telemetry ({', '.join(TELEMETRY_COLUMNS)})
+    VALUES ({', '.join(f'${i + 1}' for i in range(len(TELEMETRY_COLUMNS)))})
+    {TELEMETRY_CONFLICT}
+""", len(TELEMETRY_COLUMNS))
 
-                # Parse header
-                try:
-                    device_sn  = int(cols[0], 16)
-                    token_recv = int(cols[1], 16)
-                except ValueError:
-                    print(f"  Invalid SN/token in: {line!r}")
-                    continue
+FLIGHTS_FOR_DEVICE = config.Prepared('parser_flights_for_device', """
+    SELECT f.id, f.mask
+      FROM sonde.flights f
+      JOIN sonde.devices d ON f.device_id = d.id
+     WHERE d.device_sn = $1
+       AND f.status IN ('flight', 'pre-flight')
+""", 1)
+
+MARK_PROCESSED = config.Prepared('parser_mark_processed',
+                                 "UPDATE raw.packets SET processed = TRUE WHERE id = $1", 1)
+
+
+def split_header(line):
+    """Return (cols, device_sn, token) or (None, reason, None) for a rejected line."""
+    cols = line.split(',')
+    if len(cols) < 11:
+        return None, 'malformed', None
+    try:
+        return cols, int(cols[0], 16), int(cols[1], 16)
+    except ValueError:
+        return None, 'malformed', None
+
+
+def match_flight(flights, device_sn, token_recv):
+    """Pick the flight whose mask produces the received token."""
+    for flight_id, mask in flights:
+        if token_recv == generate_token(device_sn, mask):
+            return flight_id
+    return None
+
+
+def parse_fields(cols):
+    """Decode the UTC timestamp and sensor columns of one payload line."""
+    utc_str = cols[2]
+    try:
+        # e.g. '2025-06-18T19:05:09Z'
+        measurement_ts = datetime.strptime(utc_str, "%Y-%m-%dT%H:%M:%SZ")
+        measurement_ts = measurement_ts.replace(tzinfo=timezone.utc)
+    except Exception:
+        measurement_ts = None
+
+    return {
+        'measurement_ts': measurement_ts,
+        'temp_c':   parse_float(cols[3]),
+        'humidity': parse_float(cols[4]),
+        'pres':     parse_float(cols[5]),
+        'lat':      parse_float(cols[6]),
+        'lng':      parse_float(cols[7]),
+        'alt_m':    parse_float(cols[8]),
+        'hdop':     parse_float(cols[9]),
+        'sats':     parse_float(cols[10]),
+    }
+
+
+def compute_rates(device_sn, measurement_ts, alt_m, lat, lng):
+    """Order the sample in its device's stream: (state, ascent rate m/s, ground speed kt).
+
+    state is one of the reorder.* constants; DUPLICATE samples get no rates.
+    """
+    stream = _streams_by_device.get(device_sn)
+    if stream is None:
+        stream = _streams_by_device[device_sn] = reorder.ReorderBuffer()
+    state, history = stream.push(measurement_ts, alt_m, lat, lng)
+    return (state,) + rates(history)
+
+
+def rates(history):
+    """Ascent rate (m/s) and ground speed (kt) averaged over consecutive fixes."""
+    ascent_rate = None
+    if len(history)>=2:
+        rates = []
+        for i in range(len(history)-1):
+            t1, a1, _, _ = history[i]
+            t2, a2, _, _ = history[i+1]
+            if t1 and t2 and a1 is not None and a2 is not None:
+                dt = (t2 - t1).total_seconds()
+                if dt>0: rates.append((a2-a1)/dt)
+        if rates:
+            avg = sum(rates)/len(rates)
+            ascent_rate=round(avg,1) if abs(avg)>=gps_noise_threshold else 0.0
+
+    ground_speed = None
+    if len(history)>=2:
+        speeds=[]
+        for i in range(len(history)-1):
+            t1, _, lat1, lon1 = history[i]
+            t2, _, lat2, lon2 = history[i+1]
+            if t1 and t2:
+                dt=(t2-t1).total_seconds()
+                if dt>0:
+                    dist = haversine_meters(lat1,lon1,lat2,lon2)
+                    speeds.append(dist/dt)
+        if speeds:
+            avg_ms=sum(speeds)/len(speeds)
+            gs=avg_ms*1.94384
+            ground_speed=round(gs,1) if abs(gs)>=speed_noise_threshold else 0.0
 
-                cur.execute("""
-                            SELECT f.id, f.mask
-                            FROM sonde.flights f
-                                     JOIN sonde.devices d ON f.device_id = d.id
-                            WHERE d.device_sn = %s
-                              AND f.status IN ('flight', 'pre-flight');
-                            """, (format(device_sn, 'X'),))
+    return ascent_rate, ground_speed
+
+
+def telemetry_row(flight_id, recv_ts, rssi, f, ascent_rate, ground_speed, processed_ts,
+                  station_id=None, late=False):
+    """Parsed values in PARSED_COLUMNS order (DERIVER appends the derived ones)."""
+    return (
+        flight_id,
+        recv_ts,
+        f['lat'], f['lng'],
+        int(f['alt_m']) if f['alt_m'] is not None else None,
+        int(f['pres']) if f['pres'] is not None else None,
+        f['temp_c'],
+        rssi,
+        ground_speed, ascent_rate,
+        f['humidity'], f['hdop'], f['sats'],
+        processed_ts, f['measurement_ts'], station_id, late,
+    )
+
+
+def fetch_batch(cur, limit=BATCH_SIZE):
+    cur.execute("""
+        SELECT id, recv_ts, payload, rssi_dbm, station_id
+          FROM raw.packets
+         WHERE NOT processed
+         ORDER BY id
+         LIMIT %s;
+    """, (limit,))
+    return cur.fetchall()
+
+
+def queue_depth(cur):
+    cur.execute("SELECT count(*) FROM raw.packets WHERE NOT processed;")
+    return cur.fetchone()[0]
+
+
+def process_batch(cur, rows):
+    """Parse a batch of raw.packets rows into sonde.telemetry.
+
+    Returns the number of telemetry rows inserted.
+    """
+    samples = []   # new samples, in arrival order until sorted below
+    parsed = []
+    channel_rows = []
+    better = []    # stronger copies of samples already stored: RSSI/station update only
+    for raw_id, recv_ts, payload, rssi, station_id in rows:
+        print(f"Processing raw.id={raw_id}")
+        for line in payload.strip().splitlines():
+            cols, device_sn, token_recv = split_header(line)
+            if cols is None:
+                print(f"  Skipping malformed: {line!r}")
+                LINES_REJECTED.inc(reason=device_sn)
+                continue
+
+            with PROFILER.stage('token_match'):
+                FLIGHTS_FOR_DEVICE.execute(cur, (format(device_sn, 'X'),))
                 flights = cur.fetchall()
+                flight_id = match_flight(flights, device_sn, token_recv)
 
-                matched_flight = None
-                for flight_id, mask in flights:
-                    expected = generate_token(device_sn, mask)
-                    if token_recv == expected:
-                        matched_flight = flight_id
-                        break
+            if not flight_id:
+                print(
+                    f"  No matching token for 0x{device_sn:X}: got 0x{token_recv:X}, checked {len(flights)} flight(s)")
+                LINES_REJECTED.inc(reason='bad_token' if flights else 'no_flight')
+                continue
 
-                if not matched_flight:
-                    print(
-                        f"  No matching token for 0x{device_sn:X}: got 0x{token_recv:X}, checked {len(flights)} flight(s)")
+            with PROFILER.stage('parse'):
+                f = parse_fields(cols)
+                seen = SEEN.check((device_sn, f['measurement_ts']), rssi)
+                if seen == dedup.DUPLICATE:
+                    LINES_REJECTED.inc(reason='duplicate')
+                    continue
+                processed_ts = datetime.now(timezone.utc).replace(microsecond=0)
+                if seen == dedup.BETTER:
+                    better.append(telemetry_row(flight_id, recv_ts, rssi, f, None, None,
+                                                processed_ts, station_id)
+                                  + (None,) * len(derive.DERIVED_COLUMNS))
                     continue
+                samples.append((device_sn, flight_id, recv_ts, rssi, f, processed_ts, station_id))
+                if len(cols) > channels.FIXED_FIELDS:
+                    channel_rows += channels.sample_rows(
+                        flight_id, f['measurement_ts'], cols[channels.FIXED_FIELDS:],
+                        CHANNELS.get(cur, format(device_sn, 'X')))
 
-                utc_str = cols[2]
-                try:
-                    # e.g. '2025-06-18T19:05:09Z'
-                    measurement_ts = datetime.strptime(utc_str, "%Y-%m-%dT%H:%M:%SZ")
-                    measurement_ts = measurement_ts.replace(tzinfo=timezone.utc)
-                except Exception:
-                    measurement_ts = None
-
-                # Parse sensor fields
-                temp_c   = parse_float(cols[3])
-                humidity = parse_float(cols[4])
-                pres     = parse_float(cols[5])
-                lat      = parse_float(cols[6])
-                lng      = parse_float(cols[7])
-                alt_m    = parse_float(cols[8])
-                hdop     = parse_float(cols[9])
-                sats     = parse_float(cols[10])
-
-                # Speed & ascent (unchanged)
-                history = _sample_history_by_device.setdefault(device_sn, [])
-                if alt_m is not None and lat is not None and lng is not None:
-                    history.append((measurement_ts, alt_m, lat, lng))
-                    if len(history)>4: history.pop(0)
-                ascent_rate = None
-                if len(history)>=2:
-                    rates = []
-                    for i in range(len(history)-1):
-                        t1, a1, _, _ = history[i]
-                        t2, a2, _, _ = history[i+1]
-                        if t1 and t2 and a1 is not None and a2 is not None:
-                            dt = (t2 - t1).total_seconds()
-                            if dt>0: rates.append((a2-a1)/dt)
-                    if rates:
-                        avg = sum(rates)/len(rates)
-                        ascent_rate=round(avg,1) if abs(avg)>=gps_noise_threshold else 0.0
-
-                ground_speed = None
-                if len(history)>=2:
-                    speeds=[]
-                    for i in range(len(history)-1):
-                        t1, _, lat1, lon1 = history[i]
-                        t2, _, lat2, lon2 = history[i+1]
-                        if t1 and t2:
-                            dt=(t2-t1).total_seconds()
-                            if dt>0:
-                                dist = haversine_meters(lat1,lon1,lat2,lon2)
-                                speeds.append(dist/dt)
-                    if speeds:
-                        avg_ms=sum(speeds)/len(speeds)
-                        gs=avg_ms*1.94384
-                        ground_speed=round(gs,1) if abs(gs)>=speed_noise_threshold else 0.0
+    # Rates on each device's stream in measurement order, not arrival order.
+    samples.sort(key=lambda s: (s[4]['measurement_ts'] is None, s[4]['measurement_ts'] or datetime.min))
+    for device_sn, flight_id, recv_ts, rssi, f, processed_ts, station_id in samples:
+        with PROFILER.stage('parse'):
+            state, ascent_rate, ground_speed = compute_rates(
+                device_sn, f['measurement_ts'], f['alt_m'], f['lat'], f['lng'])
+        if state == reorder.DUPLICATE:
+            LINES_REJECTED.inc(reason='duplicate')
+            continue
+        late = state in (reorder.LATE, reorder.TOO_LATE)
+        if late:
+            LATE_SAMPLES.inc(state=state)
 
-                processed_ts = datetime.now(timezone.utc).replace(microsecond=0)
+        if f['measurement_ts']:
+            MEAS_AGE.observe(max((processed_ts - f['measurement_ts']).total_seconds(), 0))
+
+        parsed.append(telemetry_row(flight_id, recv_ts, rssi, f, ascent_rate,
+                                    ground_speed, processed_ts, station_id, late))
+
+    # Derived fields for the whole batch at once (numpy, grouped by flight).
+    with PROFILER.stage('derive'):
+        parsed = [row + extra for row, extra in
+                  zip(parsed, DERIVER.derive_batch(parsed, PARSED_COLUMNS))]
+
+    # Insert telemetry; copies the filter missed (e.g. after a restart) meet the unique index.
+    inserted = []
+    touched = set()   # flights whose stored rows changed in place
+    for row in parsed + better:
+        with PROFILER.stage('insert'):
+            t0 = time.perf_counter()
+            result = TELEMETRY_INSERT.execute(cur, row).fetchone()
+        DB_WRITE.observe(time.perf_counter() - t0, table='sonde.telemetry')
+        if result and result[0]:
+            inserted.append(row)
+            LINES_PARSED.inc()
+        elif result:
+            touched.add(result[1])
+        elif result is None:
+            LINES_REJECTED.inc(reason='duplicate')
+
+    # Stored rows a late fix now precedes get their wind again (derive.LiveDeriver).
+    for params in DERIVER.pop_rederived():
+        derive.REDERIVE.execute(cur, params)
+        touched.add(params[0])
+
+    # Extra sensor readings, one multi-row INSERT; copies already stored are skipped.
+    if channel_rows:
+        with PROFILER.stage('channels'):
+            t0 = time.perf_counter()
+            channels.write_samples(cur, channel_rows)
+        DB_WRITE.observe(time.perf_counter() - t0, table='sonde.channel_samples')
+        touched.update(r[0] for r in channel_rows)
+
+    # mark processed
+    with PROFILER.stage('commit'):
+        for raw_id, *_ in rows:
+            MARK_PROCESSED.execute(cur, (raw_id,))
+
+    # Fold the batch into sonde.flight_summary: one upsert per flight, not per row.
+    with PROFILER.stage('summary'):
+        for params in summary.upsert_rows(inserted, TELEMETRY_COLUMNS):
+            summary.SUMMARY_UPSERT.execute(cur, params)
+        if touched:
+            summary.SUMMARY_TOUCH.execute(cur, (sorted(touched),))
+
+    if inserted:
+        i_fid = TELEMETRY_COLUMNS.index('flight_id')
+        bus.publish(bus.TELEMETRY, rows[0][0], rows[-1][0], len(inserted),
+                    keys={row[i_fid] for row in inserted})
+    return len(inserted)
+
+
+def main():
+    metrics.serve('parser')
+    PROFILER.install()
+    conn = config.connect(config.INGEST_DSN, autocommit=True)
+    cur = conn.cursor()
+    sub = bus.Subscriber(conn, bus.PACKETS)
+    print(f"Listening for new packets on channel '{bus.PACKETS}'...")
+
+    # Whatever queued up while the parser was down is drained first.
+    sched = schedule.BatchScheduler()
+    beat = health.Heartbeat('parser').start()
+    sched.observe_depth(queue_depth(cur))
+
+    while True:
+        events = sub.wait(sched.wait_timeout(PROFILER.active))
+        if not sched.backlog:
+            for ev in events.values():
+                print(f"[notify] {ev.channel}: ids {ev.first}..{ev.last} ({ev.count})")
 
-                # Insert telemetry
-                cur.execute("""
-                    INSERT INTO sonde.telemetry (
-                      flight_id, timestamp, gps_latitude, gps_longitude,
-                      gps_altitude, pressure, temperature,
-                      signal_strength, speed, ascent_rate,
-                      humidity, hdop, sats,
-                      processed_ts, measurement_ts
-                    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                """, (
-                    flight_id,
-                    recv_ts,
-                    lat, lng,
-                    int(alt_m) if alt_m is not None else None,
-                    int(pres) if pres is not None else None,
-                    temp_c,
-                    rssi,
-                    ground_speed, ascent_rate,
-                    humidity, hdop, sats,
-                    processed_ts, measurement_ts
-                ))
-
-            # mark processed
-            cur.execute("UPDATE raw.packets SET processed=TRUE WHERE id=%s",
-                        (raw_id,))
-
-        print("Batch complete.")
+        PROFILER.tick()
+        limit = sched.batch_size
+        with PROFILER.stage('fetch'):
+            rows = fetch_batch(cur, limit)
+        # A short batch already is the whole backlog; only count when it's full.
+        depth = queue_depth(cur) if len(rows) == limit else len(rows)
+        sched.observe_depth(depth)
+        QUEUE_DEPTH.set(depth)
+        if rows:
+            t0 = time.perf_counter()
+            process_batch(cur, rows)
+            sched.observe_batch(len(rows), time.perf_counter() - t0,
+                                sum(len(payload) for _, _, payload, *_ in rows))
+            # raw.packets.recv_ts is `timestamp without time zone`, stored in UTC
+            recv_ts = rows[-1][1]
+            if recv_ts.tzinfo is None:
+                recv_ts = recv_ts.replace(tzinfo=timezone.utc)
+            beat.progress(rows[-1][0], len(rows),
+                          lag=(datetime.now(timezone.utc) - recv_ts).total_seconds())
+            print(f"Batch complete: {len(rows)} rows, {sched.depth} queued.")
+        sched.publish(cur)
 
 if __name__=='__main__':
     main()
@@ -0,0 +1,73 @@
+# backend/etl/reorder.py
+"""
+Per-device ordering of measurements for rate computation.
+
+Packets reach the parser in arrival order, which is not measurement order
+once several stations or a forwarding spool replay are involved. Each
+device gets a ReorderBuffer: the last HISTORY_MAX fixes sorted by
+measurement_ts plus the last RECENT_MAX timestamps seen, so memory per
+device is constant.
+
+push() classifies a sample against the newest measurement so far:
+
+  IN_ORDER   newer than everything seen: appended
+  LATE       older, but within LATENESS_SEC: inserted at its sorted place,
+             so its own rate and the following ones use the ordered stream
+  TOO_LATE   older than the window: stored, but kept out of the history
+  DUPLICATE  same measurement_ts as a recent sample: drop it
+
+and returns the RATE_WINDOW fixes ending at the sample for the rate
+computation (parse_raw.rates). The parser additionally sorts each batch by
+measurement_ts, so reordering inside a batch never counts as late.
+"""
+from bisect import bisect_left, insort
+from collections import deque
+
+LATENESS_SEC = 30     # how far behind the newest sample a late one is still ordered
+HISTORY_MAX  = 32     # fixes kept per device (covers LATENESS_SEC at 1 Hz)
+RECENT_MAX   = 64     # timestamps remembered for duplicate detection
+RATE_WINDOW  = 4      # fixes the ascent rate / ground speed are averaged over
+
+IN_ORDER, LATE, TOO_LATE, DUPLICATE = 'in_order', 'late', 'too_late', 'duplicate'
+
+
+class ReorderBuffer:
+    def __init__(self):
+        self.history = []                      # [(ts, alt, lat, lng)] sorted by ts
+        self.recent = deque(maxlen=RECENT_MAX)
+        self._recent = set()
+        self.newest = None
+
+    def _remember(self, ts):
+        if len(self.recent) == self.recent.maxlen:
+            self._recent.discard(self.recent[0])
+        self.recent.append(ts)
+        self._recent.add(ts)
+
+    def push(self, ts, alt, lat, lng):
+        """(state, window) for one sample; window is [] when no rate applies."""
+        if ts is None:
+            return IN_ORDER, []
+        if ts in self._recent:
+            return DUPLICATE, []
+        self._remember(ts)
+
+        if self.newest is None or ts > self.newest:
+            state = IN_ORDER
+            self.newest = ts
+        elif (self.newest - ts).total_seconds() <= LATENESS_SEC:
+            state = LATE
+        else:
+            return TOO_LATE, []
+
+        if alt is None or lat is None or lng is None:
+            # No fix: an in-order sample carries the current rate, as before.
+            return state, (self.history[-RATE_WINDOW:] if state == IN_ORDER else [])
+        fix = (ts, alt, lat, lng)
+        insort(self.history, fix, key=lambda f: f[0])
+        if len(self.history) > HISTORY_MAX:
+            self.history.pop(0)
+        k = bisect_left(self.history, ts, key=lambda f: f[0])
+        if k == len(self.history) or self.history[k][0] != ts:
+            return state, []                   # fell off the front of a full history
+        return state, self.history[max(0, k - RATE_WINDOW + 1):k + 1]
@@ -0,0 +1,100 @@
+# backend/etl/schedule.py
+"""
+Adaptive batch scheduling for the parser.
+
+The parser used to fetch a fixed BATCH_MIN rows and then wait up to five
+seconds for a NOTIFY, whatever the backlog. BatchScheduler decides instead:
+
+  batch size  grows with the queue depth (a DRAIN_BATCHES-th of it), between
+              BATCH_MIN and a cap of BATCH_MEM_BYTES worth of payloads
+              (average payload size, an EMA over fetched rows) or BATCH_MAX
+  wait        none while a backlog exists (fetch again right away); once the
+              queue is drained, on NOTIFY for at most BATCH_INTERVAL_MAX, so
+              a lost notification delays rows instead of stranding them
+  drain ETA   queue depth / parse throughput (rows/s, EMA over batches)
+
+Depth and ETA are published to raw.system_status, at most every
+STATUS_INTERVAL seconds (STATUS_UPSERT).
+"""
+import os
+import time
+
+BATCH_MIN          = 100
+BATCH_MAX          = int(os.getenv('PARSER_BATCH_MAX', '5000'))
+BATCH_MEM_BYTES    = int(os.getenv('PARSER_BATCH_MEM_MB', '16')) * 1024 * 1024
+BATCH_INTERVAL_MAX = float(os.getenv('PARSER_IDLE_POLL_SEC', '5'))   # s an idle parser waits for NOTIFY
+DRAIN_BATCHES      = 4     # a backlog is drained in about this many batches (before capping)
+EMA                = 0.2
+STATUS_INTERVAL    = 1.0   # s between raw.system_status writes while busy
+
+# Queue columns only: receiver_state / parser_state belong to the supervisor.
+STATUS_UPSERT = """
+    INSERT INTO raw.system_status AS s
+                (id, receiver_state, parser_state, queue_depth, drain_eta_sec,
+                 parser_batch_size, queue_updated_at, updated_at)
+         VALUES (1, 'idle', 'running', %s, %s, %s, now(), now())
+    ON CONFLICT (id) DO
+      UPDATE SET queue_depth       = EXCLUDED.queue_depth,
+                 drain_eta_sec     = EXCLUDED.drain_eta_sec,
+                 parser_batch_size = EXCLUDED.parser_batch_size,
+                 queue_updated_at  = now()
+"""
+
+
+class BatchScheduler:
+    def __init__(self):
+        self.depth = 0
+        self.batch_size = BATCH_MIN
+        self.row_bytes = None       # EMA of payload bytes per row
+        self.rate = None            # EMA of rows parsed per second
+        self._published = None      # monotonic time of the last status write
+        self._published_depth = None
+
+    # ── feedback ─────────────────────────────────────────────────────────
+    def observe_depth(self, depth):
+        self.depth = depth
+        cap = BATCH_MAX
+        if self.row_bytes:
+            cap = min(cap, max(BATCH_MIN, int(BATCH_MEM_BYTES / self.row_bytes)))
+        self.batch_size = max(BATCH_MIN, min(cap, -(-depth // DRAIN_BATCHES)))
+
+    def observe_batch(self, rows, seconds, payload_bytes):
+        """Fold in one processed batch of `rows` rows."""
+        if not rows:
+            return
+        per_row = payload_bytes / rows
+        self.row_bytes = per_row if self.row_bytes is None else self.row_bytes + EMA * (per_row - self.row_bytes)
+        if seconds > 0:
+            rate = rows / seconds
+            self.rate = rate if self.rate is None else self.rate + EMA * (rate - self.rate)
+        self.depth = max(self.depth - rows, 0)
+
+    # ── decisions ────────────────────────────────────────────────────────
+    @property
+    def backlog(self):
+        return self.depth > 0
+
+    def wait_timeout(self, profiling=False):
+        """select() timeout: 0 with a backlog, BATCH_INTERVAL_MAX when idle."""
+        if self.backlog:
+            return 0
+        # A running capture still needs its tick().
+        return min(1.0, BATCH_INTERVAL_MAX) if profiling else BATCH_INTERVAL_MAX
+
+    def drain_eta(self):
+        """Seconds until the queue is empty at the current rate, or None."""
+        if not self.depth:
+            return 0.0
+        return round(self.depth / self.rate, 1) if self.rate else None
+
+    def publish(self, cur):
+        """Write depth / ETA, throttled; reaching an empty queue is always written."""
+        now = time.monotonic()
+        drained = self.depth == 0 and self._published_depth != 0
+        if not drained and self._published is not None and now - self._published < STATUS_INTERVAL:
+            return False
+        if self.depth == 0 and self._published_depth == 0:
+            return False                    # idle: nothing new to say
+        cur.execute(STATUS_UPSERT, (self.depth, self.drain_eta(), self.batch_size))
+        self._published, self._published_depth = now, self.depth
+        return True
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Per-flight summary statistics (sonde.flight_summary)
+
+Kept up to date incrementally:
+  - the parser folds every telemetry batch into one row per flight
+    (counts, sums and extremes merge with +, LEAST and GREATEST), and
+  - the analyzer records phase, release and burst as it detects them.
+
+Per-phase stats classify each sample by its ascent rate with the same
+thresholds the analyzer uses to enter ascent/descent.
+
+Backfill (recomputes from sonde.telemetry + sonde.flight_status):
+    python3 -m backend.etl.summary                # every flight
+    python3 -m backend.etl.summary --flight 42    # one flight
+"""
+import argparse
+
+import config
+
+ASCENT_RATE_MIN  = 0.6    # m/s, analyzer.ASC_IN
+DESCENT_RATE_MAX = -0.6   # m/s, analyzer.DES_IN
+
+# Aggregate columns in the order accumulate() produces them
+AGG_COLUMNS = (
+    'point_count', 'first_ts', 'last_ts',
+    'max_altitude', 'min_pressure', 'min_temperature', 'max_temperature',
+    'max_ascent_rate', 'min_ascent_rate',
+    'ascent_count', 'ascent_rate_sum', 'descent_count', 'descent_rate_sum',
+)
+
+_MERGE = {
+    'point_count':      's.point_count + EXCLUDED.point_count',
+    'first_ts':         'LEAST(s.first_ts, EXCLUDED.first_ts)',
+    'last_ts':          'GREATEST(s.last_ts, EXCLUDED.last_ts)',
+    'max_altitude':     'GREATEST(s.max_altitude, EXCLUDED.max_altitude)',
+    'min_pressure':     'LEAST(s.min_pressure, EXCLUDED.min_pressure)',
+    'min_temperature':  'LEAST(s.min_temperature, EXCLUDED.min_temperature)',
+    'max_temperature':  'GREATEST(s.max_temperature, EXCLUDED.max_temperature)',
+    'max_ascent_rate':  'GREATEST(s.max_ascent_rate, EXCLUDED.max_ascent_rate)',
+    'min_ascent_rate':  'LEAST(s.min_ascent_rate, EXCLUDED.min_ascent_rate)',
+    'ascent_count':     's.ascent_count + EXCLUDED.ascent_count',
+    'ascent_rate_sum':  's.ascent_rate_sum + EXCLUDED.ascent_rate_sum',
+    'descent_count':    's.descent_count + EXCLUDED.descent_count',
+    'descent_rate_sum': 's.descent_rate_sum + EXCLUDED.descent_rate_sum',
+}
+
+# $1 = flight_id, $2.. = AGG_COLUMNS (psycopg2 via config.Prepared, or asyncpg directly)
+UPSERT_SQL = f"""
+    INSERT INTO sonde.flight_summary AS s (flight_id, {', '.join(AGG_COLUMNS)}, updated_at)
+    VALUES ({', '.join(f'${i + 1}' for i in range(len(AGG_COLUMNS) + 1))}, now())
+    ON CONFLICT (flight_id) DO UPDATE SET
+      {', '.join(f'{c} = {_MERGE[c]}' for c in AGG_COLUMNS)},
+      updated_at = now()
+"""
+SUMMARY_UPSERT = config.Prepared('summary_upsert', UPSERT_SQL, len(AGG_COLUMNS) + 1)
+
+# $1 = flight_id, $2 = phase, $3 = release_ts, $4 = release_altitude, $5 = burst_altitude
+EVENTS_SQL = """
+    UPDATE sonde.flight_summary
+       SET last_phase       = $2,
+           release_ts       = COALESCE($3, release_ts),
+           release_altitude = COALESCE($4, release_altitude),
+           burst_altitude   = COALESCE($5, burst_altitude),
+           updated_at       = now()
+     WHERE flight_id = $1
+"""
+
+# Rows rewritten in place (derive backfill, stronger copies, channel samples)
+# change no aggregate, but the web cache keys on updated_at (app/cache.py).
+# $1 = flight ids (array)
+TOUCH_SQL = """
+    UPDATE sonde.flight_summary SET updated_at = now() WHERE flight_id = ANY($1)
+"""
+SUMMARY_TOUCH = config.Prepared('summary_touch', TOUCH_SQL, 1)
+
+BACKFILL_SQL = f"""
+    INSERT INTO sonde.flight_summary AS s (flight_id, {', '.join(AGG_COLUMNS)}, updated_at)
+    SELECT t.flight_id,
+           count(*),
+           min(COALESCE(t.measurement_ts, t.timestamp)),
+           max(COALESCE(t.measurement_ts, t.timestamp)),
+           max(t.gps_altitude), min(t.pressure),
+           min(t.temperature), max(t.temperature),
+           max(t.ascent_rate), min(t.ascent_rate),
+           count(*) FILTER (WHERE t.ascent_rate > %(asc)s),
+           COALESCE(sum(t.ascent_rate) FILTER (WHERE t.ascent_rate > %(asc)s), 0),
+           count(*) FILTER (WHERE t.ascent_rate < %(des)s),
+           COALESCE(sum(t.ascent_rate) FILTER (WHERE t.ascent_rate < %(des)s), 0),
+           now()
+      FROM sonde.telemetry t
+     WHERE t.flight_id IS NOT NULL
+       AND (%(flight_id)s IS NULL OR t.flight_id = %(flight_id)s)
+     GROUP BY t.flight_id
+    ON CONFLICT (flight_id) DO UPDATE SET
+      {', '.join(f'{c} = EXCLUDED.{c}' for c in AGG_COLUMNS)},
+      updated_at = now();
+
+    UPDATE sonde.flight_summary s
+       SET last_phase       = fs.flight_phase,
+           release_ts       = fs.release_ts,
+           release_altitude = fs.release_altitude,
+           burst_altitude   = fs.burst_altitude
+      FROM sonde.flight_status fs
+     WHERE fs.flight_id = s.flight_id
+       AND (%(flight_id)s IS NULL OR s.flight_id = %(flight_id)s);
+"""
+
+
+def _lt(a, b):
+    return b if a is None or (b is not None and b < a) else a
+
+
+def _gt(a, b):
+    return b if a is None or (b is not None and b > a) else a
+
+
+def accumulate(rows, columns):
+    """Fold telemetry rows (tuples in `columns` order) into {flight_id: aggregate tuple}."""
+    i = {c: k for k, c in enumerate(columns)}
+    acc = {}
+    for r in rows:
+        fid = r[i['flight_id']]
+        a = acc.get(fid)
+        if a is None:
+            a = acc[fid] = [0, None, None, None, None, None, None, None, None, 0, 0.0, 0, 0.0]
+        ts = r[i['measurement_ts']] or r[i['timestamp']]
+        rate = r[i['ascent_rate']]
+        temp = r[i['temperature']]
+        a[0] += 1
+        a[1] = _lt(a[1], ts)
+        a[2] = _gt(a[2], ts)
+        a[3] = _gt(a[3], r[i['gps_altitude']])
+        a[4] = _lt(a[4], r[i['pressure']])
+        a[5] = _lt(a[5], temp)
+        a[6] = _gt(a[6], temp)
+        a[7] = _gt(a[7], rate)
+        a[8] = _lt(a[8], rate)
+        if rate is not None and rate > ASCENT_RATE_MIN:
+            a[9] += 1
+            a[10] += rate
+        elif rate is not None and rate < DESCENT_RATE_MAX:
+            a[11] += 1
+            a[12] += rate
+    return {fid: tuple(a) for fid, a in acc.items()}
+
+
+def upsert_rows(rows, columns):
+    """Parameter tuples for UPSERT_SQL, one per flight in the batch."""
+    return [(fid,) + agg for fid, agg in accumulate(rows, columns).items()]
+
+
+def backfill(flight_id=None):
+    with config.connection(config.APP_DSN) as conn, conn.cursor() as cur:
+        cur.execute(BACKFILL_SQL, {'asc': ASCENT_RATE_MIN, 'des': DESCENT_RATE_MAX,
+                                   'flight_id': flight_id})
+        cur.execute("SELECT count(*) FROM sonde.flight_summary")
+        return cur.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute sonde.flight_summary from telemetry")
+    parser.add_argument('--flight', type=int, help="Only this flight id")
+    args = parser.parse_args()
+    total = backfill(args.flight)
+    print(f"flight_summary backfilled ({total} rows in table)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+# backend/forecast.py
+"""
+Burst altitude / time forecast during ascent.
+
+Without balloon parameters the burst altitude comes from a prior: the mean
+and spread of the burst altitudes recorded for earlier flights
+(sonde.flight_summary, PRIOR_SQL), or DEFAULT_BURST_ALT / DEFAULT_BURST_SD.
+Each sample conditions that prior on "still climbing at altitude h" (a
+normal truncated at h), which gives the forecast and its interval.
+
+Two streaming least-squares fits with exponential forgetting turn the
+altitude into the other forecast values:
+
+  rate      ascent rate vs altitude → time to climb to the burst altitude
+            (exact for a linear rate: dz / logarithmic mean of the rates)
+  pressure  ln(pressure) vs altitude → forecast burst pressure
+
+Every update and every forecast is O(1): a handful of float operations.
+"""
+import math
+from datetime import timedelta
+from statistics import NormalDist
+
+DEFAULT_BURST_ALT = 30000.0   # m
+DEFAULT_BURST_SD  = 4000.0    # m
+PRIOR_MIN_FLIGHTS = 3
+MIN_BURST_SD      = 1000.0    # m; earlier flights rarely agree better than this
+INTERVAL          = 0.9       # central probability of the lo/hi bounds
+FORGET            = 0.995     # per-sample weight decay of the trend fits
+RATE_FLOOR        = 1.0       # m/s, slowest climb assumed when extrapolating
+ASCENT_RATE_MIN   = 0.6       # m/s, analyzer.ASC_IN
+
+# FlightStatus columns forecast() fills
+FORECAST_COLUMNS = (
+    'burst_forecast_alt', 'burst_forecast_alt_lo', 'burst_forecast_alt_hi',
+    'burst_forecast_pressure',
+    'burst_forecast_ts', 'burst_forecast_ts_lo', 'burst_forecast_ts_hi',
+)
+
+# One row: (flights, mean, sd) of earlier burst altitudes
+PRIOR_SQL = """
+    SELECT count(burst_altitude), avg(burst_altitude), stddev_samp(burst_altitude)
+      FROM sonde.flight_summary
+     WHERE burst_altitude IS NOT NULL
+"""
+
+_STD = NormalDist()
+
+
+def prior(count, mean, sd):
+    """(mean, sd) of the burst altitude prior from PRIOR_SQL's row."""
+    if not count or count < PRIOR_MIN_FLIGHTS or mean is None:
+        return DEFAULT_BURST_ALT, DEFAULT_BURST_SD
+    return float(mean), max(float(sd or 0.0), MIN_BURST_SD)
+
+
+class OnlineFit:
+    """Weighted least-squares line y = a + b·x, updated in O(1) per point."""
+
+    def __init__(self, forget=FORGET):
+        self.forget = forget
+        self.w = self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def add(self, x, y):
+        f = self.forget
+        self.w   = self.w * f + 1.0
+        self.sx  = self.sx * f + x
+        self.sy  = self.sy * f + y
+        self.sxx = self.sxx * f + x * x
+        self.sxy = self.sxy * f + x * y
+
+    def line(self):
+        """(a, b), or None until the points span some x range."""
+        den = self.w * self.sxx - self.sx * self.sx
+        if self.w < 3 or den <= 1e-9 * self.w * self.w:
+            return None
+        b = (self.w * self.sxy - self.sx * self.sy) / den
+        return (self.sy - b * self.sx) / self.w, b
+
+
+def truncated_quantile(mu, sd, h, q):
+    """q-quantile of N(mu, sd) conditioned on > h."""
+    alpha = (h - mu) / sd
+    cdf_a = _STD.cdf(alpha)
+    tail = 1.0 - cdf_a
+    if tail < 1e-9:
+        # Far past the prior: the tail is ~exponential with rate alpha/sd.
+        return h + sd * -math.log(1.0 - q) / max(alpha, 1.0)
+    return mu + sd * _STD.inv_cdf(min(cdf_a + q * tail, 1.0 - 1e-12))
+
+
+class BurstForecaster:
+    def __init__(self, burst_prior=(DEFAULT_BURST_ALT, DEFAULT_BURST_SD)):
+        self.mu, self.sd = burst_prior
+        self.rate = OnlineFit()       # x = altitude (km), y = ascent rate (m/s)
+        self.pres = OnlineFit()       # x = altitude (km), y = ln(pressure)
+        self.last_id = 0
+
+    def observe(self, alt, pres, rate):
+        if alt is None or rate is None or rate <= ASCENT_RATE_MIN:
+            return
+        km = alt / 1000.0
+        self.rate.add(km, rate)
+        if pres and pres > 0:
+            self.pres.add(km, math.log(pres))
+
+    def observe_row(self, row_id, alt, pres, rate):
+        if row_id is not None and row_id <= self.last_id:
+            return
+        self.observe(alt, pres, rate)
+        if row_id is not None:
+            self.last_id = row_id
+
+    def _rate_at(self, km, fallback):
+        fit = self.rate.line()
+        r = fit[0] + fit[1] * km if fit else fallback
+        return max(r, RATE_FLOOR)
+
+    def _climb_seconds(self, alt, target, rate_now):
+        if target <= alt:
+            return 0.0
+        r0 = max(rate_now, RATE_FLOOR)
+        r1 = self._rate_at(target / 1000.0, r0)
+        mean = (r0 - r1) / math.log(r0 / r1) if abs(r0 - r1) > 1e-6 else r0
+        return (target - alt) / mean
+
+    def forecast(self, alt, rate, ts):
+        """dict of burst_forecast_* values from the current sample, or None."""
+        if alt is None:
+            return None
+        lo_q = (1.0 - INTERVAL) / 2
+        alt_lo  = truncated_quantile(self.mu, self.sd, alt, lo_q)
+        alt_mid = truncated_quantile(self.mu, self.sd, alt, 0.5)
+        alt_hi  = truncated_quantile(self.mu, self.sd, alt, 1.0 - lo_q)
+
+        rate_now = rate if rate is not None else self._rate_at(alt / 1000.0, RATE_FLOOR)
+        pfit = self.pres.line()
+
+        def eta(target):
+            return ts + timedelta(seconds=self._climb_seconds(alt, target, rate_now)) if ts else None
+
+        return {
+            'burst_forecast_alt':      round(alt_mid, 1),
+            'burst_forecast_alt_lo':   round(alt_lo, 1),
+            'burst_forecast_alt_hi':   round(alt_hi, 1),
+            'burst_forecast_pressure': round(math.exp(pfit[0] + pfit[1] * alt_mid / 1000.0), 2)
+                                       if pfit else None,
+            'burst_forecast_ts':       eta(alt_mid),
+            'burst_forecast_ts_lo':    eta(alt_lo),
+            'burst_forecast_ts_hi':    eta(alt_hi),
+        }
@@ -0,0 +1,154 @@
+# backend/health.py
+"""
+Progress-based worker health.
+
+A live process is not necessarily a working one: a parser blocked on a lock
+or 10,000 packets behind still passes poll(). Each worker therefore runs a
+Heartbeat thread that writes one raw.worker_progress row every
+HEARTBEAT_SEC:
+
+  last_id    highest input id it has handled (parser: raw.packets.id,
+             analyzer: sonde.telemetry.id), NULL if it has no such notion
+  processed  items handled since the process started (throughput)
+  lag_sec    how far behind its input it runs (worker-defined)
+
+The worker only bumps counters in memory (progress()); the thread batches
+them into that single upsert, so the hot loop never waits on it.
+
+The supervisor reads every row plus the oldest input still waiting for each
+component in one statement (PROGRESS_SQL) and judges it with WorkerHealth:
+
+  starting   no heartbeat from this pid yet, within STARTUP_GRACE
+  running    heartbeat fresh, and last_id keeps moving while input waits
+  stalled    input is waiting but last_id has not moved for STALL_SEC, or
+             the heartbeat is older than HEARTBEAT_TIMEOUT
+"""
+import os
+import threading
+import time
+
+import config
+
+HEARTBEAT_SEC     = float(os.getenv('HEARTBEAT_SEC', '5'))
+HEARTBEAT_TIMEOUT = float(os.getenv('HEARTBEAT_TIMEOUT', '30'))
+STALL_SEC         = float(os.getenv('STALL_SEC', '60'))
+STARTUP_GRACE     = float(os.getenv('STARTUP_GRACE', '30'))
+
+STARTING, RUNNING, STALLED, STOPPED = 'starting', 'running', 'stalled', 'stopped'
+PARKED = 'parked'    # crash-looping; the supervisor holds it back (supervisor.RestartPolicy)
+
+HEARTBEAT_UPSERT = """
+    INSERT INTO raw.worker_progress AS w
+                (component, pid, last_id, processed, lag_sec, heartbeat_at, started_at)
+         VALUES (%s, %s, %s, %s, %s, now(), now())
+    ON CONFLICT (component) DO
+      UPDATE SET pid          = EXCLUDED.pid,
+                 last_id      = EXCLUDED.last_id,
+                 processed    = EXCLUDED.processed,
+                 lag_sec      = EXCLUDED.lag_sec,
+                 heartbeat_at = now(),
+                 started_at   = CASE WHEN w.pid = EXCLUDED.pid THEN w.started_at ELSE now() END
+"""
+
+# Oldest input waiting for each component (NULL: nothing to do); components
+# without an entry are judged on heartbeats only.
+PENDING = {
+    'parser':   "(SELECT min(id) FROM raw.packets WHERE NOT processed)",
+    'analyzer': """(SELECT min(t.id) FROM sonde.telemetry t
+                      JOIN sonde.flights f ON f.id = t.flight_id
+                     WHERE f.status = 'flight' AND t.id > coalesce(w.last_id, 0))""",
+}
+
+PROGRESS_SQL = f"""
+    SELECT component, pid, last_id, processed, lag_sec,
+           extract(epoch FROM now() - heartbeat_at) AS age,
+           CASE component {' '.join(f"WHEN '{c}' THEN {q}" for c, q in PENDING.items())} END AS pending
+      FROM raw.worker_progress w
+"""
+
+
+# ── worker side ──────────────────────────────────────────────────────────────
+class Heartbeat:
+    def __init__(self, component, dsn=None, interval=HEARTBEAT_SEC):
+        self.component = component
+        self.dsn = dsn or config.INGEST_DSN
+        self.interval = interval
+        self.last_id = None
+        self.processed = 0
+        self.lag = None
+
+    def progress(self, last_id=None, count=0, lag=None):
+        """Record work done; cheap enough for every batch or packet."""
+        if last_id is not None and (self.last_id is None or last_id > self.last_id):
+            self.last_id = last_id
+        self.processed += count
+        if lag is not None:
+            self.lag = lag
+
+    def start(self):
+        threading.Thread(target=self._run, name=f"heartbeat-{self.component}", daemon=True).start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except Exception as e:   # the DB being away is the supervisor's problem to report
+                print(f"[heartbeat] {self.component}: {e}")
+            time.sleep(self.interval)
+
+    def write(self):
+        with config.connection(self.dsn) as conn, conn.cursor() as cur:
+            cur.execute(HEARTBEAT_UPSERT, (self.component, os.getpid(), self.last_id,
+                                           self.processed, self.lag))
+
+
+# ── supervisor side ──────────────────────────────────────────────────────────
+class WorkerHealth:
+    """Tracks one supervised component across PROGRESS_SQL reads."""
+
+    def __init__(self, name):
+        self.name = name
+        self.reset(None)
+
+    def reset(self, pid):
+        self.pid = pid
+        self.launched = time.monotonic()
+        self.state = STARTING
+        self.last_id = None
+        self.moved_at = time.monotonic()    # when last_id last advanced
+        self.waiting_since = None           # when input was first seen waiting
+        self.rate = None                    # items/s between the last two reads
+        self.lag = None
+        self._sample = None                 # (monotonic, processed)
+
+    def update(self, row, alive=True):
+        """Fold in this component's PROGRESS_SQL row (or None); returns the state."""
+        now = time.monotonic()
+        if not alive:
+            self.state = STOPPED
+            return self.state
+        if row is None or row.pid != self.pid:
+            # Nothing from this incarnation yet (the row may be its predecessor's).
+            self.state = STARTING if now - self.launched < STARTUP_GRACE else STALLED
+            return self.state
+
+        if row.last_id is not None and (self.last_id is None or row.last_id > self.last_id):
+            self.last_id, self.moved_at = row.last_id, now
+        if self._sample and now > self._sample[0]:
+            self.rate = round((row.processed - self._sample[1]) / (now - self._sample[0]), 2)
+        self._sample = (now, row.processed)
+        self.lag = row.lag_sec
+
+        if row.pending is None:
+            self.waiting_since = None
+        elif self.waiting_since is None:
+            self.waiting_since = now
+        stuck = (self.waiting_since is not None
+                 and now - max(self.moved_at, self.waiting_since) > STALL_SEC
+                 and now - self.launched > STARTUP_GRACE)
+        if row.age > HEARTBEAT_TIMEOUT or stuck:
+            self.state = STALLED
+        else:
+            self.state = RUNNING
+        return self.state
@@ -0,0 +1,53 @@
+# backend/ingest/dedup.py
+"""
+Cross-station deduplication.
+
+Several ground stations can hear the same transmission, so the same sample
+reaches raw.packets once per station (tagged with station_id). Two layers
+keep it out of sonde.telemetry twice:
+
+  raw.packets      payload_hash (64-bit BLAKE2b of the payload) with a
+                   unique (station_id, payload_hash) index, so a station
+                   re-sending its own frames is idempotent
+  sonde.telemetry  a unique (flight_id, measurement_ts) index; the insert
+                   keeps the copy with the best RSSI (ON CONFLICT)
+
+SeenFilter sits in front of the second one in the parser: a bounded LRU of
+(device_sn, measurement_ts) → best RSSI so far, which answers almost every
+duplicate without a round trip and keeps copies out of the rate history.
+"""
+import hashlib
+from collections import OrderedDict
+
+SEEN_MAX = 65536    # samples remembered: hours of traffic from several sondes
+
+NEW, BETTER, DUPLICATE = 'new', 'better', 'duplicate'
+
+
+def payload_hash(payload):
+    """Signed 64-bit content hash of a payload (fits a Postgres bigint)."""
+    data = payload.strip().encode('utf-8') if isinstance(payload, str) else bytes(payload).strip()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+
+class SeenFilter:
+    def __init__(self, max_entries=SEEN_MAX):
+        self.max_entries = max_entries
+        self._best = OrderedDict()   # key → best rssi (None if unknown)
+
+    def check(self, key, rssi):
+        """NEW for a first copy, BETTER for a later copy with a stronger
+        signal (the stored row should take its RSSI), else DUPLICATE."""
+        if key[1] is None:
+            return NEW                  # no measurement time: nothing to match on
+        if key not in self._best:
+            self._best[key] = rssi
+            if len(self._best) > self.max_entries:
+                self._best.popitem(last=False)
+            return NEW
+        self._best.move_to_end(key)
+        best = self._best[key]
+        if rssi is not None and (best is None or rssi > best):
+            self._best[key] = rssi
+            return BETTER
+        return DUPLICATE
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Forwarding of raw frames from field receivers to a central ingest server.
+
+A field station without a reliable link to Postgres spools every frame to a
+local SQLite file and a Forwarder thread ships the spool over TCP; the
+central IngestServer COPYs each batch into raw.packets.
+
+Framing (network byte order):
+
+    header   magic 'SFWD' | version u8 | kind u8 | length u32 | seq u64
+    HELLO    client → server, body = JSON {"station": station id, "spool": spool id}
+    BATCH    client → server, seq = last frame in the batch,
+             body = zlib(JSON [[seq, recv_ts, payload, rssi], ...])
+    ACK      server → client, seq = last frame committed for the station's spool
+
+An idle client sends an empty BATCH every KEEPALIVE seconds; the server drops
+connections silent for longer than IDLE_TIMEOUT.
+
+Every frame gets a spool sequence number. Sequence numbers are only
+meaningful within one spool file, so each spool has a random id, created with
+the file and sent in HELLO. The server stores the last committed seq per
+(station, spool) (raw.forward_state) in the same transaction as the rows, and
+skips frames at or below it, so a batch re-sent after a lost ACK or an outage
+is never stored twice. HELLO is answered with that seq, and the client drops
+what the server already has before resuming. A recreated spool has a new id,
+starts again from seq 0, and none of its frames are mistaken for old ones.
+
+Local test over loopback (two processes):
+    python3 -m backend.ingest.forward server --listen 127.0.0.1:7700
+    python3 -m backend.ingest.forward client --connect 127.0.0.1:7700 < lines.txt
+
+On a station, set INGEST_SERVER=host:port and receiver.py forwards instead
+of writing to the database.
+"""
+import io
+import csv
+import sys
+import json
+import uuid
+import zlib
+import time
+import socket
+import struct
+import sqlite3
+import argparse
+import threading
+import socketserver
+from datetime import datetime, timezone
+
+import config
+from backend import bus, metrics
+from backend.ingest.dedup import payload_hash
+
+MAGIC    = b'SFWD'
+VERSION  = 2
+HELLO, BATCH, ACK = 1, 2, 3
+HEADER   = struct.Struct('!4sBBIQ')
+
+MAX_FRAME      = 8 * 1024 * 1024   # bytes of body accepted by the server
+BATCH_MAX      = 200               # frames per BATCH
+FLUSH_INTERVAL = 0.5               # seconds a partial batch may wait
+ACK_TIMEOUT    = 10.0              # seconds before the connection is considered dead
+KEEPALIVE      = 30.0              # seconds between empty BATCHes on an idle link
+IDLE_TIMEOUT   = 3 * KEEPALIVE     # server side
+RETRY_MIN, RETRY_MAX = 1.0, 30.0   # reconnect backoff (seconds)
+SPOOL_PATH     = 'forward_spool.sqlite3'
+DEFAULT_PORT   = 7700
+
+PACKET_COLUMNS = ('recv_ts', 'payload', 'rssi_dbm', 'station_id', 'payload_hash')
+
+# Metrics
+SPOOL_DEPTH     = metrics.gauge('sonde_forward_spool_depth', 'Frames spooled but not yet acknowledged')
+FRAMES_SENT     = metrics.counter('sonde_forward_frames_total', 'Frames acknowledged by the ingest server')
+BYTES_SENT      = metrics.counter('sonde_forward_bytes_total', 'Compressed BATCH bytes sent')
+FRAMES_INGESTED = metrics.counter('sonde_ingest_frames_total', 'Frames written by the ingest server, by station')
+FRAMES_SKIPPED  = metrics.counter('sonde_ingest_skipped_total', 'Re-sent frames the server already had, by station')
+DB_WRITE        = metrics.histogram('sonde_db_write_seconds', 'Latency of DB writes')
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def parse_addr(addr, default_host='127.0.0.1'):
+    host, _, port = addr.rpartition(':')
+    return host or default_host, int(port or DEFAULT_PORT)
+
+
+# ── framing ──────────────────────────────────────────────────────────────────
+def send_frame(sock, kind, seq=0, body=b''):
+    sock.sendall(HEADER.pack(MAGIC, VERSION, kind, len(body), seq) + body)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        buf += chunk
+    return bytes(buf)
+
+
+def recv_frame(sock):
+    """(kind, seq, body)"""
+    magic, version, kind, length, seq = HEADER.unpack(_recv_exact(sock, HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ProtocolError(f"bad header {magic!r} v{version}")
+    if length > MAX_FRAME:
+        raise ProtocolError(f"frame too large ({length} bytes)")
+    return kind, seq, _recv_exact(sock, length) if length else b''
+
+
+def encode_batch(records):
+    return zlib.compress(json.dumps(records, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decode_batch(body):
+    return json.loads(zlib.decompress(body).decode('utf-8'))
+
+
+# ── client side ──────────────────────────────────────────────────────────────
+class Spool:
+    """Durable FIFO of frames awaiting acknowledgement (SQLite, one writer thread each side)."""
+
+    def __init__(self, path=SPOOL_PATH):
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS spool (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                recv_ts TEXT NOT NULL, payload TEXT NOT NULL, rssi REAL)
+        """)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('spool_id', ?)",
+                        (uuid.uuid4().hex,))
+        self.spool_id = self.db.execute("SELECT value FROM meta WHERE key = 'spool_id'").fetchone()[0]
+        self.lock = threading.Lock()
+
+    def put(self, recv_ts, payload, rssi):
+        with self.lock:
+            self.db.execute("INSERT INTO spool (recv_ts, payload, rssi) VALUES (?, ?, ?)",
+                            (recv_ts.isoformat(), payload, rssi))
+
+    def batch(self, limit=BATCH_MAX):
+        with self.lock:
+            return [list(r) for r in self.db.execute(
+                "SELECT seq, recv_ts, payload, rssi FROM spool ORDER BY seq LIMIT ?", (limit,))]
+
+    def ack(self, seq):
+        with self.lock:
+            self.db.execute("DELETE FROM spool WHERE seq <= ?", (seq,))
+
+    def depth(self):
+        with self.lock:
+            return self.db.execute("SELECT count(*) FROM spool").fetchone()[0]
+
+    def resync(self, server_seq):
+        """After HELLO: drop what the server already has from this spool."""
+        self.ack(server_seq)
+
+
+class Forwarder:
+    """Ships the spool to the ingest server on a daemon thread."""
+
+    def __init__(self, addr, station_id=None, spool_path=SPOOL_PATH):
+        self.addr = parse_addr(addr)
+        self.station_id = station_id or config.STATION_ID
+        self.spool = Spool(spool_path)
+        self.wake = threading.Event()
+        self.thread = None
+        self._delay = RETRY_MIN
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='forwarder', daemon=True)
+        self.thread.start()
+        return self
+
+    def put(self, recv_ts, payload, rssi):
+        self.spool.put(recv_ts, payload, rssi)
+        self.wake.set()
+
+    def run(self):
+        while True:
+            try:
+                with socket.create_connection(self.addr, timeout=ACK_TIMEOUT) as sock:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    self._session(sock)
+            except (OSError, ProtocolError) as e:
+                print(f"[forward] {self.addr[0]}:{self.addr[1]} unavailable ({e}); "
+                      f"retrying in {self._delay:.0f}s", file=sys.stderr)
+                time.sleep(self._delay)
+                self._delay = min(self._delay * 2, RETRY_MAX)
+
+    def _expect_ack(self, sock):
+        kind, seq, _ = recv_frame(sock)
+        if kind != ACK:
+            raise ProtocolError(f"expected ACK, got kind {kind}")
+        return seq
+
+    def _session(self, sock):
+        send_frame(sock, HELLO, body=json.dumps(
+            {'station': self.station_id, 'spool': self.spool.spool_id}).encode('utf-8'))
+        self.spool.resync(self._expect_ack(sock))
+        self._delay = RETRY_MIN
+        print(f"[forward] connected to {self.addr[0]}:{self.addr[1]} as {self.station_id}")
+        last_sent = time.monotonic()
+        while True:
+            SPOOL_DEPTH.set(self.spool.depth())
+            records = self.spool.batch()
+            if not records:
+                if time.monotonic() - last_sent >= KEEPALIVE:
+                    send_frame(sock, BATCH)
+                    self._expect_ack(sock)
+                    last_sent = time.monotonic()
+                self.wake.wait(FLUSH_INTERVAL)
+                self.wake.clear()
+                continue
+            if len(records) < BATCH_MAX:
+                time.sleep(FLUSH_INTERVAL / 5)      # let a burst fill the batch a little
+                records = self.spool.batch()
+            body = encode_batch(records)
+            send_frame(sock, BATCH, records[-1][0], body)
+            acked = self._expect_ack(sock)
+            self.spool.ack(acked)
+            FRAMES_SENT.inc(sum(1 for r in records if r[0] <= acked))
+            BYTES_SENT.inc(len(body))
+            last_sent = time.monotonic()
+
+
+# ── server side ──────────────────────────────────────────────────────────────
+STATE_SQL = """
+    INSERT INTO raw.forward_state (station_id, spool_id, last_seq, updated_at)
+    VALUES (%(station)s, %(spool)s, 0, now())
+    ON CONFLICT (station_id, spool_id) DO NOTHING;
+    SELECT last_seq FROM raw.forward_state
+     WHERE station_id = %(station)s AND spool_id = %(spool)s FOR UPDATE;
+"""
+
+
+def ingest_batch(conn, station_id, spool_id, records):
+    """Write one BATCH; returns the last seq committed from the station's spool."""
+    with conn.cursor() as cur:
+        cur.execute(STATE_SQL, {'station': station_id, 'spool': spool_id})
+        last_seq = cur.fetchone()[0]
+        fresh = [r for r in records if r[0] > last_seq]
+        FRAMES_SKIPPED.inc(len(records) - len(fresh), station=station_id)
+        ids = []
+        if fresh:
+            buf = io.StringIO()
+            w = csv.writer(buf)
+            for _, recv_ts, payload, rssi in fresh:
+                w.writerow((recv_ts, payload, '' if rssi is None else rssi,
+                            station_id, payload_hash(payload)))
+            buf.seek(0)
+            cols = ', '.join(PACKET_COLUMNS)
+            cur.execute(f"""
+                CREATE TEMP TABLE IF NOT EXISTS stage_raw_packets ON COMMIT DELETE ROWS AS
+                    SELECT {cols} FROM raw.packets WITH NO DATA
+            """)
+            cur.copy_expert(f"COPY stage_raw_packets ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+            cur.execute(f"""
+                INSERT INTO raw.packets ({cols}) SELECT {cols} FROM stage_raw_packets
+                ON CONFLICT (station_id, payload_hash) DO NOTHING
+                RETURNING id
+            """)
+            ids = [r[0] for r in cur.fetchall()]
+            last_seq = max(r[0] for r in fresh)
+            cur.execute("UPDATE raw.forward_state SET last_seq = %s, updated_at = now() "
+                        "WHERE station_id = %s AND spool_id = %s", (last_seq, station_id, spool_id))
+    conn.commit()
+    FRAMES_INGESTED.inc(len(fresh), station=station_id)
+    if ids:
+        bus.publish(bus.PACKETS, min(ids), max(ids), len(ids))
+    return last_seq
+
+
+def last_seq_for(conn, station_id, spool_id):
+    with conn.cursor() as cur:
+        cur.execute("SELECT last_seq FROM raw.forward_state WHERE station_id = %s AND spool_id = %s",
+                    (station_id, spool_id))
+        row = cur.fetchone()
+    conn.commit()
+    return row[0] if row else 0
+
+
+class IngestHandler(socketserver.BaseRequestHandler):
+    """One station session. A pooled connection is borrowed per BATCH, not per
+    session, so idle stations hold none; a failed batch is rolled back
+    (config.connection) and the station reconnects and re-sends it."""
+
+    def handle(self):
+        from psycopg2 import Error as DatabaseError   # server side only; stations need no driver
+        sock = self.request
+        sock.settimeout(IDLE_TIMEOUT)
+        station_id = None
+        try:
+            kind, _, body = recv_frame(sock)
+            if kind != HELLO:
+                raise ProtocolError("expected HELLO")
+            hello = json.loads(body.decode('utf-8'))
+            station_id, spool_id = str(hello['station']), str(hello['spool'])
+            with config.connection(config.INGEST_DSN) as conn:
+                acked = last_seq_for(conn, station_id, spool_id)
+            send_frame(sock, ACK, acked)
+            print(f"[ingest] {station_id} connected from {self.client_address[0]}")
+            while True:
+                kind, seq, body = recv_frame(sock)
+                if kind != BATCH:
+                    raise ProtocolError(f"unexpected frame kind {kind}")
+                if not body:                     # keepalive
+                    send_frame(sock, ACK, acked)
+                    continue
+                records = decode_batch(body)
+                t0 = time.perf_counter()
+                with config.connection(config.INGEST_DSN) as conn:
+                    acked = ingest_batch(conn, station_id, spool_id, records)
+                DB_WRITE.observe(time.perf_counter() - t0, table='raw.packets')
+                send_frame(sock, ACK, acked)
+        except DatabaseError as e:
+            print(f"[ingest] {station_id or self.client_address[0]} database error, "
+                  f"dropping session: {e}")
+        except (OSError, ProtocolError, zlib.error, ValueError, KeyError, TypeError) as e:
+            print(f"[ingest] {station_id or self.client_address[0]} disconnected: {e}")
+
+
+class IngestServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+def serve(listen):
+    metrics.serve('ingest_server')
+    with IngestServer(parse_addr(listen, '0.0.0.0'), IngestHandler) as server:
+        print(f"[ingest] listening on {listen}")
+        server.serve_forever()
+
+
+def forward_stdin(connect, station_id, spool_path):
+    fwd = Forwarder(connect, station_id, spool_path).start()
+    for line in sys.stdin:
+        if line.strip():
+            fwd.put(datetime.now(timezone.utc), line, None)
+    while fwd.spool.depth():
+        time.sleep(FLUSH_INTERVAL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw frame forwarding (station → central ingest)")
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    s = sub.add_parser('server', help="central ingest endpoint")
+    s.add_argument('--listen', default=f'0.0.0.0:{DEFAULT_PORT}')
+    c = sub.add_parser('client', help="forward payload lines from stdin")
+    c.add_argument('--connect', default=config.INGEST_SERVER or f'127.0.0.1:{DEFAULT_PORT}')
+    c.add_argument('--station', default=config.STATION_ID)
+    c.add_argument('--spool', default=SPOOL_PATH)
+    args = parser.parse_args()
+
+    if args.cmd == 'server':
+        serve(args.listen)
+    else:
+        forward_stdin(args.connect, args.station, args.spool)
+
+
+if __name__ == '__main__':
+    main()
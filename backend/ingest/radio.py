@@ -0,0 +1,241 @@
+# backend/ingest/radio.py
+"""
+Frame sources for the receiver (and the unified service), so the ingest path
+runs without the LoRa bonnet.
+
+Every source has receive(timeout) → Frame, or None when nothing arrived
+within timeout, and close(). `done` turns True once a finite source (a
+capture) has nothing left.
+
+  RFM9xRadio     the RFM9x on the Pi; board/busio/digitalio/adafruit_rfm9x
+                 are imported when it is opened
+  CapturePlayer  replays a capture file with the recorded spacing divided by
+                 `speed` (1 = original timing, 0 = as fast as possible)
+  LoopbackRadio  frames arriving as UDP datagrams (one capture line each),
+                 e.g. from `python3 -m backend.ingest.radio play`
+
+open_radio(spec) picks one from a string (RADIO env / --radio):
+
+    rfm9x | capture:<path> | udp:<host>:<port>
+
+Captures are JSON lines, one frame each:
+
+    {"t": 12.345, "ts": "2025-06-01T10:00:12.345+00:00", "payload": "<base64>",
+     "rssi": -71, "snr": 9.5}
+
+t is seconds since the recording started, ts the wall clock at reception.
+CaptureRecorder writes them (receiver --record), so a real flight becomes a
+reproducible throughput test for the whole pipeline:
+
+    python3 -m backend.ingest.receiver --radio capture:flight.jsonl --speed 0
+
+Feed a running receiver (--radio udp:127.0.0.1:7701) from another process:
+    python3 -m backend.ingest.radio play flight.jsonl --to 127.0.0.1:7701 --speed 10
+"""
+import os
+import sys
+import json
+import time
+import base64
+import socket
+import argparse
+import binascii
+from collections import namedtuple
+from datetime import datetime, timezone
+
+RADIO         = os.getenv('RADIO', 'rfm9x')
+FREQUENCY_MHZ = 915.0
+TX_POWER      = 14
+MAX_DATAGRAM  = 65535
+
+Frame = namedtuple('Frame', 'payload rssi snr')
+
+
+# ── capture format ───────────────────────────────────────────────────────────
+def encode_frame(frame, t, ts=None):
+    """One capture line (without the newline)."""
+    ts = ts or datetime.now(timezone.utc)
+    return json.dumps({'t': round(t, 3), 'ts': ts.isoformat(timespec='milliseconds'),
+                       'payload': base64.b64encode(bytes(frame.payload)).decode('ascii'),
+                       'rssi': frame.rssi, 'snr': frame.snr})
+
+
+def decode_frame(line):
+    """(t, Frame) from a capture line; ValueError if it is not one."""
+    try:
+        rec = json.loads(line)
+        return float(rec.get('t', 0.0)), Frame(base64.b64decode(rec['payload']),
+                                               rec.get('rssi'), rec.get('snr'))
+    except (KeyError, TypeError, AttributeError, binascii.Error) as e:
+        raise ValueError(f"not a capture line: {e}") from None
+
+
+# ── sources ──────────────────────────────────────────────────────────────────
+class Radio:
+    done = False
+
+    def receive(self, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RFM9xRadio(Radio):
+    def __init__(self, frequency=FREQUENCY_MHZ, tx_power=TX_POWER):
+        # Hardware modules only exist on the Pi; import them when the radio is opened.
+        import board
+        import busio
+        import digitalio
+        import adafruit_rfm9x
+
+        spi = busio.SPI(board.SCK, board.MOSI, board.MISO)
+        cs  = digitalio.DigitalInOut(board.D17)
+        rst = digitalio.DigitalInOut(board.D25)
+        self.erf = adafruit_rfm9x.RFM9x(spi, cs, rst, frequency)
+        self.erf.tx_power = tx_power
+        print(f"RFM9x receiver initialized at {frequency:g} MHz")
+
+    def receive(self, timeout):
+        packet = self.erf.receive(timeout=timeout)
+        if packet is None:
+            return None
+        return Frame(bytes(packet), self.erf.rssi, self.erf.snr)
+
+
+class CapturePlayer(Radio):
+    def __init__(self, path, speed=1.0, loop=False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.played = 0
+        self.skipped = 0        # lines that were not frames
+        self._file = open(path, encoding='utf-8')
+        self._next = None       # (t, Frame) read ahead
+        self._start = None      # monotonic time of t = 0
+
+    def _peek(self):
+        while self._next is None:
+            line = self._file.readline()
+            if not line:
+                if not self.loop:
+                    self.done = True
+                    return None
+                self._file.seek(0)
+                self._start = None
+                continue
+            if not line.strip():
+                continue
+            try:
+                self._next = decode_frame(line)
+            except ValueError:
+                self.skipped += 1
+        return self._next
+
+    def receive(self, timeout):
+        nxt = self._peek()
+        if nxt is None:
+            return None
+        t, frame = nxt
+        if self.speed > 0:
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now - t / self.speed
+            wait = self._start + t / self.speed - now
+            if wait > timeout:
+                time.sleep(timeout)
+                return None
+            if wait > 0:
+                time.sleep(wait)
+        self._next = None
+        self.played += 1
+        return frame
+
+    def close(self):
+        self._file.close()
+
+
+class LoopbackRadio(Radio):
+    def __init__(self, host='127.0.0.1', port=7701):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        print(f"loopback radio listening on udp://{host}:{port}")
+
+    def receive(self, timeout):
+        self.sock.settimeout(timeout)
+        try:
+            data, _ = self.sock.recvfrom(MAX_DATAGRAM)
+        except socket.timeout:
+            return None
+        try:
+            return decode_frame(data)[1]
+        except ValueError:
+            return Frame(data, None, None)    # a bare payload
+
+    def close(self):
+        self.sock.close()
+
+
+def open_radio(spec=RADIO, speed=1.0, loop=False):
+    kind, _, arg = spec.partition(':')
+    if kind == 'rfm9x':
+        return RFM9xRadio(float(arg) if arg else FREQUENCY_MHZ)
+    if kind == 'capture' and arg:
+        return CapturePlayer(arg, speed, loop)
+    if kind == 'udp' and arg:
+        host, _, port = arg.rpartition(':')
+        return LoopbackRadio(host or '127.0.0.1', int(port))
+    raise ValueError(f"unknown radio {spec!r} (rfm9x | capture:<path> | udp:<host>:<port>)")
+
+
+# ── recording ────────────────────────────────────────────────────────────────
+class CaptureRecorder:
+    """Appends every frame it is given to a capture file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.recorded = 0
+        self._file = open(path, 'a', encoding='utf-8')
+        self._start = time.monotonic()
+
+    def record(self, frame):
+        self._file.write(encode_frame(frame, time.monotonic() - self._start))
+        self._file.write('\n')
+        self._file.flush()      # a capture cut short by a crash is still usable
+        self.recorded += 1
+
+    def close(self):
+        self._file.close()
+
+
+# ── CLI: replay a capture into a loopback radio ──────────────────────────────
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('play', help="Send a capture to a udp: radio")
+    p.add_argument('capture')
+    p.add_argument('--to', default='127.0.0.1:7701', help="host:port of the receiver")
+    p.add_argument('--speed', type=float, default=1.0, help="Timing factor; 0 = as fast as possible")
+    p.add_argument('--loop', action='store_true', help="Start over at the end")
+    args = parser.parse_args()
+
+    host, _, port = args.to.rpartition(':')
+    player = CapturePlayer(args.capture, args.speed, args.loop)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    t0 = time.monotonic()
+    try:
+        while not player.done:
+            frame = player.receive(timeout=1.0)
+            if frame is not None:
+                sock.sendto(encode_frame(frame, time.monotonic() - t0).encode('utf-8'),
+                            (host or '127.0.0.1', int(port)))
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.monotonic() - t0
+    print(f"[radio] sent {player.played} frames in {elapsed:.1f}s "
+          f"({player.played / elapsed if elapsed else 0:.0f}/s), skipped {player.skipped} lines")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# backend/logwriter.py
+"""
+Buffered, rotating JSON-lines log writer for the supervisor.
+
+Child output used to be appended to supervisor.log one open()/write()/close()
+per line. LogWriter instead takes records from any thread into a bounded
+queue (never blocking the caller: when the queue is full the record is
+counted in LOG_DROPPED and discarded) and one writer thread
+
+  - appends them as JSON lines {"ts", "component", "level", "msg"} to a file
+    kept open with a large buffer, flushed every FLUSH_SEC
+  - rotates the file once it exceeds LOG_MAX_BYTES or is older than
+    LOG_ROTATE_SEC: renamed to <path>.<YYYYmmdd-HHMMSS>, gzipped, and only
+    the newest LOG_KEEP segments are kept
+  - optionally mirrors records at or above LOG_DB_LEVEL into sonde.logs
+    (flight_id NULL), one multi-row INSERT every DB_FLUSH_SEC
+
+Levels of child lines are guessed from their text (level_of).
+"""
+import glob
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+
+import config
+from backend import metrics
+
+LOG_MAX_BYTES  = int(os.getenv('LOG_MAX_MB', '10')) * 1024 * 1024
+LOG_ROTATE_SEC = float(os.getenv('LOG_ROTATE_HOURS', '24')) * 3600
+LOG_KEEP       = int(os.getenv('LOG_KEEP', '10'))
+LOG_DB         = os.getenv('LOG_DB', '0') == '1'       # mirror into sonde.logs
+LOG_DB_LEVEL   = os.getenv('LOG_DB_LEVEL', 'WARNING')
+QUEUE_MAX      = 10000
+FLUSH_SEC      = 1.0
+DB_FLUSH_SEC   = 5.0
+WRITE_BUFFER   = 64 * 1024
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+LOG_DROPPED = metrics.counter('sonde_log_records_dropped_total', 'Log records dropped on a full queue')
+LOG_WRITTEN = metrics.counter('sonde_log_records_total', 'Log records written, by level')
+
+DB_INSERT = "INSERT INTO sonde.logs (flight_id, timestamp, level, message) VALUES %s"
+
+
+def level_of(line):
+    """Best-effort level of a free-text line from a child's stdout."""
+    low = line[:200].lower()
+    if 'traceback' in low or 'error' in low or 'exception' in low:
+        return 'ERROR'
+    if 'warn' in low or 'failed' in low:
+        return 'WARNING'
+    return 'INFO'
+
+
+class LogWriter:
+    def __init__(self, path, db=LOG_DB, db_level=LOG_DB_LEVEL):
+        self.path = path
+        self.db = db
+        self.db_min = LEVELS.get(db_level.upper(), 30)
+        self._queue = queue.Queue(QUEUE_MAX)
+        self._file = None
+        self._opened_at = None
+        self._db_pending = []
+        self._db_flushed = time.monotonic()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='logwriter', daemon=True)
+        self._thread.start()
+        return self
+
+    def log(self, component, msg, level=None):
+        """Queue one record; never blocks."""
+        record = (datetime.now(timezone.utc), component, level or level_of(msg), msg)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc(component=component)
+
+    def close(self):
+        """Write out everything queued (at shutdown)."""
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    # ── writer thread ────────────────────────────────────────────────────
+    def _run(self):
+        flushed = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=FLUSH_SEC)
+            except queue.Empty:
+                record = False
+            if record is None:
+                break
+            if record:
+                self._write(record)
+                # drain whatever else is queued before touching the disk again
+                while True:
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        self._finish()
+                        return
+                    self._write(record)
+            if time.monotonic() - flushed >= FLUSH_SEC:
+                self._flush()
+                flushed = time.monotonic()
+        self._finish()
+
+    def _write(self, record):
+        ts, component, level, msg = record
+        f = self._open()
+        f.write(json.dumps({'ts': ts.isoformat(timespec='milliseconds'), 'component': component,
+                            'level': level, 'msg': msg}, ensure_ascii=False))
+        f.write('\n')
+        LOG_WRITTEN.inc(level=level)
+        if self.db and LEVELS.get(level, 20) >= self.db_min:
+            self._db_pending.append((None, ts, level, f"[{component}] {msg}"))
+
+    def _open(self):
+        if self._file is not None:
+            if (self._file.tell() >= LOG_MAX_BYTES
+                    or time.monotonic() - self._opened_at >= LOG_ROTATE_SEC):
+                self._rotate()
+        if self._file is None:
+            self._file = open(self.path, 'a', buffering=WRITE_BUFFER, encoding='utf-8')
+            self._opened_at = time.monotonic()
+        return self._file
+
+    def _flush(self):
+        if self._file is not None:
+            self._file.flush()
+        if self._db_pending and time.monotonic() - self._db_flushed >= DB_FLUSH_SEC:
+            self._flush_db()
+
+    def _finish(self):
+        self._flush_db()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush_db(self):
+        rows, self._db_pending = self._db_pending, []
+        self._db_flushed = time.monotonic()
+        if not rows:
+            return
+        try:
+            from psycopg2.extras import execute_values
+            with config.connection(config.APP_DSN) as conn, conn.cursor() as cur:
+                execute_values(cur, DB_INSERT, rows)
+        except Exception as e:   # the file copy is the record of truth
+            LOG_DROPPED.inc(len(rows), component='sonde.logs')
+            print(f"[logwriter] sonde.logs mirror failed: {e}")
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        segment = base = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        n = 0
+        while os.path.exists(segment + '.gz'):
+            n += 1
+            segment = f"{base}-{n}"
+        try:
+            os.replace(self.path, segment)
+            with open(segment, 'rb') as src, gzip.open(segment + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(segment)
+        except OSError as e:
+            print(f"[logwriter] rotation failed: {e}")
+        segments = glob.glob(f"{glob.escape(self.path)}.*.gz")
+        for old in sorted(segments, key=os.path.getmtime)[:-LOG_KEEP]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
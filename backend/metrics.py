@@ -0,0 +1,276 @@
+# backend/metrics.py
+"""
+Lightweight in-process counters, gauges and histograms.
+
+Every pipeline process keeps its metrics in the module-level REGISTRY and
+serves them in Prometheus text format on a local port (see serve()). The
+supervisor scrapes the children and re-exposes everything on one endpoint
+with a `component` label added.
+
+Usage:
+    from backend import metrics
+    PACKETS = metrics.counter('sonde_packets_received_total', 'Packets received')
+    PACKETS.inc()
+    metrics.serve('receiver')
+"""
+import os
+import re
+import threading
+import time
+
+# Local scrape ports per component; override with METRICS_PORT (0 disables).
+DEFAULT_PORTS = {
+    'supervisor': 9100,
+    'receiver':   9101,
+    'parser':     9102,
+    'analyzer':   9103,
+    'service':    9105,
+    'ingest_server': 9106,
+}
+
+# Seconds; sized for DB round trips and loop iterations on a Raspberry Pi.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _fmt_labels(key, extra=()):
+    items = list(key) + list(extra)
+    if not items:
+        return ''
+    body = ','.join(f'{k}="{str(v)}"' for k, v in items)
+    return '{' + body + '}'
+
+
+def _fmt_value(v):
+    if v == float('inf'):
+        return '+Inf'
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(k)} {_fmt_value(v)}"
+                                for k, v in items if v is not None]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = state[0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    counts[i] += 1
+                    break
+            state[1] += 1
+            state[2] += value
+
+    def time(self, **labels):
+        """Context manager observing the elapsed wall time of its block."""
+        return _Timer(self, labels)
+
+    def render(self):
+        with self._lock:
+            items = [(k, (list(s[0]), s[1], s[2])) for k, s in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, sum_) in items:
+            cumulative = 0
+            for upper, c in zip(self.buckets, counts):
+                cumulative += c
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, [('le', _fmt_value(float(upper)))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(key, [('le', '+Inf')])} {total}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {total}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {_fmt_value(sum_)}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, hist, labels):
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif type(metric) is not cls:
+                # One name, one type: Prometheus rejects a family declared twice.
+                raise TypeError(f"metric {name!r} is already a {type(metric).__name__}, "
+                                f"not a {cls.__name__}")
+            return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.extend(m.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help_text):
+    return REGISTRY._get(Counter, name, help_text)
+
+
+def gauge(name, help_text):
+    return REGISTRY._get(Gauge, name, help_text)
+
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS):
+    return REGISTRY._get(Histogram, name, help_text, buckets=buckets)
+
+
+# ── HTTP endpoint ─────────────────────────────────────────────────────────────
+
+def port_for(component):
+    env = os.getenv('METRICS_PORT')
+    if env is not None and env != '':
+        return int(env)
+    return DEFAULT_PORTS.get(component, 0)
+
+
+def serve(component, render=None, host='127.0.0.1'):
+    """Serve /metrics for this process on a daemon thread; returns the server or None."""
+    port = port_for(component)
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer   # pulls in email/html; not at import
+    render = render or REGISTRY.render
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # scrapes are not worth a log line each
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"[metrics] cannot bind {host}:{port} ({e}); metrics disabled")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[metrics] {component} metrics on http://{host}:{port}/metrics")
+    return server
+
+
+# ── Aggregation (used by the supervisor) ──────────────────────────────────────
+
+_SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(.*)$')
+
+
+def add_label(text, key, value):
+    """Inject key="value" into every sample line of a Prometheus text payload."""
+    out = []
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            out.append(line)
+            continue
+        m = _SAMPLE_RE.match(line)
+        if not m:
+            continue
+        name, labels, rest = m.groups()
+        inner = labels[1:-1] if labels else ''
+        inner = f'{key}="{value}"' + (',' + inner if inner else '')
+        out.append(f"{name}{{{inner}}} {rest}")
+    return out
+
+
+def merge(payloads):
+    """Merge {component: text} into one payload with a `component` label.
+
+    Samples are regrouped per metric family, since Prometheus requires each
+    family to appear as one contiguous block.
+    """
+    families = {}
+    for component, text in payloads.items():
+        family = None
+        for line in add_label(text, 'component', component):
+            if not line:
+                continue
+            if line.startswith('# HELP ') or line.startswith('# TYPE '):
+                family = line.split()[2]
+                meta, _ = families.setdefault(family, ([], []))
+                if line not in meta:
+                    meta.append(line)
+            elif not line.startswith('#'):
+                families.setdefault(family, ([], []))[1].append(line)
+    lines = []
+    for meta, samples in families.values():
+        lines.extend(meta)
+        lines.extend(samples)
+    return '\n'.join(lines) + '\n'
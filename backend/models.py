@@ -0,0 +1,329 @@
+# backend/models.py
+"""
+ORM models of the sonde schema, on plain SQLAlchemy.
+
+Workers (analyzer, benchmarks) import them from here without pulling in
+Flask; the web app binds the same declarative Base to Flask-SQLAlchemy
+(app/extensions.py), which adds Model.query, and re-exports the classes
+from app/models.py.
+"""
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+Base = orm.declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+    __table_args__ = {"schema": "sonde"}
+    id = sa.Column(sa.Integer, primary_key=True)
+    username = sa.Column(sa.String(80), unique=True, nullable=False)
+    password = sa.Column(sa.String(120), nullable=False)
+    created_at = sa.Column(sa.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    # The Flask-Login user protocol (what flask_login.UserMixin provides),
+    # spelled out so this module does not depend on Flask.
+    __hash__ = object.__hash__
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def get_id(self):
+        return str(self.id)
+
+    def __eq__(self, other):
+        if isinstance(other, User):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+
+class Device(Base):
+    __tablename__ = "devices"
+    __table_args__ = {"schema": "sonde"}
+    id         = sa.Column(sa.Integer, primary_key=True)
+    device_sn  = sa.Column(sa.String, unique=True, nullable=False)
+    description = sa.Column(sa.String)
+    created_at = sa.Column(sa.DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class Flight(Base):
+    __tablename__ = "flights"
+    __table_args__ = {"schema": "sonde"}
+
+    id             = sa.Column(sa.Integer, primary_key=True)
+    user_id        = sa.Column(sa.Integer, sa.ForeignKey('sonde.users.id'))
+    mission_number = sa.Column(sa.String(50), unique=True, nullable=False)
+    equipment      = sa.Column(sa.String(100))
+    start_time     = sa.Column(sa.DateTime(timezone=True))
+    end_time       = sa.Column(sa.DateTime(timezone=True))
+    status         = sa.Column(sa.String(20), default='pre-flight')
+    comments       = sa.Column(sa.Text)
+
+    device_id        = sa.Column(sa.Integer, sa.ForeignKey('sonde.devices.id'))
+    mask             = sa.Column(sa.String, nullable=False, default='')
+    start_latitude   = sa.Column(sa.Float)
+    start_longitude  = sa.Column(sa.Float)
+    elevation        = sa.Column(sa.Integer)
+
+    # relationships
+    user   = orm.relationship("User", backref="flights")
+    device = orm.relationship("Device", backref="flights")
+
+class Telemetry(Base):
+    __tablename__ = "telemetry"
+    __table_args__ = (
+        # latest-row lookups per flight (flight snapshot, analyzer)
+        sa.Index('ix_telemetry_flight_ts', 'flight_id', 'timestamp'),
+        # one row per sample, whichever stations heard it (backend/ingest/dedup.py)
+        sa.Index('ux_telemetry_flight_measurement', 'flight_id', 'measurement_ts', unique=True),
+        {"schema": "sonde"},
+    )
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'))
+    timestamp = sa.Column(sa.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    gps_latitude = sa.Column(sa.Float)
+    gps_longitude = sa.Column(sa.Float)
+    gps_altitude = sa.Column(sa.Integer)
+    pressure = sa.Column(sa.Integer)
+    temperature = sa.Column(sa.Float)
+    signal_strength = sa.Column(sa.Integer)
+    speed = sa.Column(sa.Float)
+    ascent_rate = sa.Column(sa.Float)
+    humidity = sa.Column(sa.Float)
+    hdop = sa.Column(sa.Float)
+    sats = sa.Column(sa.Integer)
+
+    processed_ts = sa.Column(sa.DateTime(timezone=True))        # when the parser wrote the row
+    measurement_ts = sa.Column(sa.DateTime(timezone=True))      # when measurement was actually taken
+    station_id = sa.Column(sa.String(64))                       # ground station whose copy was kept
+    late = sa.Column(sa.Boolean, nullable=False, server_default='false')  # older than a sample already parsed (backend.etl.reorder)
+
+    # Derived fields (backend.etl.derive)
+    dew_point = sa.Column(sa.Float)          # °C
+    potential_temp = sa.Column(sa.Float)     # K
+    mixing_ratio = sa.Column(sa.Float)       # g/kg
+    wind_speed = sa.Column(sa.Float)         # m/s, from successive fixes
+    wind_dir = sa.Column(sa.Float)           # deg, direction the wind blows from
+
+    flight = orm.relationship("Flight", backref="telemetries")
+
+class Channel(Base):
+    """An extra sensor field of a device's payload (backend/etl/channels.py)."""
+    __tablename__ = "channels"
+    __table_args__ = (
+        sa.UniqueConstraint('device_id', 'position', name='ux_channels_device_position'),
+        sa.UniqueConstraint('device_id', 'name', name='ux_channels_device_name'),
+        {"schema": "sonde"},
+    )
+    id = sa.Column(sa.Integer, primary_key=True)
+    device_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.devices.id'), nullable=False)
+    position = sa.Column(sa.Integer, nullable=False)   # field index after the fixed telemetry columns
+    name = sa.Column(sa.String(64), nullable=False)
+    unit = sa.Column(sa.String(16))
+    rate_hz = sa.Column(sa.Float)                       # readings/s within one field; NULL: spread over 1 s
+    created_at = sa.Column(sa.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    device = orm.relationship("Device", backref="channels")
+
+class ChannelSample(Base):
+    """One reading of a Channel: the narrow table behind the extra sensors."""
+    __tablename__ = "channel_samples"
+    __table_args__ = (
+        # pivot reads scan one flight's time range (read_pivot, app/series.py)
+        sa.PrimaryKeyConstraint('flight_id', 'measurement_ts', 'channel_id'),
+        {"schema": "sonde"},
+    )
+    # int4, int4, timestamptz, float8: no alignment padding
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'), nullable=False)
+    channel_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.channels.id'), nullable=False)
+    measurement_ts = sa.Column(sa.DateTime(timezone=True), nullable=False)
+    value = sa.Column(sa.Float, nullable=False)
+
+class Log(Base):
+    __tablename__ = "logs"
+    __table_args__ = {"schema": "sonde"}
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'))
+    timestamp = sa.Column(
+        sa.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc)
+    )
+    level = sa.Column(sa.String(16), default='INFO', nullable=False)
+    message = sa.Column(sa.Text)
+
+class Alarm(Base):
+    __tablename__ = "alarms"
+    __table_args__ = {"schema": "sonde"}
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'))
+    timestamp = sa.Column(
+        sa.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc)
+    )
+    alarm_type = sa.Column(sa.String(50))
+    message = sa.Column(sa.Text)
+    resolved = sa.Column(sa.Boolean, default=False)
+
+class FlightStatus(Base):
+    __tablename__ = "flight_status"
+    __table_args__ = {"schema": "sonde"}
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'), unique=True)
+    updated_at = sa.Column(sa.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    balloon_position   = sa.Column(sa.Float, nullable=True)  # 0–100%
+    parachute_position = sa.Column(sa.Float, nullable=True)  # 0–100%
+    burst_position     = sa.Column(sa.Float, nullable=True)  # 0–100%
+    release_altitude   = sa.Column(sa.Float, nullable=True)
+
+    measurement_age = sa.Column(sa.Integer,nullable=True)     # seconds since measurement_ts
+
+    flight_phase = sa.Column(sa.String(20), default='pre-flight')     # "ground", "ascent", "descent", "unknown"
+
+    burst_detected = sa.Column(sa.Boolean, default=False)
+    burst_altitude = sa.Column(sa.Float,nullable=True)
+
+    last_ascent_rate = sa.Column(sa.Float,nullable=True)
+    max_altitude = sa.Column(sa.Float,nullable=True)
+    min_pressure = sa.Column(sa.Integer,nullable=True)
+    release_ts = sa.Column(sa.DateTime, nullable=True)
+    end_ts = sa.Column(sa.DateTime, nullable=True)
+    receiver_ok     = sa.Column(sa.Boolean, default=False)  # "Receiver" alert
+    parser_ok       = sa.Column(sa.Boolean, default=False)  # "Parser" alert
+    sensor_ok       = sa.Column(sa.Boolean, default=True)   # "Sensor" alert
+    signal_level    = sa.Column(sa.String(6), default=None) # "Signal": 'green','yellow','red',None
+    packet_ok       = sa.Column(sa.Boolean, default=True)   # "Packet" alert
+    age_warn        = sa.Column(sa.Boolean, default=False)  # "Age" alert
+    calibrated      = sa.Column(sa.Boolean, default=False)  # "Calibrated" alert
+    temp_low        = sa.Column(sa.Boolean, default=False)  # "Temp Low"
+    data_degrad     = sa.Column(sa.Boolean, default=False)  # "Meas Degrad"
+    gps_fix         = sa.Column(sa.Boolean, default=False)  # "GPS Fix"
+    gps_degrad      = sa.Column(sa.String(6), default=None) # 'yellow','red',None
+
+    # Landing prediction during descent (backend/predict.py)
+    predicted_landing_lat = sa.Column(sa.Float, nullable=True)
+    predicted_landing_lng = sa.Column(sa.Float, nullable=True)
+    predicted_landing_ts  = sa.Column(sa.DateTime(timezone=True), nullable=True)
+
+    # Burst forecast during ascent, with a 90 % interval (backend/forecast.py)
+    burst_forecast_alt      = sa.Column(sa.Float, nullable=True)
+    burst_forecast_alt_lo   = sa.Column(sa.Float, nullable=True)
+    burst_forecast_alt_hi   = sa.Column(sa.Float, nullable=True)
+    burst_forecast_pressure = sa.Column(sa.Float, nullable=True)
+    burst_forecast_ts       = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    burst_forecast_ts_lo    = sa.Column(sa.DateTime(timezone=True), nullable=True)
+    burst_forecast_ts_hi    = sa.Column(sa.DateTime(timezone=True), nullable=True)
+
+class GroundReference(Base):
+    __tablename__ = "ground_reference"
+    __table_args__ = {"schema": "sonde"}
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'), unique=True)
+    timestamp = sa.Column(sa.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    # Actual values from sonde
+    gps_latitude = sa.Column(sa.Float)
+    gps_longitude = sa.Column(sa.Float)
+    gps_altitude = sa.Column(sa.Integer)
+    temperature = sa.Column(sa.Float)
+    pressure = sa.Column(sa.Integer)
+    humidity = sa.Column(sa.Float)
+
+    # External API reference values
+    api_temperature = sa.Column(sa.Float)
+    api_pressure = sa.Column(sa.Float)
+    api_humidity = sa.Column(sa.Float)
+    api_location_name = sa.Column(sa.String)
+
+    flight = orm.relationship("Flight", backref="ground_reference")
+
+class SystemStatus(Base):
+    __tablename__  = 'system_status'
+    __table_args__ = {'schema': 'raw'}
+
+    id             = sa.Column(sa.Integer, primary_key=True)
+    receiver_state = sa.Column(sa.String, nullable=False, default='idle')
+    parser_state   = sa.Column(sa.String, nullable=False, default='idle')
+    updated_at     = sa.Column(sa.DateTime(timezone=True),
+                               server_default=sa.func.now(),
+                               onupdate=sa.func.now(),
+                               nullable=False)
+
+    # raw.packets backlog, written by the parser (backend/etl/schedule.py)
+    queue_depth       = sa.Column(sa.Integer)
+    drain_eta_sec     = sa.Column(sa.Float)
+    parser_batch_size = sa.Column(sa.Integer)
+    queue_updated_at  = sa.Column(sa.DateTime(timezone=True))
+
+    # Per-component progress, written by the supervisor (backend/health.py)
+    analyzer_state    = sa.Column(sa.String)
+    receiver_rate     = sa.Column(sa.Float)      # items/s
+    parser_rate       = sa.Column(sa.Float)
+    analyzer_rate     = sa.Column(sa.Float)
+    parser_lag_sec    = sa.Column(sa.Float)
+    analyzer_lag_sec  = sa.Column(sa.Float)
+
+class FlightSummary(Base):
+    """Per-flight aggregates, maintained by the parser/analyzer (backend/etl/summary.py)."""
+    __tablename__ = 'flight_summary'
+    __table_args__ = {'schema': 'sonde'}
+
+    flight_id        = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'), primary_key=True)
+    point_count      = sa.Column(sa.Integer, nullable=False, default=0)
+    first_ts         = sa.Column(sa.DateTime(timezone=True))
+    last_ts          = sa.Column(sa.DateTime(timezone=True))
+    max_altitude     = sa.Column(sa.Float)
+    min_pressure     = sa.Column(sa.Float)
+    min_temperature  = sa.Column(sa.Float)
+    max_temperature  = sa.Column(sa.Float)
+    max_ascent_rate  = sa.Column(sa.Float)
+    min_ascent_rate  = sa.Column(sa.Float)
+
+    # per-phase (classified by ascent rate)
+    ascent_count     = sa.Column(sa.Integer, nullable=False, default=0)
+    ascent_rate_sum  = sa.Column(sa.Float, nullable=False, default=0)
+    descent_count    = sa.Column(sa.Integer, nullable=False, default=0)
+    descent_rate_sum = sa.Column(sa.Float, nullable=False, default=0)
+
+    # from the analyzer
+    last_phase       = sa.Column(sa.String(20))
+    release_ts       = sa.Column(sa.DateTime(timezone=True))
+    release_altitude = sa.Column(sa.Float)
+    burst_altitude   = sa.Column(sa.Float)
+
+    updated_at       = sa.Column(sa.DateTime(timezone=True))
+
+    flight = orm.relationship("Flight", backref=orm.backref("summary", uselist=False))
+
+    @property
+    def duration_s(self):
+        if self.first_ts and self.last_ts:
+            return (self.last_ts - self.first_ts).total_seconds()
+        return None
+
+    @property
+    def mean_ascent_rate(self):
+        return self.ascent_rate_sum / self.ascent_count if self.ascent_count else None
+
+    @property
+    def mean_descent_rate(self):
+        return self.descent_rate_sum / self.descent_count if self.descent_count else None
+
+class DataSelection(Base):
+    __tablename__ = 'data_selection'
+    __table_args__ = {'schema': 'sonde'}
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    flight_id = sa.Column(sa.Integer, sa.ForeignKey('sonde.flights.id'), unique=True)
+
+    start_ts = sa.Column(sa.DateTime(timezone=True), nullable=False)  # inclusive
+    end_ts = sa.Column(sa.DateTime(timezone=True), nullable=False)  # inclusive or exclusive
+
+    exclusions = sa.Column(sa.JSON)  # optional list of outlier rows or timestamps
+    gap_info = sa.Column(sa.JSON)  # optional list of gaps
+    verified_by = sa.Column(sa.String)
+    created_at = sa.Column(sa.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,115 @@
+# backend/predict.py
+"""
+Landing point prediction during descent.
+
+A LandingPredictor is fed every telemetry sample of one flight and keeps
+two small incremental models:
+
+  wind     mean drift (u east, v north) and pressure per BIN_M altitude bin,
+           from ascent samples only (derived wind_speed / wind_dir columns)
+  descent  sea-level-equivalent descent rate v0 = v·sqrt(p / P_SL), an EMA
+           over descent samples; at pressure p the parachute falls at
+           v0·sqrt(P_SL / p) (rate ∝ 1/sqrt(density), density ∝ pressure)
+
+predict() integrates bin by bin from the current altitude down to the
+ground: dt = dz / rate(z), position += wind(z)·dt. Bins the ascent never
+filled reuse the wind of the bin above. That is a few hundred steps of
+plain arithmetic, well under a millisecond per call.
+"""
+import math
+from datetime import timedelta
+
+BIN_M            = 100       # altitude bin for the wind profile
+P_SL             = 1013.25   # hPa
+DEFAULT_V0       = 5.0       # m/s sea-level descent rate until one is observed
+DESCENT_EMA      = 0.2
+ASCENT_RATE_MIN  = 0.6       # m/s, analyzer.ASC_IN
+DESCENT_RATE_MAX = -0.6      # m/s, analyzer.DES_IN
+FREE_FALL_RATE   = -30.0     # m/s; faster samples (right after burst) are ignored
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def baro_pressure(h):
+    """Standard-atmosphere pressure (hPa) at altitude h (m)."""
+    return P_SL * max(1 - 2.25577e-5 * h, 1e-6) ** 5.25588
+
+
+class LandingPredictor:
+    def __init__(self):
+        self.bins = {}          # bin index → [n, u_sum, v_sum, p_sum, p_n]
+        self.v0 = None
+        self.min_alt = None     # lowest altitude seen, fallback ground level
+        self.last_id = 0        # highest telemetry id observed (DB catch-up)
+
+    # ── model updates ────────────────────────────────────────────────────
+    def observe(self, alt, pres, rate, wind_speed=None, wind_dir=None):
+        """Fold one sample in; rate is the (parser-smoothed) ascent rate in m/s."""
+        if alt is None:
+            return
+        if self.min_alt is None or alt < self.min_alt:
+            self.min_alt = alt
+        if rate is None:
+            return
+
+        if rate > ASCENT_RATE_MIN:
+            b = self.bins.setdefault(int(alt // BIN_M), [0, 0.0, 0.0, 0.0, 0])
+            if wind_speed is not None and wind_dir is not None:
+                # wind_dir is where the wind blows FROM; the balloon drifts the other way
+                rad = math.radians(wind_dir)
+                b[0] += 1
+                b[1] += -wind_speed * math.sin(rad)
+                b[2] += -wind_speed * math.cos(rad)
+            if pres:
+                b[3] += pres
+                b[4] += 1
+        elif FREE_FALL_RATE < rate < DESCENT_RATE_MAX and pres:
+            v0 = -rate * math.sqrt(pres / P_SL)
+            self.v0 = v0 if self.v0 is None else self.v0 + DESCENT_EMA * (v0 - self.v0)
+
+    def observe_row(self, row_id, alt, pres, rate, wind_speed, wind_dir):
+        if row_id is not None and row_id <= self.last_id:
+            return
+        self.observe(alt, pres, rate, wind_speed, wind_dir)
+        if row_id is not None:
+            self.last_id = row_id
+
+    # ── prediction ───────────────────────────────────────────────────────
+    def _nearest_wind(self, k):
+        filled = [j for j, b in self.bins.items() if b[0]]
+        if not filled:
+            return 0.0, 0.0
+        b = self.bins[min(filled, key=lambda j: abs(j - k))]
+        return b[1] / b[0], b[2] / b[0]
+
+    def predict(self, lat, lng, alt, ts, ground_alt=None):
+        """(lat, lng, landing time) from the current fix, or None without one."""
+        if lat is None or lng is None or alt is None:
+            return None
+        ground = ground_alt if ground_alt is not None else (self.min_alt or 0.0)
+        v0 = self.v0 or DEFAULT_V0
+
+        dx = dy = t = 0.0
+        z = float(alt)
+        k = int(z // BIN_M)
+        u, v = self._nearest_wind(k)
+        while z > ground:
+            bottom = max(k * BIN_M, ground)
+            dz = z - bottom
+            b = self.bins.get(k)
+            if b:
+                if b[0]:
+                    u, v = b[1] / b[0], b[2] / b[0]
+                p = b[3] / b[4] if b[4] else baro_pressure((z + bottom) / 2)
+            else:
+                p = baro_pressure((z + bottom) / 2)
+            dt = dz / (v0 * math.sqrt(P_SL / p))
+            dx += u * dt
+            dy += v * dt
+            t += dt
+            z = bottom
+            k -= 1
+
+        pred_lat = lat + math.degrees(dy / EARTH_RADIUS_M)
+        pred_lng = lng + math.degrees(dx / (EARTH_RADIUS_M * math.cos(math.radians(lat))))
+        return pred_lat, pred_lng, (ts + timedelta(seconds=t) if ts else None)
@@ -0,0 +1,53 @@
+# backend/procstat.py
+"""
+CPU / memory sampling of child processes from /proc (Linux, no psutil).
+
+ProcSampler.sample(pid) reads /proc/<pid>/stat (utime + stime, field 14/15)
+and /proc/<pid>/statm (resident pages) and returns (cpu_percent, rss_bytes),
+cpu_percent being the share of one core used since the previous sample of
+the same pid (None on the first one). Off Linux, or once the pid is gone,
+it returns (None, None).
+"""
+import os
+import time
+
+try:
+    CLK_TCK   = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLK_TCK, PAGE_SIZE = 100, 4096
+
+
+def read_cpu_ticks(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        data = f.read()
+    # comm (field 2) may contain spaces; the fields after it start past the last ')'
+    fields = data[data.rindex(')') + 2:].split()
+    return int(fields[11]) + int(fields[12])    # utime + stime
+
+
+def read_rss_bytes(pid):
+    with open(f'/proc/{pid}/statm') as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+class ProcSampler:
+    def __init__(self):
+        self._last = {}     # pid → (monotonic, ticks)
+
+    def sample(self, pid):
+        try:
+            ticks = read_cpu_ticks(pid)
+            rss = read_rss_bytes(pid)
+        except (OSError, ValueError, IndexError):
+            self._last.pop(pid, None)
+            return None, None
+        now = time.monotonic()
+        prev = self._last.get(pid)
+        self._last[pid] = (now, ticks)
+        if prev is None or now <= prev[0]:
+            return None, rss
+        return round((ticks - prev[1]) / CLK_TCK / (now - prev[0]) * 100, 1), rss
+
+    def forget(self, pid):
+        self._last.pop(pid, None)
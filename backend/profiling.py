@@ -0,0 +1,139 @@
+# backend/profiling.py
+"""
+On-demand profiling for long-running workers.
+
+A worker creates one Profiler, wraps its hot-path stages in
+`profiler.stage('name')` and calls `profiler.tick()` once per loop. A capture
+is started by either
+  - SIGUSR1 to the process (what the supervisor sends), or
+  - creating the trigger file  <PROFILE_DIR>/<component>.trigger
+and runs cProfile plus per-stage wall timers for PROFILE_SECONDS, then writes
+  <PROFILE_DIR>/<component>-<timestamp>.prof   (pstats, for snakeviz etc.)
+  <PROFILE_DIR>/<component>-<timestamp>.txt    (stage table + top functions)
+
+While no capture is running, stage() and tick() cost one attribute check
+and one stat() of the trigger file respectively.
+"""
+import io
+import os
+import signal
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from datetime import datetime
+
+PROFILE_DIR     = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_SECONDS = float(os.getenv('PROFILE_SECONDS', '30'))
+TOP_FUNCTIONS   = 40
+
+
+class _Stage:
+    __slots__ = ('timers', 'name', 't0')
+
+    def __init__(self, timers, name):
+        self.timers = timers
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timers.add(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class StageTimers:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.maxima = defaultdict(float)
+
+    def add(self, name, seconds):
+        self.totals[name] += seconds
+        self.counts[name] += 1
+        if seconds > self.maxima[name]:
+            self.maxima[name] = seconds
+
+    def report(self, wall):
+        lines = [f"{'stage':16s} {'calls':>8s} {'total s':>10s} {'mean ms':>10s} {'max ms':>10s} {'% wall':>7s}"]
+        for name in sorted(self.totals, key=self.totals.get, reverse=True):
+            total, n = self.totals[name], self.counts[name]
+            lines.append(f"{name:16s} {n:8d} {total:10.3f} {total / n * 1000:10.3f} "
+                         f"{self.maxima[name] * 1000:10.3f} {total / wall * 100 if wall else 0:6.1f}%")
+        return '\n'.join(lines)
+
+
+class Profiler:
+    def __init__(self, component, seconds=PROFILE_SECONDS, out_dir=PROFILE_DIR):
+        self.component = component
+        self.seconds   = seconds
+        self.out_dir   = out_dir
+        self.trigger   = os.path.join(out_dir, f"{component}.trigger")
+        self.timers    = StageTimers()
+        self.active    = False
+        self._requested = False
+        self._profile  = None
+        self._started  = None
+
+    def install(self):
+        """Register the SIGUSR1 handler (main thread only)."""
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self._on_signal)
+        return self
+
+    def _on_signal(self, signum, frame):
+        # Only flag it: the capture starts at the next tick() in the worker loop.
+        self._requested = True
+
+    def stage(self, name):
+        if not self.active:
+            return nullcontext()
+        return _Stage(self.timers, name)
+
+    def tick(self):
+        if self.active:
+            if time.monotonic() - self._started >= self.seconds:
+                self._stop()
+            return
+        if self._requested or os.path.exists(self.trigger):
+            self._requested = False
+            try:
+                os.remove(self.trigger)
+            except OSError:
+                pass
+            self._start()
+
+    def _start(self):
+        print(f"[profile] {self.component}: capturing {self.seconds:.0f}s")
+        import cProfile     # only when a capture starts: keeps it off worker startup
+        self.timers.reset()
+        self._profile = cProfile.Profile()
+        self._started = time.monotonic()
+        self.active = True
+        self._profile.enable()
+
+    def _stop(self):
+        self._profile.disable()
+        self.active = False
+        wall = time.monotonic() - self._started
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir,
+                            f"{self.component}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        self._profile.dump_stats(base + '.prof')
+
+        import pstats
+        buf = io.StringIO()
+        pstats.Stats(self._profile, stream=buf).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        with open(base + '.txt', 'w') as f:
+            f.write(f"component: {self.component}\nwall: {wall:.2f}s\n\n")
+            f.write(self.timers.report(wall))
+            f.write("\n\n")
+            f.write(buf.getvalue())
+
+        self._profile = None
+        print(f"[profile] {self.component}: wrote {base}.prof / .txt")
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Unified asyncio ingest service (optional replacement for receiver + parser + analyzer)
+
+In the default multi-process mode every stage hands data to the next one
+through a Postgres table that the next process polls. This service runs the
+same stages in one event loop and hands data over through in-memory queues:
+
+    radio ──frames──▶ parse ──samples──▶ analyze
+                        │                   │
+                        └──▶ persist ◀──────┘   (asyncpg batches every FLUSH_INTERVAL)
+
+Parsing and analysis reuse backend.etl.parse_raw and analyzer.apply_telemetry,
+so both modes produce identical rows. The analyzer's FlightStatus objects stay
+in memory and are upserted with the telemetry batch, which takes persistence
+off the packet → status path entirely.
+
+Run with:
+    python3 -m backend.service                   # RFM9x radio
+    python3 -m backend.service --source stdin    # payload lines on stdin (testing)
+    python3 -m backend.service --source capture:flight.jsonl --speed 0
+                                                 # replay a capture (backend/ingest/radio.py)
+or through the supervisor:
+    python3 supervisor.py --mode=unified
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import functools
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import asyncpg
+
+import analyzer
+import config
+from backend import bus, health, metrics
+from backend import forecast
+from backend.ingest import dedup, radio
+from backend.predict import LandingPredictor
+from backend.etl import channels, derive, parse_raw, reorder, summary
+
+QUEUE_MAX          = 10000   # frames/samples held in memory before dropping
+FLUSH_INTERVAL     = 0.25    # seconds between persistence batches
+FLIGHT_REFRESH_SEC = 2.0     # how often active flights / masks are reloaded
+RADIO_TIMEOUT      = 5.0
+MAX_FLUSH_RETRIES  = 5       # rejected flushes of one batch before it is dead-lettered
+DEAD_LETTER_DIR    = os.getenv('DEAD_LETTER_DIR', 'dead_letter')
+
+# FlightStatus columns the analyzer maintains (see analyzer.apply_telemetry)
+STATUS_COLUMNS = (
+    'updated_at', 'flight_phase', 'measurement_age',
+    'balloon_position', 'parachute_position', 'burst_position',
+    'burst_detected', 'burst_altitude', 'last_ascent_rate',
+    'max_altitude', 'min_pressure',
+    'release_ts', 'release_altitude',
+    'signal_level', 'calibrated', 'temp_low', 'data_degrad', 'gps_fix', 'gps_degrad',
+    'predicted_landing_lat', 'predicted_landing_lng', 'predicted_landing_ts',
+) + forecast.FORECAST_COLUMNS
+PACKET_COLUMNS = ('recv_ts', 'payload', 'rssi_dbm', 'processed', 'station_id', 'payload_hash')
+LOG_COLUMNS    = ('flight_id', 'timestamp', 'level', 'message')
+
+# Metrics
+FRAMES_DROPPED   = metrics.counter('sonde_frames_dropped_total', 'Frames dropped because a queue was full')
+QUEUE_DEPTH      = metrics.gauge('sonde_queue_depth', 'Items waiting in the in-memory queues')
+PACKET_TO_STATUS = metrics.histogram('sonde_packet_to_status_seconds',
+                                     'Radio receive to in-memory FlightStatus update')
+FLUSH_DURATION   = metrics.histogram('sonde_db_write_seconds', 'Latency of DB writes')
+DEAD_LETTERED    = metrics.counter('sonde_rows_dead_lettered_total',
+                                   'Rows of a repeatedly rejected flush written to DEAD_LETTER_DIR')
+
+
+class ColumnTypes:
+    """Coerce Python values to what asyncpg expects for each target column.
+
+    asyncpg does not cast like psycopg2 does (e.g. float → integer column,
+    tz-aware → `timestamp without time zone`), and the live schema has drifted
+    from the models in places, so the types are read from the database.
+    """
+
+    def __init__(self, rows):
+        self.types = {(r['table_schema'], r['table_name'], r['column_name']): r['data_type']
+                      for r in rows}
+
+    @classmethod
+    async def load(cls, con):
+        return cls(await con.fetch("""
+            SELECT table_schema, table_name, column_name, data_type
+              FROM information_schema.columns
+             WHERE table_schema IN ('sonde', 'raw')
+        """))
+
+    def coerce(self, schema, table, columns, rows):
+        kinds = [self.types.get((schema, table, c)) for c in columns]
+        return [tuple(self._one(k, v) for k, v in zip(kinds, row)) for row in rows]
+
+    @staticmethod
+    def _one(kind, v):
+        if v is None:
+            return None
+        if kind in ('integer', 'bigint', 'smallint'):
+            return int(round(v))
+        if kind in ('real', 'double precision'):
+            return float(v)
+        if kind == 'timestamp without time zone' and v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        if kind == 'timestamp with time zone' and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+
+def merge_copies(telemetry):
+    """Fold rows of one flush that share (flight_id, measurement_ts) into one.
+
+    A stronger copy (parse_stage's BETTER branch) can land in the same flush as
+    the sample it improves on, and one INSERT … ON CONFLICT DO UPDATE may not
+    touch a key twice. The first row is kept, with the strongest copy's
+    signal_strength and station_id.
+    """
+    cols = parse_raw.TELEMETRY_COLUMNS
+    i_fid, i_ts = cols.index('flight_id'), cols.index('measurement_ts')
+    i_sig, i_st = cols.index('signal_strength'), cols.index('station_id')
+    merged, at = [], {}
+    for row in telemetry:
+        key = (row[i_fid], row[i_ts])
+        if row[i_ts] is None or key not in at:
+            if row[i_ts] is not None:
+                at[key] = len(merged)
+            merged.append(row)
+            continue
+        kept = merged[at[key]]
+        if row[i_sig] is not None and (kept[i_sig] is None or row[i_sig] > kept[i_sig]):
+            kept = list(kept)
+            kept[i_sig], kept[i_st] = row[i_sig], row[i_st]
+            merged[at[key]] = tuple(kept)
+    return merged
+
+
+class Service:
+    def __init__(self, pool, types):
+        self.pool  = pool
+        self.types = types
+        self.frames  = asyncio.Queue(QUEUE_MAX)
+        self.samples = asyncio.Queue(QUEUE_MAX)
+
+        # Pending writes, swapped out wholesale by persist()
+        self.packets   = []
+        self.telemetry = []
+        self.rederived = []       # stored rows' new wind (derive.REDERIVE_COLUMNS) not yet written
+        self.readings  = []       # sonde.channel_samples rows (backend.etl.channels)
+        self.logs      = []
+        self.dirty     = set()
+        self.flush_failures = 0   # consecutive rejected flushes (connection losses excluded)
+
+        self.flights_by_sn = {}   # 'B1234' → [(flight_id, mask), ...]
+        self.channels      = channels.ChannelMap()   # reloaded with the flights
+        self.statuses      = {}   # flight_id → FlightStatus-like namespace (status == 'flight')
+        self.refs          = {}   # flight_id → ground reference namespace
+        self.signal_hist   = {}
+        self.predictors    = {}   # flight_id → LandingPredictor
+        self.forecasters   = {}   # flight_id → BurstForecaster
+        # Receiver and parser live in this process, so they are running by definition.
+        self.sysstat = SimpleNamespace(receiver_state='running', parser_state='running')
+        # Written from persist() rather than its own thread, so a blocked event
+        # loop also stops the heartbeat and the supervisor restarts the service.
+        self.beat = health.Heartbeat('service')
+        self._beat_at = 0.0
+
+    # ── flights ─────────────────────────────────────────────────────────────
+    async def refresh_flights(self):
+        while True:
+            try:
+                await self._load_flights()
+            except (OSError, asyncpg.PostgresError) as e:
+                print(f"[service] flight refresh failed: {e}")
+            await asyncio.sleep(FLIGHT_REFRESH_SEC)
+
+    async def _load_flights(self):
+        async with self.pool.acquire() as con:
+            rows = await con.fetch("""
+                SELECT f.id, f.mask, f.status, d.device_sn
+                  FROM sonde.flights f
+                  JOIN sonde.devices d ON f.device_id = d.id
+                 WHERE f.status IN ('flight', 'pre-flight')
+            """)
+            by_sn = {}
+            flying = set()
+            for r in rows:
+                by_sn.setdefault(r['device_sn'], []).append((r['id'], r['mask']))
+                if r['status'] == 'flight':
+                    flying.add(r['id'])
+            self.channels.load(await con.fetch(channels.CHANNELS_SQL))
+
+            for fid in flying - self.statuses.keys():
+                row = await con.fetchrow(
+                    "SELECT * FROM sonde.flight_status WHERE flight_id = $1", fid)
+                status = SimpleNamespace(**{c: None for c in STATUS_COLUMNS})
+                status.burst_detected = False
+                if row:
+                    status.__dict__.update(dict(row))
+                status.flight_id = fid
+                self.statuses[fid] = status
+
+                # Warm the landing predictor and burst forecaster with what the
+                # flight has sent so far.
+                predictor = self.predictors[fid] = LandingPredictor()
+                forecaster = self.forecasters[fid] = forecast.BurstForecaster(
+                    forecast.prior(*await con.fetchrow(forecast.PRIOR_SQL)))
+                for r in await con.fetch("""
+                        SELECT id, gps_altitude, pressure, ascent_rate, wind_speed, wind_dir
+                          FROM sonde.telemetry WHERE flight_id = $1 ORDER BY id""", fid):
+                    predictor.observe_row(*r)
+                    forecaster.observe_row(r['id'], r['gps_altitude'], r['pressure'], r['ascent_rate'])
+
+            for fid in flying:
+                ref = await con.fetchrow(
+                    "SELECT timestamp, gps_altitude FROM sonde.ground_reference WHERE flight_id = $1", fid)
+                if ref and ref['timestamp'] is not None:
+                    ts = ref['timestamp']
+                    if ts.tzinfo is None:
+                        ts = ts.replace(tzinfo=timezone.utc)
+                    self.refs[fid] = SimpleNamespace(timestamp=ts, gps_altitude=ref['gps_altitude'])
+
+        for fid in self.statuses.keys() - flying:
+            del self.statuses[fid]
+            self.refs.pop(fid, None)
+            self.predictors.pop(fid, None)
+            self.forecasters.pop(fid, None)
+        self.flights_by_sn = by_sn
+
+    # ── sources ─────────────────────────────────────────────────────────────
+    def _enqueue(self, payload, rssi):
+        recv_ts = datetime.now(timezone.utc).replace(microsecond=0)
+        try:
+            self.frames.put_nowait((time.perf_counter(), recv_ts, payload, rssi))
+        except asyncio.QueueFull:
+            FRAMES_DROPPED.inc(queue='frames')
+
+    async def radio_source(self, spec, speed=1.0):
+        from backend.ingest.receiver import decode_packet, PACKETS_RECEIVED
+
+        loop = asyncio.get_running_loop()
+        source = await loop.run_in_executor(None, radio.open_radio, spec, speed)
+        receive = functools.partial(source.receive, timeout=RADIO_TIMEOUT)
+        while not source.done:
+            frame = await loop.run_in_executor(None, receive)
+            if frame is None:
+                continue
+            PACKETS_RECEIVED.inc()
+            self._enqueue(decode_packet(frame.payload), frame.rssi)
+        source.close()
+
+    async def stdin_source(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                return
+            if line.strip():
+                self._enqueue(line, None)
+
+    # ── stages ──────────────────────────────────────────────────────────────
+    async def parse_stage(self):
+        while True:
+            t_recv, recv_ts, payload, rssi = await self.frames.get()
+            self.packets.append((recv_ts, payload, rssi, True,
+                                 config.STATION_ID, dedup.payload_hash(payload)))
+
+            for line in payload.strip().splitlines():
+                cols, device_sn, token_recv = parse_raw.split_header(line)
+                if cols is None:
+                    parse_raw.LINES_REJECTED.inc(reason=device_sn)
+                    continue
+
+                flights = self.flights_by_sn.get(format(device_sn, 'X'), [])
+                flight_id = parse_raw.match_flight(flights, device_sn, token_recv)
+                if not flight_id:
+                    parse_raw.LINES_REJECTED.inc(reason='bad_token' if flights else 'no_flight')
+                    continue
+
+                f = parse_raw.parse_fields(cols)
+                seen = parse_raw.SEEN.check((device_sn, f['measurement_ts']), rssi)
+                if seen == dedup.DUPLICATE:
+                    parse_raw.LINES_REJECTED.inc(reason='duplicate')
+                    continue
+                processed_ts = datetime.now(timezone.utc).replace(microsecond=0)
+                if seen == dedup.BETTER:
+                    # Only updates the stored row's RSSI; not a new sample for the analyzer.
+                    self.telemetry.append(
+                        parse_raw.telemetry_row(flight_id, recv_ts, rssi, f, None, None,
+                                                processed_ts, config.STATION_ID)
+                        + (None,) * len(derive.DERIVED_COLUMNS))
+                    continue
+                state, ascent_rate, ground_speed = parse_raw.compute_rates(
+                    device_sn, f['measurement_ts'], f['alt_m'], f['lat'], f['lng'])
+                if state == reorder.DUPLICATE:
+                    parse_raw.LINES_REJECTED.inc(reason='duplicate')
+                    continue
+                late = state in (reorder.LATE, reorder.TOO_LATE)
+                if late:
+                    parse_raw.LATE_SAMPLES.inc(state=state)
+                row = parse_raw.telemetry_row(flight_id, recv_ts, rssi, f,
+                                              ascent_rate, ground_speed, processed_ts,
+                                              config.STATION_ID, late)
+                row += parse_raw.DERIVER.derive_batch([row], parse_raw.PARSED_COLUMNS)[0]
+                self.telemetry.append(row)
+                if len(cols) > channels.FIXED_FIELDS:
+                    self.readings += channels.sample_rows(
+                        flight_id, f['measurement_ts'], cols[channels.FIXED_FIELDS:],
+                        self.channels.by_device.get(format(device_sn, 'X'), {}))
+                parse_raw.LINES_PARSED.inc()
+                try:
+                    self.samples.put_nowait((t_recv, row))
+                except asyncio.QueueFull:
+                    FRAMES_DROPPED.inc(queue='samples')
+
+    async def analyze_stage(self):
+        while True:
+            t_recv, row = await self.samples.get()
+            tel = SimpleNamespace(**dict(zip(parse_raw.TELEMETRY_COLUMNS, row)))
+            status = self.statuses.get(tel.flight_id)
+            if status is None:
+                continue  # pre-flight: stored, but the analyzer only follows flights in the air
+
+            fid = tel.flight_id
+            now = datetime.now(timezone.utc)
+            predictor = self.predictors.setdefault(fid, LandingPredictor())
+            predictor.observe(tel.gps_altitude, tel.pressure, tel.ascent_rate,
+                              tel.wind_speed, tel.wind_dir)
+            forecaster = self.forecasters.setdefault(fid, forecast.BurstForecaster())
+            forecaster.observe(tel.gps_altitude, tel.pressure, tel.ascent_rate)
+            events = analyzer.apply_telemetry(status, tel, now, self.sysstat,
+                                              self.signal_hist.setdefault(fid, []),
+                                              self.refs.get(fid), predictor, forecaster)
+            for message in events:
+                print(f"[service] flight {fid}: {message}")
+                self.logs.append((fid, now, 'INFO', message))
+            self.dirty.add(fid)
+            PACKET_TO_STATUS.observe(time.perf_counter() - t_recv)
+
+    # ── persistence ─────────────────────────────────────────────────────────
+    async def persist(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if time.monotonic() - self._beat_at >= self.beat.interval:
+                self._beat_at = time.monotonic()
+                try:
+                    await loop.run_in_executor(None, self.beat.write)
+                except Exception as e:
+                    print(f"[service] heartbeat failed ({e})")
+            QUEUE_DEPTH.set(self.frames.qsize(), queue='frames')
+            QUEUE_DEPTH.set(self.samples.qsize(), queue='samples')
+            if not (self.packets or self.telemetry or self.readings or self.logs or self.dirty):
+                continue
+
+            packets, self.packets = self.packets, []
+            telemetry, self.telemetry = merge_copies(self.telemetry), []
+            rederived = self.rederived + parse_raw.DERIVER.pop_rederived()
+            self.rederived = []
+            readings, self.readings = self.readings, []
+            logs, self.logs = self.logs, []
+            dirty, self.dirty = self.dirty, set()
+            statuses = [(fid, self.statuses[fid]) for fid in dirty if fid in self.statuses]
+
+            try:
+                with FLUSH_DURATION.time(table='batch'):
+                    await self._write(packets, telemetry, rederived, readings, logs, statuses)
+                self.beat.progress(count=len(telemetry))
+                self.flush_failures = 0
+            except (OSError, asyncpg.PostgresError) as e:
+                # A lost connection is retried for as long as it takes; a batch
+                # the server keeps rejecting must not block every later write.
+                if not isinstance(e, (OSError, asyncpg.PostgresConnectionError)):
+                    self.flush_failures += 1
+                if self.flush_failures >= MAX_FLUSH_RETRIES:
+                    print(f"[service] flush rejected {self.flush_failures} times ({e}); dead-lettering it")
+                    self.flush_failures = 0
+                    self._dead_letter(packets=packets, telemetry=telemetry, rederived=rederived,
+                                      channel_samples=readings, logs=logs)
+                    continue
+                print(f"[service] flush failed ({e}); retrying next interval")
+                # Put everything back in front of what arrived meanwhile.
+                self.packets   = packets + self.packets
+                self.telemetry = telemetry + self.telemetry
+                self.rederived = rederived + self.rederived
+                self.readings  = readings + self.readings
+                self.logs      = logs + self.logs
+                self.dirty    |= dirty
+
+    @staticmethod
+    def _dead_letter(**tables):
+        """Write a batch the database keeps rejecting to DEAD_LETTER_DIR (JSON), for replay by hand."""
+        os.makedirs(DEAD_LETTER_DIR, exist_ok=True)
+        path = os.path.join(DEAD_LETTER_DIR,
+                            f"service-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json")
+        columns = {'packets': PACKET_COLUMNS, 'telemetry': parse_raw.TELEMETRY_COLUMNS,
+                   'rederived': derive.REDERIVE_COLUMNS,
+                   'channel_samples': channels.SAMPLE_COLUMNS, 'logs': LOG_COLUMNS}
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({t: {'columns': columns[t], 'rows': rows} for t, rows in tables.items()},
+                          f, default=str)
+        except OSError as e:
+            print(f"[service] cannot write dead letter {path}: {e}")
+        for table, rows in tables.items():
+            if rows:
+                DEAD_LETTERED.inc(len(rows), table=table)
+
+    async def _write(self, packets, telemetry, rederived, readings, logs, statuses):
+        t = self.types
+        touched = set()   # flights whose stored rows changed in place (app/cache.py)
+        async with self.pool.acquire() as con:
+            async with con.transaction():
+                if packets:
+                    await self._stage_insert(
+                        con, 'raw', 'packets', PACKET_COLUMNS,
+                        t.coerce('raw', 'packets', PACKET_COLUMNS, packets),
+                        "ON CONFLICT (station_id, payload_hash) DO NOTHING")
+                if telemetry:
+                    records = t.coerce('sonde', 'telemetry', parse_raw.TELEMETRY_COLUMNS, telemetry)
+                    result = await self._stage_insert(
+                        con, 'sonde', 'telemetry', parse_raw.TELEMETRY_COLUMNS, records,
+                        parse_raw.TELEMETRY_CONFLICT)
+                    # Only rows that were really inserted count towards the summary.
+                    new = {(r[1], r[2]) for r in result if r[0]}
+                    touched.update(r[1] for r in result if not r[0])
+                    i_fid = parse_raw.TELEMETRY_COLUMNS.index('flight_id')
+                    i_ts  = parse_raw.TELEMETRY_COLUMNS.index('measurement_ts')
+                    telemetry = [row for row, rec in zip(telemetry, records)
+                                 if rec[i_ts] is None or (rec[i_fid], rec[i_ts]) in new]
+                    if telemetry:
+                        # Delivered on commit; one per flush, already coalesced.
+                        await con.execute(bus.NOTIFY_SQL, bus.TELEMETRY, bus.encode(
+                            count=len(telemetry), keys={row[i_fid] for row in telemetry}))
+                if rederived:
+                    # Stored rows a late fix now precedes (derive.LiveDeriver).
+                    await con.executemany(derive.REDERIVE_SQL, rederived)
+                    touched.update(r[0] for r in rederived)
+                if readings:
+                    await self._stage_insert(
+                        con, 'sonde', 'channel_samples', channels.SAMPLE_COLUMNS,
+                        t.coerce('sonde', 'channel_samples', channels.SAMPLE_COLUMNS, readings),
+                        channels.SAMPLE_CONFLICT)
+                    touched.update(r[0] for r in readings)
+                if logs:
+                    await con.copy_records_to_table(
+                        'logs', schema_name='sonde', columns=LOG_COLUMNS,
+                        records=t.coerce('sonde', 'logs', LOG_COLUMNS, logs))
+                if telemetry:
+                    await con.executemany(summary.UPSERT_SQL, t.coerce(
+                        'sonde', 'flight_summary', ('flight_id',) + summary.AGG_COLUMNS,
+                        summary.upsert_rows(telemetry, parse_raw.TELEMETRY_COLUMNS)))
+                if touched:
+                    await con.execute(summary.TOUCH_SQL, sorted(touched))
+                if statuses:
+                    await con.executemany(summary.EVENTS_SQL, t.coerce(
+                        'sonde', 'flight_summary',
+                        ('flight_id', 'last_phase', 'release_ts', 'release_altitude', 'burst_altitude'),
+                        [(fid, s.flight_phase, s.release_ts, s.release_altitude, s.burst_altitude)
+                         for fid, s in statuses]))
+                    cols = ('flight_id',) + STATUS_COLUMNS
+                    rows = [(fid,) + tuple(getattr(s, c, None) for c in STATUS_COLUMNS)
+                            for fid, s in statuses]
+                    await con.executemany(f"""
+                        INSERT INTO sonde.flight_status ({', '.join(cols)})
+                        VALUES ({', '.join(f'${i + 1}' for i in range(len(cols)))})
+                        ON CONFLICT (flight_id) DO UPDATE SET
+                          {', '.join(f'{c} = EXCLUDED.{c}' for c in STATUS_COLUMNS)}
+                    """, t.coerce('sonde', 'flight_status', cols, rows))
+                    await con.execute(bus.NOTIFY_SQL, bus.STATUS, bus.encode(
+                        count=len(statuses), keys={fid for fid, _ in statuses}))
+
+    @staticmethod
+    async def _stage_insert(con, schema, table, columns, records, conflict):
+        """COPY into a per-connection temp table, then INSERT … SELECT … `conflict`.
+
+        COPY alone cannot skip or merge rows that hit a unique index.
+        """
+        stage = f"stage_{schema}_{table}"
+        cols = ', '.join(columns)
+        await con.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS
+                SELECT {cols} FROM {schema}.{table} WITH NO DATA
+        """)
+        await con.copy_records_to_table(stage, columns=columns, records=records)
+        return await con.fetch(
+            f"INSERT INTO {schema}.{table} ({cols}) SELECT {cols} FROM {stage} {conflict}")
+
+
+async def run(source, speed=1.0):
+    pool = await config.create_async_pool()
+    async with pool.acquire() as con:
+        types = await ColumnTypes.load(con)
+    service = Service(pool, types)
+    await service._load_flights()
+
+    src = service.stdin_source() if source == 'stdin' else service.radio_source(source, speed)
+    print(f"[service] running (source={source})")
+    await asyncio.gather(
+        src,
+        service.parse_stage(),
+        service.analyze_stage(),
+        service.persist(),
+        service.refresh_flights(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--source', default=radio.RADIO,
+                        help="stdin, or a radio: rfm9x | capture:<path> | udp:<host>:<port>")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Capture playback timing factor; 0 = as fast as possible")
+    args = parser.parse_args()
+
+    metrics.serve('service')
+    try:
+        asyncio.run(run(args.source, args.speed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# backend/sounding.py
+"""
+Vertical profiles (soundings) from a flight's telemetry.
+
+The flight is split at its highest sample into an ascending and a
+descending leg. For each leg:
+
+  levels   temperature, humidity, dew point and altitude interpolated
+           linearly in ln(p) at the mandatory pressure levels the leg spans
+  bins     means over ALT_BIN_M altitude bins (np.bincount), columnar
+
+Everything is vectorised with numpy; a 100k-sample flight takes a few
+milliseconds once the arrays are loaded.
+"""
+import numpy as np
+
+from backend import thermo
+
+# Mandatory pressure levels (hPa), surface → top
+MANDATORY_LEVELS = (1000, 925, 850, 700, 500, 400, 300, 250, 200, 150, 100, 70, 50, 30, 20, 10)
+ALT_BIN_M = 50
+
+FIELDS = ('altitude', 'pressure', 'temperature', 'humidity')
+
+
+def _none(x):
+    """numpy value → JSON-friendly float / None."""
+    return None if x is None or np.isnan(x) else round(float(x), 2)
+
+
+def _col(values):
+    return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+
+def split_legs(alt):
+    """(ascent slice, descent slice) split at the highest valid altitude."""
+    if not len(alt) or np.all(np.isnan(alt)):
+        return slice(0, len(alt)), slice(0, 0)
+    top = int(np.nanargmax(alt))
+    return slice(0, top + 1), slice(top, len(alt))
+
+
+def interpolate_levels(pres, values, levels=MANDATORY_LEVELS):
+    """Interpolate each array in `values` (dict) at `levels`, linear in ln(p).
+
+    Levels outside the leg's pressure range are omitted.
+    """
+    ok = ~np.isnan(pres) & (pres > 0)
+    if ok.sum() < 2:
+        return []
+    lnp = np.log(pres[ok])
+    order = np.argsort(lnp)             # np.interp needs increasing x
+    lnp = lnp[order]
+    lv = np.asarray(levels, dtype=float)
+    lv = lv[(lv >= pres[ok].min()) & (lv <= pres[ok].max())]
+    if not len(lv):
+        return []
+
+    out = {'pressure': lv}
+    for name, v in values.items():
+        v = v[ok][order]
+        good = ~np.isnan(v)
+        out[name] = (np.interp(np.log(lv), lnp[good], v[good]) if good.sum() >= 2
+                     else np.full(len(lv), np.nan))
+    return [{name: _none(out[name][i]) for name in out} for i in range(len(lv))]
+
+
+def bin_by_altitude(alt, values, bin_m=ALT_BIN_M):
+    """Mean of each array in `values` per `bin_m` altitude bin (columnar, empty bins dropped)."""
+    ok = ~np.isnan(alt)
+    if not ok.any():
+        return {'altitude': [], 'count': []}
+    idx = np.floor(alt[ok] / bin_m).astype(np.int64)
+    base = idx.min()
+    idx -= base
+    counts = np.bincount(idx)
+    used = counts > 0
+
+    out = {
+        'altitude': _col(((np.nonzero(used)[0] + base) * bin_m + bin_m / 2.0).astype(float)),
+        'count':    counts[used].tolist(),
+    }
+    for name, v in values.items():
+        v = v[ok]
+        good = ~np.isnan(v)
+        sums = np.bincount(idx[good], weights=v[good], minlength=len(counts))
+        n = np.bincount(idx[good], minlength=len(counts))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[name] = _col((sums / n)[used])
+    return out
+
+
+def leg_profile(alt, pres, temp, rh):
+    td = thermo.dew_point(temp, rh)
+    values = {'temperature': temp, 'humidity': rh, 'dew_point': td}
+    return {
+        'points': int(len(alt)),
+        'levels': interpolate_levels(pres, dict(values, altitude=alt)),
+        'bins':   bin_by_altitude(alt, dict(values, pressure=pres)),
+    }
+
+
+def build_profile(rows):
+    """rows: sequence of (altitude, pressure, temperature, humidity) in time order."""
+    data = np.array(rows, dtype=float).reshape(-1, len(FIELDS))
+    alt, pres, temp, rh = data.T
+    up, down = split_legs(alt)
+    return {
+        'ascent':  leg_profile(alt[up], pres[up], temp[up], rh[up]),
+        'descent': leg_profile(alt[down], pres[down], temp[down], rh[down]),
+        'bin_m':   ALT_BIN_M,
+    }
@@ -0,0 +1,48 @@
+# backend/thermo.py
+"""
+Thermodynamic helpers shared by the profile engine and the ETL.
+
+Functions take scalars or numpy arrays (°C, %, hPa) and return the same
+shape; missing inputs (None / NaN) give NaN.
+"""
+import numpy as np
+
+# Magnus coefficients over water, Alduchov & Eskridge (1996)
+MAGNUS_A = 17.625
+MAGNUS_B = 243.04   # °C
+
+KAPPA   = 0.2854    # R_d / c_p
+EPSILON = 0.622     # M_w / M_d
+
+
+def _arr(x):
+    return np.asarray(x, dtype=float)
+
+
+def dew_point(temp_c, rh_pct):
+    """Dew point (°C) from air temperature (°C) and relative humidity (%)."""
+    t = _arr(temp_c)
+    rh = np.clip(_arr(rh_pct), 1e-3, 100.0)   # log(0) guard; >100 % is sensor overshoot
+    gamma = np.log(rh / 100.0) + MAGNUS_A * t / (MAGNUS_B + t)
+    return MAGNUS_B * gamma / (MAGNUS_A - gamma)
+
+
+def saturation_vapor_pressure(temp_c):
+    """Saturation vapour pressure over water (hPa), Magnus form."""
+    t = _arr(temp_c)
+    return 6.1094 * np.exp(MAGNUS_A * t / (MAGNUS_B + t))
+
+
+def potential_temperature(temp_c, pres_hpa):
+    """Potential temperature θ (K) referenced to 1000 hPa."""
+    p = _arr(pres_hpa)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_arr(temp_c) + 273.15) * (1000.0 / np.where(p > 0, p, np.nan)) ** KAPPA
+
+
+def mixing_ratio(temp_c, rh_pct, pres_hpa):
+    """Water vapour mixing ratio (g/kg)."""
+    e = saturation_vapor_pressure(temp_c) * np.clip(_arr(rh_pct), 0.0, 100.0) / 100.0
+    p = _arr(pres_hpa)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1000.0 * EPSILON * e / np.where(p > e, p - e, np.nan)
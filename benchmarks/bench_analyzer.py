@@ -0,0 +1,43 @@
+# benchmarks/bench_analyzer.py
+"""Analyzer cycle time: one update_flight() pass per active flight."""
+import contextlib
+import os
+
+import analyzer
+from backend.models import SystemStatus
+from benchmarks.common import connect, latency_summary, Stopwatch
+from benchmarks.synthetic import SyntheticFlight, new_device_sn, seed_flight, seed_telemetry, cleanup
+
+
+def run(n_flights=5, n_points=500, cycles=50):
+    conn = connect()
+    cur = conn.cursor()
+    flight_ids = []
+    try:
+        for i in range(n_flights):
+            sn = new_device_sn()
+            fid = seed_flight(cur, sn)
+            flight_ids.append(fid)
+            seed_telemetry(cur, fid, SyntheticFlight(sn, seed=i), n_points)
+
+        per_flight = []
+        signal_hist = {}
+        predictors = {}
+        forecasters = {}
+        session = analyzer.Session()
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for _ in range(cycles):
+                    sysstat = session.query(SystemStatus).first()
+                    for fid in flight_ids:
+                        with Stopwatch(per_flight):
+                            analyzer.update_flight(session, fid, sysstat, signal_hist,
+                                                   predictors, forecasters)
+        finally:
+            session.close()
+
+        summary = latency_summary(per_flight)
+        return {f"analyzer.flight_cycle.{k}": v for k, v in summary.items()}
+    finally:
+        cleanup(cur, flight_ids)
+        conn.close()
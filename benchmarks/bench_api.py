@@ -0,0 +1,61 @@
+# benchmarks/bench_api.py
+"""Latency percentiles of the routes the flight page polls, and series payload size per format."""
+from app import create_app
+from benchmarks.common import connect, latency_summary, Stopwatch
+from benchmarks.synthetic import (SyntheticFlight, new_device_sn, seed_flight, seed_telemetry,
+                                  seed_ground_reference, cleanup)
+
+ROUTES = [
+    ('/api/telemetry', '/api/telemetry/{id}'),
+    ('/api/gps',       '/api/gps/{id}'),
+    ('/api/status',    '/api/status/{id}'),
+    ('/flight',        '/flight/{id}'),
+]
+
+# /api/series page of SERIES_LIMIT points in each encoding (app/encoding.py)
+SERIES_URL     = '/api/series/{id}?columns=gps_altitude,temperature,humidity,pressure&limit={limit}&format={fmt}'
+SERIES_LIMIT   = 1000
+SERIES_FORMATS = ('rows', 'columnar', 'f32')
+
+
+def run(n_points=3000, requests=200):
+    conn = connect()
+    cur = conn.cursor()
+    sn = new_device_sn()
+    flight_id = seed_flight(cur, sn)
+    try:
+        seed_telemetry(cur, flight_id, SyntheticFlight(sn), n_points)
+        seed_ground_reference(cur, flight_id)
+
+        app = create_app()
+        # Measure the route itself, not the login round trip.
+        app.config['LOGIN_DISABLED'] = True
+        client = app.test_client()
+
+        results = {}
+        for name, pattern in ROUTES:
+            url = pattern.format(id=flight_id)
+            client.get(url)  # warm up templates / connection pool
+            samples = []
+            for _ in range(requests):
+                with Stopwatch(samples):
+                    resp = client.get(url)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"{url} returned {resp.status_code}")
+            for k, v in latency_summary(samples).items():
+                results[f"api.{name}.{k}"] = v
+
+        for fmt in SERIES_FORMATS:
+            url = SERIES_URL.format(id=flight_id, limit=SERIES_LIMIT, fmt=fmt)
+            samples = []
+            for _ in range(requests):
+                with Stopwatch(samples):
+                    resp = client.get(url)
+            gz = client.get(url, headers={'Accept-Encoding': 'gzip'})
+            results[f"api.series.{fmt}.p50_ms"] = latency_summary(samples)["p50_ms"]
+            results[f"api.series.{fmt}.bytes_per_point"] = len(resp.data) / SERIES_LIMIT
+            results[f"api.series.{fmt}.gzip_bytes_per_point"] = len(gz.data) / SERIES_LIMIT
+        return results
+    finally:
+        cleanup(cur, [flight_id])
+        conn.close()
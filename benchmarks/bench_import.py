@@ -0,0 +1,70 @@
+# benchmarks/bench_import.py
+"""
+Import (startup) time of each entry point, from `python -X importtime`.
+
+Every sample is a fresh interpreter running `import <module>` from the repo
+root; the module's cumulative time is read from the importtime report on
+stderr and the median of REPEAT runs is kept. Also counts the modules the
+import pulled in, and flags workers that load Flask (they should not: the
+models live in backend/models.py for that reason).
+
+Needs no database.
+"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    'receiver':   'backend.ingest.receiver',
+    'parser':     'backend.etl.parse_raw',
+    'analyzer':   'analyzer',
+    'service':    'backend.service',
+    'supervisor': 'supervisor',
+    'app':        'app',
+}
+FLASK_FREE = ('receiver', 'parser', 'analyzer', 'service', 'supervisor')
+REPEAT     = 5
+
+
+def importtime(module):
+    """One cold import; returns (cumulative_us, modules, loaded flask)."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed')
+
+    # "import time: self [us] | cumulative | imported package", children first;
+    # the target's subtree is everything after the previous top-level line.
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative), name[1:]))
+    for i in range(len(rows) - 1, -1, -1):
+        if rows[i][1] == module:
+            start = i
+            while start > 0 and rows[start - 1][1].startswith(' '):
+                start -= 1
+            subtree = [name.strip() for _, name in rows[start:i + 1]]
+            return rows[i][0], len(subtree), 'flask' in subtree
+    raise RuntimeError(f"{module} not in the importtime report")
+
+
+def run(repeat=REPEAT):
+    results = {}
+    for name, module in ENTRY_POINTS.items():
+        try:
+            samples = [importtime(module) for _ in range(repeat)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"  [import] {name}: cannot import {module}: {e}")
+            results[f"import.{name}_ms"] = None
+            continue
+        results[f"import.{name}_ms"] = round(statistics.median(s[0] for s in samples) / 1000, 1)
+        results[f"import.{name}_modules"] = samples[-1][1]
+        if name in FLASK_FREE and samples[-1][2]:
+            print(f"  [import] {name}: WARNING {module} imports flask")
+    return results
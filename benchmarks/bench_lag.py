@@ -0,0 +1,80 @@
+# benchmarks/bench_lag.py
+"""
+End-to-end lag: measurement_ts of a packet → FlightStatus.updated_at reflecting it.
+
+In the default in-process mode the parser and analyzer stages are chained
+directly, which measures pure processing cost. With live=True the running
+stack (supervisor.py) does the work and polling delays are included.
+"""
+import contextlib
+import os
+import time
+from datetime import datetime, timezone
+
+import analyzer
+from backend.etl import parse_raw
+from benchmarks.common import connect, latency_summary
+from benchmarks.synthetic import SyntheticFlight, new_device_sn, seed_flight, insert_packets, cleanup
+
+LIVE_TIMEOUT = 30.0  # seconds to wait for the running stack per packet
+
+
+def _next_whole_second():
+    # Payload timestamps have 1 s resolution; aligning the send to the
+    # boundary makes measurement_ts exact.
+    time.sleep(1.0 - (time.time() % 1.0))
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _status_updated_at(cur, flight_id):
+    cur.execute("""
+        SELECT updated_at FROM sonde.flight_status WHERE flight_id = %s
+    """, (flight_id,))
+    row = cur.fetchone()
+    ts = row[0] if row else None
+    if ts is not None and ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def run(n_packets=20, live=False):
+    conn = connect()
+    cur = conn.cursor()
+    sn = new_device_sn()
+    flight_id = seed_flight(cur, sn)
+    sim = SyntheticFlight(sn)
+    packet_ids = []
+    lags = []
+    session = analyzer.Session()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for i in range(n_packets):
+                mts = _next_whole_second()
+                alt = 100.0 + 10.0 * i
+                packet_ids += insert_packets(cur, [sim.line(mts, alt, 47.56, -122.02)])
+
+                if live:
+                    deadline = time.monotonic() + LIVE_TIMEOUT
+                    while time.monotonic() < deadline:
+                        updated = _status_updated_at(cur, flight_id)
+                        if updated is not None and updated >= mts:
+                            break
+                        time.sleep(0.01)
+                    else:
+                        raise RuntimeError("running stack did not update FlightStatus in time")
+                else:
+                    parse_raw.process_batch(cur, parse_raw.fetch_batch(cur))
+                    analyzer.update_flight(session, flight_id, None, {})
+                    session.expire_all()
+                    updated = _status_updated_at(cur, flight_id)
+
+                lags.append((updated - mts).total_seconds())
+
+        summary = latency_summary(lags)
+        mode = "live" if live else "inprocess"
+        return {f"lag.{mode}.{k}": v for k, v in summary.items()}
+    finally:
+        session.close()
+        cleanup(cur, [flight_id], packet_ids)
+        parse_raw._streams_by_device.pop(sn, None)
+        conn.close()
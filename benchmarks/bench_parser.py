@@ -0,0 +1,39 @@
+# benchmarks/bench_parser.py
+"""Parser throughput: raw.packets lines turned into sonde.telemetry rows per second."""
+import contextlib
+import os
+import time
+
+from backend.etl import parse_raw
+from benchmarks.common import connect
+from benchmarks.synthetic import SyntheticFlight, new_device_sn, seed_flight, insert_packets, cleanup
+
+
+def run(n_lines=2000, batch=100):
+    conn = connect()
+    cur = conn.cursor()
+    sn = new_device_sn()
+    flight_id = seed_flight(cur, sn)
+    packet_ids = []
+    try:
+        sim = SyntheticFlight(sn)
+        packet_ids = insert_packets(cur, [line for _, line in sim.samples(n_lines)])
+
+        parsed = 0
+        t0 = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            while True:
+                rows = parse_raw.fetch_batch(cur, batch)
+                if not rows:
+                    break
+                parsed += parse_raw.process_batch(cur, rows)
+        elapsed = time.perf_counter() - t0
+
+        return {
+            "parser.lines_per_s": parsed / elapsed if elapsed else None,
+            "parser.lines":       parsed,
+        }
+    finally:
+        cleanup(cur, [flight_id], packet_ids)
+        parse_raw._streams_by_device.pop(sn, None)
+        conn.close()
@@ -0,0 +1,54 @@
+# benchmarks/common.py
+
+import os
+import math
+import time
+import psycopg2
+
+import config
+
+# Benchmarks seed and clean up their own rows, so they need the owner role
+# rather than the restricted ingest role.
+BENCH_DSN = os.getenv("BENCH_DSN", config.APP_DSN)
+
+
+def connect(autocommit=True):
+    conn = psycopg2.connect(BENCH_DSN)
+    conn.set_session(autocommit=autocommit)
+    return conn
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an unsorted list of numbers."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples_s):
+    """Return p50/p95/p99/max in milliseconds for a list of durations in seconds."""
+    ms = [s * 1000.0 for s in samples_s]
+    return {
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": max(ms) if ms else None,
+        "n":      len(ms),
+    }
+
+
+class Stopwatch:
+    """Context manager that appends the elapsed wall time to a list."""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.sink.append(time.perf_counter() - self.t0)
+        return False
@@ -0,0 +1,143 @@
+"""
+USAGE GUIDE
+===========
+
+End-to-end benchmark suite for the sonde pipeline. Every suite seeds its own
+synthetic flight (benchmarks/synthetic.py) into the local Postgres and removes
+it again afterwards.
+
+Suites:
+- parser    raw.packets → sonde.telemetry throughput (lines/s)
+- analyzer  update_flight() time per active flight (p50/p95/p99)
+- api       /api/telemetry, /api/gps, /api/status, /flight/<id> latency;
+            /api/series latency and bytes/point per format
+- lag       measurement_ts → FlightStatus.updated_at
+- import    cold import time of each entry point (python -X importtime)
+
+Run with (from the repo root, with the supervisor stopped unless --live):
+    python3 -m benchmarks.run                      # all suites
+    python3 -m benchmarks.run --only parser,api    # a subset
+    python3 -m benchmarks.run --live               # lag against the running stack
+    python3 -m benchmarks.run --save-baseline      # accept results as the new baseline
+
+Results are written to benchmarks/results.json and compared with
+benchmarks/baseline.json; the exit code is 1 if any metric regressed by more
+than --tolerance (default 20%).
+
+Connection: BENCH_DSN (libpq string, needs the owner role).
+"""
+import sys
+import json
+import argparse
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+RESULTS_PATH  = HERE / 'results.json'
+BASELINE_PATH = HERE / 'baseline.json'
+
+SUITES = ['parser', 'analyzer', 'api', 'lag', 'import']
+
+
+def run_suite(name, args):
+    # Import lazily so a subset run does not pay for (or require) the rest.
+    if name == 'parser':
+        from benchmarks import bench_parser
+        return bench_parser.run()
+    if name == 'analyzer':
+        from benchmarks import bench_analyzer
+        return bench_analyzer.run()
+    if name == 'api':
+        from benchmarks import bench_api
+        return bench_api.run()
+    if name == 'lag':
+        from benchmarks import bench_lag
+        return bench_lag.run(live=args.live)
+    if name == 'import':
+        from benchmarks import bench_import
+        return bench_import.run()
+    raise ValueError(f"unknown suite {name!r}")
+
+
+def direction(metric):
+    """+1 if bigger is better, -1 if smaller is better, 0 if informational."""
+    if metric.endswith('_per_s'):
+        return 1
+    if metric.endswith('_ms'):
+        return -1
+    return 0
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (metric, baseline, current, change) regressions."""
+    regressions = []
+    for metric, current in results.items():
+        base = baseline.get(metric)
+        sign = direction(metric)
+        if not sign or base in (None, 0) or current is None:
+            continue
+        change = (current - base) / abs(base)
+        if sign * change < -tolerance:
+            regressions.append((metric, base, current, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--only', default=','.join(SUITES),
+                        help="Comma-separated suites to run")
+    parser.add_argument('--live', action='store_true',
+                        help="Measure lag against the running supervisor stack")
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help="Allowed relative regression before failing")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in [s.strip() for s in args.only.split(',') if s.strip()]:
+        print(f"[bench] running {name}...", flush=True)
+        suite = run_suite(name, args)
+        for metric, value in suite.items():
+            print(f"  {metric:45s} {value}")
+        results.update(suite)
+
+    report = {
+        "meta": {
+            "ts":       datetime.now(timezone.utc).isoformat(),
+            "host":     platform.node(),
+            "machine":  platform.machine(),
+            "python":   platform.python_version(),
+        },
+        "results": results,
+    }
+    RESULTS_PATH.write_text(json.dumps(report, indent=2))
+    print(f"[bench] results written to {RESULTS_PATH}")
+
+    if args.save_baseline:
+        baseline = {}
+        if BASELINE_PATH.exists():
+            baseline = json.loads(BASELINE_PATH.read_text())
+        baseline.setdefault("results", {}).update(results)
+        baseline["meta"] = report["meta"]
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2))
+        print(f"[bench] baseline updated at {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print("[bench] no baseline yet; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(BASELINE_PATH.read_text()).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    for metric, base, current, change in regressions:
+        print(f"[bench] REGRESSION {metric}: {base:.3f} → {current:.3f} ({change:+.0%})")
+    if regressions:
+        return 1
+    print("[bench] no regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic flights for the benchmark suite.
+
+Produces payload lines in the same CSV layout the sonde transmits (see
+testing/mimik.py), but on a virtual clock so thousands of samples can be
+generated instantly, and seeds/cleans the device, flight and raw.packets
+rows a benchmark needs.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from psycopg2.extras import execute_values
+
+GROUND_ELEV = 100      # m
+ASC_RATE    = 5.0      # m/s
+DES_RATE    = -7.0     # m/s
+BURST_ALT   = 30000    # m
+LAT0, LNG0  = 47.5618, -122.0266
+DRIFT       = 0.0001
+MASK        = "D876EE"
+
+BENCH_PREFIX = "BENCH-"
+
+
+def baro_pressure(h):
+    return 1013.25 * (1 - 2.25577e-5 * h) ** 5.25588
+
+
+def calc_token(device_sn: int, mask_hex: str) -> int:
+    try:
+        key = int(mask_hex, 16)
+    except ValueError:
+        key = 0
+    return (device_sn ^ key) & 0xFFFFFF
+
+
+class SyntheticFlight:
+    """Ground → ascent → burst → descent profile on a virtual clock."""
+
+    def __init__(self, device_sn, mask=MASK, interval=2.0, ground_samples=10,
+                 start=None, seed=0):
+        self.device_sn = device_sn
+        self.mask      = mask
+        self.token     = calc_token(device_sn, mask)
+        self.interval  = interval
+        self.ground_samples = ground_samples
+        self.start     = start or datetime.now(timezone.utc).replace(microsecond=0)
+        self.rng       = random.Random(seed)
+
+    def samples(self, n):
+        """Yield (measurement_ts, payload_line) for n consecutive samples."""
+        alt, lat, lng = float(GROUND_ELEV), LAT0, LNG0
+        stage = 'ground'
+        for i in range(n):
+            if stage == 'ground' and i >= self.ground_samples:
+                stage = 'ascent'
+            if stage == 'ascent':
+                alt += ASC_RATE * self.interval
+                if alt >= BURST_ALT:
+                    stage = 'descent'
+            elif stage == 'descent':
+                alt = max(GROUND_ELEV, alt + DES_RATE * self.interval)
+            else:
+                alt = GROUND_ELEV + self.rng.uniform(-1, 1)
+
+            lat += DRIFT + self.rng.uniform(-DRIFT / 2, DRIFT / 2)
+            lng += DRIFT + self.rng.uniform(-DRIFT / 2, DRIFT / 2)
+
+            ts = self.start + timedelta(seconds=i * self.interval)
+            yield ts, self.line(ts, alt, lat, lng)
+
+    def line(self, ts, alt, lat, lng):
+        pres = baro_pressure(alt)
+        temp = 20 - 6.5 * (alt / 1000.0) + self.rng.uniform(-0.5, 0.5)
+        hum  = max(0, 60 - 0.01 * alt + self.rng.uniform(-1, 1))
+        return ",".join([
+            f"{self.device_sn:05X}",
+            f"{self.token:06X}",
+            ts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            f"{temp:.2f}",
+            f"{hum:.2f}",
+            f"{pres:.2f}",
+            f"{lat:.5f}",
+            f"{lng:.5f}",
+            f"{alt:.1f}",
+            f"{self.rng.uniform(0.8, 1.5):.2f}",
+            f"{self.rng.randint(6, 9)}",
+        ])
+
+
+def new_device_sn():
+    # High, random SN so benchmark devices never collide with real hardware.
+    return 0xB0000 + random.randrange(0x10000)
+
+
+def seed_flight(cur, device_sn, mask=MASK, status='flight'):
+    """Insert a device + flight (+ empty FlightStatus) and return the flight id."""
+    cur.execute("""
+        INSERT INTO sonde.devices (device_sn, description, created_at)
+             VALUES (%s, 'benchmark', now())
+        ON CONFLICT (device_sn) DO UPDATE SET description = EXCLUDED.description
+          RETURNING id
+    """, (format(device_sn, 'X'),))
+    device_id = cur.fetchone()[0]
+
+    cur.execute("""
+        INSERT INTO sonde.flights (mission_number, equipment, start_time, status,
+                                   device_id, mask, elevation)
+             VALUES (%s, 'benchmark', now(), %s, %s, %s, %s)
+          RETURNING id
+    """, (BENCH_PREFIX + uuid.uuid4().hex[:12], status, device_id, mask, GROUND_ELEV))
+    flight_id = cur.fetchone()[0]
+
+    cur.execute("""
+        INSERT INTO sonde.flight_status (flight_id, flight_phase, burst_detected, updated_at)
+             VALUES (%s, 'pre-flight', FALSE, now())
+    """, (flight_id,))
+    return flight_id
+
+
+def seed_telemetry(cur, flight_id, sim, n_points):
+    """Write n_points already-parsed telemetry rows straight into sonde.telemetry."""
+    prev = None
+    rows = []
+    for ts, line in sim.samples(n_points):
+        cols = line.split(',')
+        alt = float(cols[8])
+        rate = (alt - prev) / sim.interval if prev is not None else 0.0
+        prev = alt
+        rows.append((
+            flight_id, ts, float(cols[6]), float(cols[7]), int(alt), int(float(cols[5])),
+            float(cols[3]), -50, rate, float(cols[4]), float(cols[9]), int(cols[10]), ts,
+        ))
+    execute_values(cur, """
+        INSERT INTO sonde.telemetry (flight_id, timestamp, gps_latitude, gps_longitude,
+                                     gps_altitude, pressure, temperature, signal_strength,
+                                     ascent_rate, humidity, hdop, sats, measurement_ts)
+        VALUES %s
+    """, rows)
+
+
+def seed_ground_reference(cur, flight_id):
+    cur.execute("""
+        INSERT INTO sonde.ground_reference (flight_id, timestamp, gps_latitude, gps_longitude,
+                                            gps_altitude)
+             SELECT flight_id, min(timestamp), %s, %s, %s
+               FROM sonde.telemetry WHERE flight_id = %s GROUP BY flight_id
+    """, (LAT0, LNG0, GROUND_ELEV, flight_id))
+
+
+def insert_packets(cur, lines, rssi=-50):
+    """Bulk insert payload lines into raw.packets; returns the new ids."""
+    rows = execute_values(cur, """
+        INSERT INTO raw.packets (recv_ts, payload, rssi_dbm) VALUES %s RETURNING id
+    """, [(datetime.now(timezone.utc), line + "\n", rssi) for line in lines],
+        template="(%s, %s, %s)", fetch=True)
+    return [r[0] for r in rows]
+
+
+def cleanup(cur, flight_ids=(), packet_ids=()):
+    """Remove every row a benchmark created."""
+    flight_ids = list(flight_ids)
+    if flight_ids:
+        for table in ('logs', 'alarms', 'flight_status', 'ground_reference',
+                      'data_selection', 'flight_summary', 'telemetry', 'channel_samples'):
+            cur.execute(f"DELETE FROM sonde.{table} WHERE flight_id = ANY(%s)",
+                        (flight_ids,))
+        cur.execute("DELETE FROM sonde.flights WHERE id = ANY(%s)", (flight_ids,))
+    cur.execute("""
+        DELETE FROM sonde.channels c USING sonde.devices d
+         WHERE c.device_id = d.id AND d.description = 'benchmark'
+           AND NOT EXISTS (SELECT 1 FROM sonde.flights f WHERE f.device_id = d.id)
+    """)
+    cur.execute("""
+        DELETE FROM sonde.devices d
+         WHERE d.description = 'benchmark'
+           AND NOT EXISTS (SELECT 1 FROM sonde.flights f WHERE f.device_id = d.id)
+    """)
+    packet_ids = list(packet_ids)
+    if packet_ids:
+        cur.execute("DELETE FROM raw.packets WHERE id = ANY(%s)", (packet_ids,))
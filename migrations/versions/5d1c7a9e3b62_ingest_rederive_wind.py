@@ -0,0 +1,37 @@
+"""let the ingest role re-derive wind on stored telemetry
+
+Revision ID: 5d1c7a9e3b62
+Revises: 2e425cc2a451
+Create Date: 2026-10-19 23:52:18.307518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1c7a9e3b62'
+down_revision = '2e425cc2a451'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A late fix changes the wind of the row stored after it (backend.etl.derive).
+    op.execute("""
+        DO $$ BEGIN
+          IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'ingest_user') THEN
+            GRANT UPDATE (wind_speed, wind_dir) ON sonde.telemetry TO ingest_user;
+          END IF;
+        END $$;
+    """)
+
+
+def downgrade():
+    op.execute("""
+        DO $$ BEGIN
+          IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'ingest_user') THEN
+            REVOKE UPDATE (wind_speed, wind_dir) ON sonde.telemetry FROM ingest_user;
+          END IF;
+        END $$;
+    """)
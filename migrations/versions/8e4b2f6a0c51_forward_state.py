@@ -0,0 +1,39 @@
+"""raw.forward_state for station forwarding
+
+Revision ID: 8e4b2f6a0c51
+Revises: 2a6e8c1d4f93
+Create Date: 2026-10-19 19:20:11.483920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2f6a0c51'
+down_revision = '2a6e8c1d4f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Last frame sequence number committed per forwarding station
+    # (backend/ingest/forward.py); lives next to raw.packets.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS raw.forward_state (
+            station_id varchar(64) PRIMARY KEY,
+            last_seq   bigint NOT NULL DEFAULT 0,
+            updated_at timestamp with time zone NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        DO $$ BEGIN
+          IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'ingest_user') THEN
+            GRANT SELECT, INSERT, UPDATE ON raw.forward_state TO ingest_user;
+          END IF;
+        END $$;
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS raw.forward_state")
@@ -0,0 +1,44 @@
+"""raw.forward_state keyed on (station_id, spool_id)
+
+Revision ID: c3f9a1e7d504
+Revises: 5d1c7a9e3b62
+Create Date: 2026-10-19 23:58:40.912036
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9a1e7d504'
+down_revision = '5d1c7a9e3b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sequence numbers belong to one spool file (backend/ingest/forward.py); a
+    # recreated spool sends a new id. Rows from before carry '' and are never
+    # matched again, so their stations start over from seq 0.
+    op.execute("""
+        ALTER TABLE raw.forward_state
+          ADD COLUMN IF NOT EXISTS spool_id varchar(32) NOT NULL DEFAULT '',
+          DROP CONSTRAINT IF EXISTS forward_state_pkey,
+          ADD CONSTRAINT forward_state_pkey PRIMARY KEY (station_id, spool_id)
+    """)
+
+
+def downgrade():
+    # Keep the most recently used spool per station.
+    op.execute("""
+        DELETE FROM raw.forward_state f
+         USING raw.forward_state g
+         WHERE f.station_id = g.station_id
+           AND (f.updated_at, f.spool_id) < (g.updated_at, g.spool_id)
+    """)
+    op.execute("""
+        ALTER TABLE raw.forward_state
+          DROP CONSTRAINT IF EXISTS forward_state_pkey,
+          DROP COLUMN IF EXISTS spool_id,
+          ADD CONSTRAINT forward_state_pkey PRIMARY KEY (station_id)
+    """)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import os
 import threading
 import time
 import argparse
@@ -7,8 +8,14 @@ import psycopg2
 import sys
 from datetime import datetime, timezone
 
+# Allow `python3 testing/mimik.py` as well as `python3 -m testing.mimik`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from backend import bus
+from backend.ingest.dedup import payload_hash
+
 # ── CONFIG ────────────────────────────────────────────────────────────────
-DB_DSN       = "dbname=weather_sonde user=sonde_user password=securepassword host=localhost"
+DB_DSN       = config.APP_DSN
 INTERVAL     = 2.0           # seconds between telemetry packets
 GROUND_ELEV  = 100           # m
 ASC_RATE     = 5.0           # m/s
@@ -24,6 +31,7 @@ MASK         = "D876EE"
 # ───────────────────────────────────────────────────────────────────────────
 
 stage   = 'ground'   # "ground", "ascent", "descent"
+STATIONS = 1         # ground stations hearing each packet (--stations)
 VERBOSE = False       # when False, simulate_loop will skip its printouts
 
 def baro_pressure(h):
@@ -88,12 +96,20 @@ def simulate_loop(flight_id, device_sn, token):
             f"{sats}"
         ]) + "\n"
 
-        # write
-        cur.execute("""
-            INSERT INTO raw.packets (recv_ts, payload, rssi_dbm)
-            VALUES (now(), %s, %s)
-        """, (payload, -50))
+        # write: one copy per simulated station, each with its own RSSI
+        ids = []
+        for i in range(STATIONS):
+            cur.execute("""
+                INSERT INTO raw.packets (recv_ts, payload, rssi_dbm, station_id, payload_hash)
+                VALUES (now(), %s, %s, %s, %s)
+                ON CONFLICT (station_id, payload_hash) DO NOTHING
+                RETURNING id
+            """, (payload, -50 if STATIONS == 1 else random.randint(-110, -50),
+                  f"mimik-{i}", payload_hash(payload)))
+            ids += [r[0] for r in cur.fetchall()]
         conn.commit()
+        if ids:
+            bus.publish(bus.PACKETS, min(ids), max(ids), len(ids), dsn=DB_DSN)
 
         # conditional log
         if VERBOSE:
@@ -104,10 +120,13 @@ def simulate_loop(flight_id, device_sn, token):
         time.sleep(INTERVAL)
 
 def main():
-    global stage, VERBOSE
+    global stage, VERBOSE, STATIONS
     p = argparse.ArgumentParser()
     p.add_argument('--flight', type=int, required=True)
+    p.add_argument('--stations', type=int, default=1,
+                   help="simulate N ground stations receiving every packet")
     args = p.parse_args()
+    STATIONS = max(1, args.stations)
 
     token = calc_token(SN, MASK)
     print(f"Simulating flight {args.flight} → SN=0x{SN:05X}, TOK=0x{token:06X}")
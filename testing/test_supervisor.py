@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Supervisor health checks per child (supervisor.reports_progress).
+
+    python3 -m unittest testing.test_supervisor
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+import supervisor
+
+
+class ReportsProgressTest(unittest.TestCase):
+    def test_database_mode_checks_every_worker(self):
+        with mock.patch.object(config, 'INGEST_SERVER', None):
+            self.assertTrue(supervisor.reports_progress('receiver'))
+            self.assertTrue(supervisor.reports_progress('parser'))
+            self.assertFalse(supervisor.reports_progress('flask'))
+
+    def test_forward_mode_receiver_is_not_stall_checked(self):
+        # A forwarding receiver never writes raw.worker_progress; a WorkerHealth
+        # would call it STALLED after STARTUP_GRACE and restart it forever.
+        with mock.patch.object(config, 'INGEST_SERVER', '10.0.0.1:7700'):
+            self.assertFalse(supervisor.reports_progress('receiver'))
+            self.assertTrue(supervisor.reports_progress('parser'))
+            self.assertTrue(supervisor.reports_progress('analyzer'))
+
+
+if __name__ == '__main__':
+    unittest.main()